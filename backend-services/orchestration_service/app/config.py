@@ -22,3 +22,14 @@ AUTHORIZATION_SERVER_PORT = os.getenv("AUTHORIZATION_SERVER_PORT",default=5206)
 AUTHORIZATION_SERVER_CUSTOMER_ENDPOINT = "/customer-policy"
 AUTHORIZATION_SERVER_VENDOR_ENDPOINT = "/vendor-policy"
 AUTHORIZATION_SERVER_ADMIN_ENDPOINT = "/admin-policy"
+
+EVENT_LOOP_MONITOR_INTERVAL = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", default=0.25))
+EVENT_LOOP_LAG_THRESHOLD = float(os.getenv("EVENT_LOOP_LAG_THRESHOLD", default=0.1))
+EVENT_LOOP_REPORT_INTERVAL = float(os.getenv("EVENT_LOOP_REPORT_INTERVAL", default=60))
+
+QUEUE_MONITOR_INTERVAL = float(os.getenv("QUEUE_MONITOR_INTERVAL", default=15))
+QUEUE_MONITOR_QUEUES = os.getenv("QUEUE_MONITOR_QUEUES", default=RABBITMQ_ORCHESTRATION_QUEUE).split(",")
+
+# Span export appends to TRACE_EXPORT_PATH without rotation, so it is opt-in
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", default="false").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", default="traces.jsonl")
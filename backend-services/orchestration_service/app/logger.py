@@ -1,3 +1,5 @@
+import atexit
+import queue
 import sqlite3
 import threading
 from datetime import datetime
@@ -8,6 +10,12 @@ class SQLiteLogger:
         self.db_path = db_path
         self._lock = threading.Lock()
         self._init_db()
+        # Rows are written by a background thread so that logging from async
+        # endpoints never blocks the event loop on SQLite I/O.
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
 
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -33,13 +41,39 @@ class SQLiteLogger:
         func_name = frame.f_code.co_name
         line_no = frame.f_lineno
         
+        self._queue.put((timestamp, level, message, module, func_name, line_no))
+
+    def _drain(self) -> list:
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _insert(self, rows: list):
         with self._lock:
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+                conn.executemany(
                     "INSERT INTO logs (timestamp, level, message, module, funcName, lineno) VALUES (?, ?, ?, ?, ?, ?)",
-                    (timestamp, level, message, module, func_name, line_no)
+                    rows
                 )
                 conn.commit()
 
+    def _write_loop(self):
+        while True:
+            rows = [self._queue.get()]
+            rows.extend(self._drain())
+            try:
+                self._insert(rows)
+            except Exception as e:
+                print(f"Failed to write {len(rows)} log rows: {e}")
+
+    def flush(self):
+        """Write any queued rows synchronously (used on interpreter exit)."""
+        rows = self._drain()
+        if rows:
+            self._insert(rows)
+
 # Singleton logger instance
-logger = SQLiteLogger() 
\ No newline at end of file
+logger = SQLiteLogger() 
@@ -7,8 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security.api_key import APIKeyHeader
 from contextlib import asynccontextmanager
 from fastapi.openapi.utils import get_openapi
-from routers import order_router, logs
+from routers import order_router, logs, metrics, admin
 from services.event_consumer import get_consumer_service
+from services.message_publisher import get_async_publisher_service
+from services.redis_saga_store import get_async_redis_saga_store
+from monitoring.event_loop_monitor import get_event_loop_monitor
+from monitoring.middleware import MetricsMiddleware
+from monitoring.queue_monitor import get_queue_monitor
 import config
 from logger import logger
 
@@ -26,6 +31,10 @@ async def get_token(authorization: str = Security(api_key_header)) -> str:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    loop_monitor = get_event_loop_monitor()
+    loop_monitor.start()
+    queue_monitor = get_queue_monitor()
+    queue_monitor.start()
     # Startup: create and start the consumer thread
     consumer = get_consumer_service(queue=config.RABBITMQ_ORCHESTRATION_QUEUE)
     thread = threading.Thread(target=consumer.start_consuming, daemon=True)
@@ -38,6 +47,10 @@ async def lifespan(app: FastAPI):
         consumer.stop_consuming()
         thread.join(timeout=5)
         print("Consumer stopped.")
+        await get_async_publisher_service().close()
+        await get_async_redis_saga_store().close()
+        queue_monitor.stop()
+        await loop_monitor.stop()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -54,6 +67,7 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+app.add_middleware(MetricsMiddleware)
 
 # Custom OpenAPI schema to support raw Authorization header
 def custom_openapi():
@@ -83,6 +97,8 @@ app.openapi = custom_openapi
 # Include routers
 app.include_router(order_router.router, dependencies=[Security(get_token)])
 app.include_router(logs.router, dependencies=[Security(get_token)])
+app.include_router(admin.router, dependencies=[Security(get_token)])
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,64 @@
+"""
+Prometheus metrics for the orchestration service.
+All metrics live in the default registry and are served by GET /metrics.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the event loop should have woken the monitor and when it did.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Number of times the event loop was blocked longer than the threshold, by offending code location.",
+    ["location"],
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+CONSUMER_HANDLER_LATENCY = Histogram(
+    "consumer_handler_duration_seconds",
+    "Time spent handling one consumed message, by event type.",
+    ["event", "outcome"],
+)
+MESSAGES_CONSUMED = Counter(
+    "messages_consumed_total",
+    "Messages consumed from RabbitMQ.",
+    ["queue", "event"],
+)
+MESSAGES_PUBLISHED = Counter(
+    "messages_published_total",
+    "Messages published to RabbitMQ.",
+    ["queue", "event"],
+)
+AUTH_REQUEST_LATENCY = Histogram(
+    "auth_request_duration_seconds",
+    "Latency of calls to the authorization server.",
+    ["endpoint", "outcome"],
+)
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round-trip latency by command.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+QUEUE_MESSAGES = Gauge(
+    "rabbitmq_queue_messages",
+    "Messages ready in the queue, from the last passive declare.",
+    ["queue"],
+)
+QUEUE_CONSUMERS = Gauge(
+    "rabbitmq_queue_consumers",
+    "Consumers attached to the queue, from the last passive declare.",
+    ["queue"],
+)
+CONSUMER_LAG = Histogram(
+    "message_consumer_lag_seconds",
+    "Time between a message being published and a consumer receiving it.",
+    ["queue"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
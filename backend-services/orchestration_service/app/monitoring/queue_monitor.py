@@ -0,0 +1,114 @@
+"""
+Queue depth and consumer lag reporting.
+
+A background thread passive-declares the monitored queues on its own connection
+(pika connections are not thread-safe) and records message and consumer counts.
+Consumers report end-to-end lag from the x-published-at header that
+publish_message stamps on every message.
+"""
+import threading
+import time
+import pika
+import config
+from logger import logger
+from monitoring.metrics import QUEUE_MESSAGES, QUEUE_CONSUMERS, CONSUMER_LAG
+
+PUBLISHED_AT_HEADER = "x-published-at"
+
+# queue name -> last observed end-to-end lag in seconds
+_last_consumer_lag: dict[str, float] = {}
+
+
+def publish_properties(**kwargs) -> pika.BasicProperties:
+    """BasicProperties for a persistent message stamped with its publish time."""
+    now = time.time()
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers[PUBLISHED_AT_HEADER] = now
+    return pika.BasicProperties(delivery_mode=2, timestamp=int(now), headers=headers, **kwargs)
+
+
+def record_consumer_lag(queue: str, properties) -> float | None:
+    """Record publish-to-consume lag for a received message, if it carries a publish time."""
+    headers = getattr(properties, "headers", None) or {}
+    published_at = headers.get(PUBLISHED_AT_HEADER) or getattr(properties, "timestamp", None)
+    if not published_at:
+        return None
+    lag = max(0.0, time.time() - float(published_at))
+    CONSUMER_LAG.labels(queue=queue).observe(lag)
+    _last_consumer_lag[queue] = lag
+    return lag
+
+
+class QueueMonitor:
+    def __init__(self, queues: list[str], interval: float = config.QUEUE_MONITOR_INTERVAL):
+        self.queues = queues
+        self.interval = interval
+        self.snapshot: dict[str, dict] = {}
+        credentials = pika.PlainCredentials(
+            username=config.RABBITMQ_USER,
+            password=config.RABBITMQ_PASSWORD
+        )
+        self.connection_params = pika.ConnectionParameters(
+            host=config.RABBITMQ_HOST,
+            port=config.RABBITMQ_PORT,
+            credentials=credentials
+        )
+        self.connection = None
+        self.channel = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _ensure_channel(self):
+        if not self.connection or self.connection.is_closed:
+            self.connection = pika.BlockingConnection(self.connection_params)
+        if not self.channel or self.channel.is_closed:
+            self.channel = self.connection.channel()
+
+    def poll(self):
+        """Passive-declare every monitored queue once and record its depth."""
+        for queue in self.queues:
+            try:
+                self._ensure_channel()
+                declared = self.channel.queue_declare(queue=queue, passive=True)
+            except Exception as e:
+                # A missing queue closes the channel; it is reopened on the next call
+                logger.log(f"Failed to inspect queue {queue}: {str(e)}", level="WARNING")
+                continue
+            message_count = declared.method.message_count
+            consumer_count = declared.method.consumer_count
+            QUEUE_MESSAGES.labels(queue=queue).set(message_count)
+            QUEUE_CONSUMERS.labels(queue=queue).set(consumer_count)
+            self.snapshot[queue] = {
+                "queue": queue,
+                "message_count": message_count,
+                "consumer_count": consumer_count,
+                "consumer_lag_seconds": _last_consumer_lag.get(queue),
+                "sampled_at": time.time(),
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+        if self.connection and not self.connection.is_closed:
+            self.connection.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.log(f"Queue monitor started for {self.queues} (interval={self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+_queue_monitor: QueueMonitor | None = None
+
+def get_queue_monitor() -> QueueMonitor:
+    """Return the process-wide queue monitor (shared by the lifespan and the admin endpoint)."""
+    global _queue_monitor
+    if _queue_monitor is None:
+        _queue_monitor = QueueMonitor(queues=config.QUEUE_MONITOR_QUEUES)
+    return _queue_monitor
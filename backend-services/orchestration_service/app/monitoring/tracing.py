@@ -0,0 +1,152 @@
+"""
+Lightweight saga tracing.
+
+The trace id of a saga is its transaction_id. publish_message opens a span and
+writes the trace context into the AMQP headers; the consumer callback restores it
+and opens a child span around the handler, so every hop of the saga lands in the
+same trace. Redis commands issued inside a span get their own child spans.
+
+Finished spans are appended as JSON lines to config.TRACE_EXPORT_PATH by a
+background thread, which stands in for a collector.
+"""
+import atexit
+import json
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+import config
+
+SERVICE_NAME = "orchestration"
+
+TRACE_ID_HEADER = "x-trace-id"
+SPAN_ID_HEADER = "x-span-id"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start", "end", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None = None, attributes: dict | None = None):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self.end = None
+        self.status = "ok"
+
+    def to_dict(self) -> dict:
+        return {
+            "service": SERVICE_NAME,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round((self.end - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class JsonLinesExporter:
+    """Appends finished spans to a JSON lines file from a background thread."""
+    def __init__(self, path: str):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def export(self, span: Span):
+        self._queue.put(span.to_dict())
+
+    def _drain(self) -> list:
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _write(self, rows: list):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def _write_loop(self):
+        while True:
+            rows = [self._queue.get()]
+            rows.extend(self._drain())
+            try:
+                self._write(rows)
+            except Exception as e:
+                print(f"Failed to export {len(rows)} spans: {e}")
+
+    def flush(self):
+        rows = self._drain()
+        if rows:
+            self._write(rows)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_exporter = JsonLinesExporter(config.TRACE_EXPORT_PATH) if config.TRACING_ENABLED else None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(name: str, trace_id: str | None = None, parent_id: str | None = None, **attributes):
+    """
+    Open a span as a child of the current one (or of parent_id when restoring
+    remote context). Yields None when tracing is disabled.
+    """
+    if _exporter is None:
+        yield None
+        return
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id = trace_id or parent.trace_id
+        parent_id = parent_id or parent.span_id
+    span = Span(name, trace_id or uuid.uuid4().hex, parent_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException:
+        span.status = "error"
+        raise
+    finally:
+        span.end = time.time()
+        _current_span.reset(token)
+        _exporter.export(span)
+
+
+@contextmanager
+def child_span(name: str, **attributes):
+    """Open a span only when already inside a trace (used for DB/Redis calls)."""
+    if _current_span.get() is None:
+        yield None
+        return
+    with start_span(name, **attributes) as span:
+        yield span
+
+
+def inject_headers(headers: dict | None = None) -> dict:
+    """Return headers carrying the current trace context."""
+    headers = dict(headers or {})
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACE_ID_HEADER] = span.trace_id
+        headers[SPAN_ID_HEADER] = span.span_id
+    return headers
+
+
+def extract_context(properties) -> tuple[str | None, str | None]:
+    """Return (trace_id, parent span id) from the headers of a received message."""
+    headers = getattr(properties, "headers", None) or {}
+    return headers.get(TRACE_ID_HEADER), headers.get(SPAN_ID_HEADER)
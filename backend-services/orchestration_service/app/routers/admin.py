@@ -0,0 +1,18 @@
+"""Admin endpoints."""
+from fastapi import APIRouter, Depends
+from monitoring.queue_monitor import get_queue_monitor
+from routers.auth_dependencies import authenticate_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+@router.get("/queues", dependencies=[Depends(authenticate_admin)])
+def get_queue_stats():
+    """
+    Latest depth, consumer count and consumer lag for each monitored queue.
+    Intended as an autoscaling signal. Admin access only.
+    """
+    monitor = get_queue_monitor()
+    return [monitor.snapshot.get(queue, {"queue": queue}) for queue in monitor.queues]
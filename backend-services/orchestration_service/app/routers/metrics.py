@@ -0,0 +1,12 @@
+"""Metrics endpoint."""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Expose Prometheus metrics for scraping.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -27,7 +27,7 @@ async def create_order(
         logger.log(f"Invalid payment method: {payment_method}", level="ERROR")
         raise HTTPException(status_code=400, detail="Invalid payment method")
 
-    order_id = orchestrator.start_order_saga(order_req, token=auth_header)  
+    order_id = await orchestrator.start_order_saga_async(order_req, token=auth_header)
     logger.log(f"Order creation started for user: {getattr(order_req, 'user_email', 'unknown')}")
     return {
         "status": "success",
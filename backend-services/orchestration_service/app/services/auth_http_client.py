@@ -1,8 +1,10 @@
 """Authentication service."""
+import time
 import httpx
 from fastapi import HTTPException
 import config
 from logger import logger
+from monitoring.metrics import AUTH_REQUEST_LATENCY
 
 class AuthenticationService:
     """Authentication service."""
@@ -18,7 +20,13 @@ class AuthenticationService:
         logger.log(f"Attempting authentication at endpoint: {endpoint}")
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             try:
-                response = await client.post(url, headers=self.headers, json=payload)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    response = await client.post(url, headers=self.headers, json=payload)
+                    outcome = str(response.status_code)
+                finally:
+                    AUTH_REQUEST_LATENCY.labels(endpoint=endpoint, outcome=outcome).observe(time.perf_counter() - started)
                 response.raise_for_status()
                 logger.log(f"Authentication successful for endpoint: {endpoint}")
                 return response.json()
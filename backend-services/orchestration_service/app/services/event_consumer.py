@@ -1,9 +1,13 @@
 """Event Consumer for Saga Orchestrator"""
+import time
 import pika
 import json
 from services.saga_orchestrator import get_saga_orchestrator
 import config
 from logger import logger
+from monitoring.metrics import CONSUMER_HANDLER_LATENCY, MESSAGES_CONSUMED
+from monitoring.queue_monitor import record_consumer_lag
+from monitoring.tracing import start_span, extract_context
 
 class RabbitMQConsumer:
     def __init__(self, queue: str):
@@ -40,6 +44,16 @@ class RabbitMQConsumer:
             logger.log(f"Failed to connect to RabbitMQ: {str(e)}", level="ERROR")
             raise
 
+    def _dispatch(self, event_type: str, message: dict):
+        """Run the handler for event_type, recording its latency."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            self.event_handlers[event_type](message)
+            outcome = "success"
+        finally:
+            CONSUMER_HANDLER_LATENCY.labels(event=event_type, outcome=outcome).observe(time.perf_counter() - started)
+
     def callback(self, ch, method, properties, body):
         """Callback function to process incoming messages."""
         try:
@@ -47,10 +61,20 @@ class RabbitMQConsumer:
             event_type = message.get("event")
             logger.log(f"Received message with event type: {event_type}")
 
+            MESSAGES_CONSUMED.labels(queue=self.queue, event=str(event_type)).inc()
+            record_consumer_lag(self.queue, properties)
+
             # Dispatch the message to the appropriate handler if it exists
             if event_type in self.event_handlers:
                 logger.log(f"Processing event type: {event_type}")
-                self.event_handlers[event_type](message)
+                trace_id, parent_id = extract_context(properties)
+                with start_span(
+                    f"consume {event_type}",
+                    trace_id=trace_id or message.get("transaction_id"),
+                    parent_id=parent_id,
+                    queue=self.queue
+                ):
+                    self._dispatch(event_type, message)
                 logger.log(f"Successfully processed event type: {event_type}")
             else:
                 logger.log(f"Unhandled event type: {event_type}", level="ERROR")
@@ -2,7 +2,11 @@
 RabbitMQ message publisher for sending messages to a queue.
 This module provides a simple interface for publishing messages to RabbitMQ queues.
 """
+import asyncio
+import time
+from datetime import datetime, timezone
 from typing import List
+import aio_pika
 import pika
 import json
 from models.saga_state import OrderSagaState, PaymentSagaState
@@ -10,6 +14,25 @@ import config
 from models.order import OrderCreateRequest, OrderResponse, OrderItemCreate
 from models.payment import PaymentCreate, PaymentResponse
 from logger import logger
+from monitoring.metrics import MESSAGES_PUBLISHED
+from monitoring.queue_monitor import publish_properties, PUBLISHED_AT_HEADER
+from monitoring.tracing import start_span, inject_headers
+
+def serialize_message(message: dict) -> str:
+    """Serialize a command, turning every object with .dict() into a plain dict."""
+    return json.dumps(
+        message,
+        default=lambda o: o.dict() if hasattr(o, "dict") else super(type(o), o)
+    )
+
+def build_reduce_stock_command(products: List[OrderItemCreate], transaction_id: str) -> dict:
+    return {
+        "event": "reduce_stock",
+        "transaction_id": transaction_id,
+        "data": {
+            "products": [{"product_id": product.product_id, "quantity": product.quantity} for product in products]
+        }
+    }
 
 class RabbitMQPublisher:
     def __init__(self):
@@ -42,22 +65,18 @@ class RabbitMQPublisher:
             if not self.connection or self.connection.is_closed:
                 self.connect()
 
-            # make every object with .dict() into a plain dict,
-            # and leave primitives/lists alone
-            body_str = json.dumps(
-                message,
-                default=lambda o: o.dict() if hasattr(o, "dict") else super(type(o), o)
-            )
-
-            self.channel.queue_declare(queue=queue, durable=True)
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=queue,
-                body=body_str,
-                properties=pika.BasicProperties(
-                    delivery_mode=2  # make message persistent
+            body_str = serialize_message(message)
+
+            with start_span(f"publish {message.get('event')}", trace_id=message.get("transaction_id"), queue=queue):
+                self.channel.queue_declare(queue=queue, durable=True)
+                self.channel.basic_publish(
+                    exchange='',
+                    routing_key=queue,
+                    body=body_str,
+                    # persistent, stamped with publish time and trace context
+                    properties=publish_properties(headers=inject_headers())
                 )
-            )
+            MESSAGES_PUBLISHED.labels(queue=queue, event=str(message.get("event"))).inc()
             logger.log(f"Successfully published message to queue {queue} with event type: {message.get('event')}")
         except Exception as e:
             logger.log(f"Failed to publish message to queue {queue}: {str(e)}", level="ERROR")
@@ -66,13 +85,7 @@ class RabbitMQPublisher:
     def publish_reduce_stock_command(self, products: List[OrderItemCreate], transaction_id: str):
         """Publish a command to reduce stock."""
         logger.log(f"Publishing reduce stock command for transaction {transaction_id}")
-        command = {
-            "event": "reduce_stock",
-            "transaction_id": transaction_id,
-            "data": {
-                "products": [{"product_id": product.product_id, "quantity": product.quantity} for product in products]
-            }
-        }
+        command = build_reduce_stock_command(products, transaction_id)
         self.publish_message(command, config.RABBITMQ_PRODUCTS_QUEUE)
 
     def publish_create_order_command(self, order_data: OrderCreateRequest | OrderSagaState, transaction_id: str):
@@ -173,5 +186,81 @@ class RabbitMQPublisher:
         }
         self.publish_message(command, config.RABBITMQ_PAYMENT_QUEUE)
 
+class AsyncRabbitMQPublisher:
+    """
+    Non-blocking publisher for the request path.
+    Keeps one robust connection and channel per process instead of connecting per request.
+    """
+    def __init__(self):
+        self.url = (
+            f"amqp://{config.RABBITMQ_USER}:{config.RABBITMQ_PASSWORD}"
+            f"@{config.RABBITMQ_HOST}:{config.RABBITMQ_PORT}/"
+        )
+        self.connection = None
+        self.channel = None
+        self._declared_queues = set()
+        self._connect_lock = asyncio.Lock()
+        logger.log("Initialized async RabbitMQ publisher")
+
+    async def connect(self):
+        """Establish connection and channel (only once across concurrent callers)."""
+        async with self._connect_lock:
+            if self.channel and not self.channel.is_closed:
+                return
+            try:
+                self.connection = await aio_pika.connect_robust(self.url)
+                self.channel = await self.connection.channel()
+                self._declared_queues.clear()
+                logger.log("Successfully connected to RabbitMQ (async)")
+            except Exception as e:
+                logger.log(f"Failed to connect to RabbitMQ (async): {str(e)}", level="ERROR")
+                raise
+
+    async def publish_message(self, message: dict, queue: str):
+        """Publish a message to the specified RabbitMQ queue."""
+        try:
+            if not self.channel or self.channel.is_closed:
+                await self.connect()
+
+            if queue not in self._declared_queues:
+                await self.channel.declare_queue(queue, durable=True)
+                self._declared_queues.add(queue)
+
+            with start_span(f"publish {message.get('event')}", trace_id=message.get("transaction_id"), queue=queue):
+                await self.channel.default_exchange.publish(
+                    aio_pika.Message(
+                        body=serialize_message(message).encode(),
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        timestamp=datetime.now(timezone.utc),
+                        headers=inject_headers({PUBLISHED_AT_HEADER: time.time()})
+                    ),
+                    routing_key=queue
+                )
+            MESSAGES_PUBLISHED.labels(queue=queue, event=str(message.get("event"))).inc()
+            logger.log(f"Successfully published message to queue {queue} with event type: {message.get('event')}")
+        except Exception as e:
+            logger.log(f"Failed to publish message to queue {queue}: {str(e)}", level="ERROR")
+            raise
+
+    async def publish_reduce_stock_command(self, products: List[OrderItemCreate], transaction_id: str):
+        """Publish a command to reduce stock."""
+        logger.log(f"Publishing reduce stock command for transaction {transaction_id}")
+        command = build_reduce_stock_command(products, transaction_id)
+        await self.publish_message(command, config.RABBITMQ_PRODUCTS_QUEUE)
+
+    async def close(self):
+        if self.connection and not self.connection.is_closed:
+            await self.connection.close()
+            logger.log("Closed async RabbitMQ connection")
+
 def get_publisher_service() -> RabbitMQPublisher:
-    return RabbitMQPublisher()
\ No newline at end of file
+    return RabbitMQPublisher()
+
+_async_publisher: AsyncRabbitMQPublisher | None = None
+
+def get_async_publisher_service() -> AsyncRabbitMQPublisher:
+    """Return the process-wide async publisher so its connection is reused."""
+    global _async_publisher
+    if _async_publisher is None:
+        _async_publisher = AsyncRabbitMQPublisher()
+    return _async_publisher
\ No newline at end of file
@@ -1,11 +1,36 @@
+import time
 import redis
+import redis.asyncio as aioredis
 import json
 from models.order import OrderItemCreate
 from models.saga_state import OrderSagaState, ProductSagaState, PaymentSagaState
 import config
+from monitoring.metrics import REDIS_COMMAND_LATENCY
+from monitoring.tracing import child_span
+
+class TimedRedis(redis.Redis):
+    """Redis client that records the round-trip latency of every command."""
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with child_span(f"redis {args[0]}"):
+                return super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command=str(args[0])).observe(time.perf_counter() - started)
+
+class AsyncTimedRedis(aioredis.Redis):
+    """Async Redis client that records the round-trip latency of every command."""
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with child_span(f"redis {args[0]}"):
+                return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command=str(args[0])).observe(time.perf_counter() - started)
+
 class RedisSagaStore:
     def __init__(self, host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_DB):
-        self.client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+        self.client = TimedRedis(host=host, port=port, db=db, decode_responses=True)
 
     def save_order_saga(self, saga: OrderSagaState, ttl: int = 600):
         key = f"order_saga:{saga.transaction_id}"
@@ -73,6 +98,42 @@ class RedisSagaStore:
         self.client.delete(key)
     
     
+class AsyncRedisSagaStore:
+    """Non-blocking saga store used on the request path (event loop)."""
+    def __init__(self, host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_DB):
+        self.client = AsyncTimedRedis(host=host, port=port, db=db, decode_responses=True)
+
+    async def save_order_saga(self, saga: OrderSagaState, ttl: int = 600):
+        key = f"order_saga:{saga.transaction_id}"
+        await self.client.set(key, json.dumps(saga.dict()), ex=ttl)
+
+    async def save_product_saga(self, saga: ProductSagaState, ttl: int = 600):
+        key = f"product_saga:{saga.transaction_id}"
+        await self.client.set(key, json.dumps(saga.dict()), ex=ttl)
+
+    async def save_initial_sagas(self, order_saga: OrderSagaState, product_saga: ProductSagaState, ttl: int = 600):
+        """Store the order and product saga states in a single round trip."""
+        started = time.perf_counter()
+        with child_span("redis PIPELINE", commands=2):
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(f"product_saga:{product_saga.transaction_id}", json.dumps(product_saga.dict()), ex=ttl)
+                pipe.set(f"order_saga:{order_saga.transaction_id}", json.dumps(order_saga.dict()), ex=ttl)
+                await pipe.execute()
+        REDIS_COMMAND_LATENCY.labels(command="PIPELINE").observe(time.perf_counter() - started)
+
+    async def close(self):
+        await self.client.aclose()
+
+
 def get_redis_saga_store() -> RedisSagaStore:
     return RedisSagaStore(
-    )
\ No newline at end of file
+    )
+
+_async_saga_store: AsyncRedisSagaStore | None = None
+
+def get_async_redis_saga_store() -> AsyncRedisSagaStore:
+    """Return the process-wide async store so its connection pool is reused."""
+    global _async_saga_store
+    if _async_saga_store is None:
+        _async_saga_store = AsyncRedisSagaStore()
+    return _async_saga_store
\ No newline at end of file
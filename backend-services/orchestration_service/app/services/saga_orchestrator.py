@@ -8,28 +8,27 @@ Handles the orchestration of the Saga pattern.
 import uuid
 from fastapi import Depends
 from services.auth_http_client import get_auth_service
-from services.message_publisher import get_publisher_service
+from services.message_publisher import get_publisher_service, get_async_publisher_service, AsyncRabbitMQPublisher
 from models.saga_state import OrderSagaState, ProductSagaState, PaymentSagaState
 from models.order import OrderCreateRequest
-from services.redis_saga_store import get_redis_saga_store, RedisSagaStore
+from services.redis_saga_store import (
+    get_redis_saga_store, RedisSagaStore, get_async_redis_saga_store, AsyncRedisSagaStore
+)
 from logger import logger
+from monitoring.tracing import start_span
 
 class SagaOrchestrator:
-    def __init__(self, saga_store: RedisSagaStore):
+    def __init__(self, saga_store: RedisSagaStore, async_saga_store: AsyncRedisSagaStore = None,
+                 async_publisher: AsyncRabbitMQPublisher = None):
         self.auth_client = get_auth_service()  # Synchronous calls
         self.publisher = get_publisher_service()  # Publishes to RabbitMQ
         self.saga_store = saga_store  
+        # Non-blocking counterparts used by the async request path
+        self.async_saga_store = async_saga_store
+        self.async_publisher = async_publisher
         logger.log("SagaOrchestrator initialized", "INFO")
 
-    def start_order_saga(self, order_data: OrderCreateRequest, token: str):
-        logger.log(f"Starting order saga for user: {order_data.user_email}", "INFO")
-        # verified = self.auth_client.authenticate_customer(jwt_token=token)
-        # if not verified:
-        #    raise Exception("Authentication failed")
-        
-        transaction_id = str(uuid.uuid4())
-        logger.log(f"Generated transaction ID: {transaction_id}", "INFO")
-        # If verified, store saga state
+    def _initial_saga_states(self, order_data: OrderCreateRequest, transaction_id: str):
         order_saga_state = OrderSagaState(
             transaction_id=transaction_id,
             user_email=order_data.user_email,
@@ -45,15 +44,46 @@ class SagaOrchestrator:
             product_id=order_data.items[0].product_id,
             quantity=order_data.items[0].quantity
         )
+        return order_saga_state, prouct_saga_state
 
-        self.saga_store.save_product_saga(prouct_saga_state)
-        self.saga_store.save_order_saga(order_saga_state)
-        logger.log(f"Saved initial saga states for transaction: {transaction_id}", "INFO")
+    def start_order_saga(self, order_data: OrderCreateRequest, token: str):
+        logger.log(f"Starting order saga for user: {order_data.user_email}", "INFO")
+        # verified = self.auth_client.authenticate_customer(jwt_token=token)
+        # if not verified:
+        #    raise Exception("Authentication failed")
+        
+        transaction_id = str(uuid.uuid4())
+        logger.log(f"Generated transaction ID: {transaction_id}", "INFO")
+        # If verified, store saga state
+        order_saga_state, prouct_saga_state = self._initial_saga_states(order_data, transaction_id)
 
-        self.publisher.publish_reduce_stock_command(
-            transaction_id=transaction_id, 
-            products=order_data.items
-        )
+        with start_span("start_order_saga", trace_id=transaction_id):
+            self.saga_store.save_product_saga(prouct_saga_state)
+            self.saga_store.save_order_saga(order_saga_state)
+            logger.log(f"Saved initial saga states for transaction: {transaction_id}", "INFO")
+
+            self.publisher.publish_reduce_stock_command(
+                transaction_id=transaction_id, 
+                products=order_data.items
+            )
+        logger.log(f"Published reduce stock command for transaction: {transaction_id}", "INFO")
+        return True
+
+    async def start_order_saga_async(self, order_data: OrderCreateRequest, token: str):
+        """Same as start_order_saga, but never blocks the event loop."""
+        logger.log(f"Starting order saga (async) for user: {order_data.user_email}", "INFO")
+        transaction_id = str(uuid.uuid4())
+        logger.log(f"Generated transaction ID: {transaction_id}", "INFO")
+        order_saga_state, prouct_saga_state = self._initial_saga_states(order_data, transaction_id)
+
+        with start_span("start_order_saga", trace_id=transaction_id):
+            await self.async_saga_store.save_initial_sagas(order_saga_state, prouct_saga_state)
+            logger.log(f"Saved initial saga states for transaction: {transaction_id}", "INFO")
+
+            await self.async_publisher.publish_reduce_stock_command(
+                transaction_id=transaction_id,
+                products=order_data.items
+            )
         logger.log(f"Published reduce stock command for transaction: {transaction_id}", "INFO")
         return True
 
@@ -194,4 +224,8 @@ class SagaOrchestrator:
 
 def get_saga_orchestrator() -> SagaOrchestrator:
     store = get_redis_saga_store()
-    return SagaOrchestrator(saga_store=store)
\ No newline at end of file
+    return SagaOrchestrator(
+        saga_store=store,
+        async_saga_store=get_async_redis_saga_store(),
+        async_publisher=get_async_publisher_service(),
+    )
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Load benchmark for POST /orders/create_order.
+
+Runs N concurrent clients against a running orchestration service for a fixed
+duration and reports requests per second and latency percentiles.
+
+    BASE_URL=http://localhost:7001 TOKEN="Bearer ..." CONCURRENCY=128 DURATION=30 \
+        python tests/benchmark_create_order.py
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:7001").rstrip("/")
+TOKEN = os.environ.get("TOKEN", "")
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 128))
+DURATION = float(os.environ.get("DURATION", 30))
+
+PAYLOAD = {
+    "user_email": "bench@example.com",
+    "vendor_email": "vendor@example.com",
+    "delivery_address": "1 Benchmark Street",
+    "description": "load test",
+    "items": [{"product_id": "bench-product", "quantity": 1, "unit_price": 9.99}],
+    "payment_method": "Credit Card",
+}
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/orders/create_order", json=PAYLOAD)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def main():
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    headers = {"Authorization": TOKEN}
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        deadline = started + DURATION
+        await asyncio.gather(*(client_loop(client, deadline, latencies, errors) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    print(f"clients={CONCURRENCY} duration={elapsed:.1f}s ok={len(latencies)} errors={len(errors)}")
+    if not latencies:
+        return
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        "latency ms: "
+        f"mean={statistics.mean(latencies) * 1000:.1f} "
+        f"p50={percentile(latencies, 50) * 1000:.1f} "
+        f"p95={percentile(latencies, 95) * 1000:.1f} "
+        f"p99={percentile(latencies, 99) * 1000:.1f} "
+        f"max={max(latencies) * 1000:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
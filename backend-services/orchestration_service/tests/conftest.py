@@ -0,0 +1,11 @@
+"""
+Shared setup for the in-process orchestration service tests.
+
+The service modules read their configuration at import time, so the
+environment is set before anything from app/ is imported.
+"""
+import os
+import sys
+
+os.environ.setdefault("TRACING_ENABLED", "false")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,125 @@
+"""The async create-order path: saga state goes to the store, then the reduce stock command is published."""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.order import OrderCreateRequest
+from routers.auth_dependencies import authenticate_user
+from services.message_publisher import build_reduce_stock_command
+from services.saga_orchestrator import SagaOrchestrator, get_saga_orchestrator
+
+ORDER = {
+    "user_email": "customer@example.com",
+    "vendor_email": "vendor@example.com",
+    "delivery_address": "1 Test Street",
+    "description": "test order",
+    "items": [
+        {"product_id": "p-1", "quantity": 2, "unit_price": 4.5},
+        {"product_id": "p-2", "quantity": 1, "unit_price": 10.0},
+    ],
+    "payment_method": "Credit Card",
+}
+
+
+class FakeAsyncSagaStore:
+    """Stands in for AsyncRedisSagaStore; keeps the saved states as the JSON Redis would hold."""
+    def __init__(self):
+        self.sagas = {}
+
+    async def save_initial_sagas(self, order_saga, product_saga, ttl: int = 600):
+        self.sagas[f"product_saga:{product_saga.transaction_id}"] = json.loads(json.dumps(product_saga.dict()))
+        self.sagas[f"order_saga:{order_saga.transaction_id}"] = json.loads(json.dumps(order_saga.dict()))
+
+
+class FakeAsyncPublisher:
+    """Stands in for AsyncRabbitMQPublisher; records the commands, or raises `error` if set."""
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.commands = []
+
+    async def publish_reduce_stock_command(self, products, transaction_id: str):
+        if self.error:
+            raise self.error
+        self.commands.append(build_reduce_stock_command(products, transaction_id))
+
+
+def orchestrator(store, publisher) -> SagaOrchestrator:
+    return SagaOrchestrator(saga_store=None, async_saga_store=store, async_publisher=publisher)
+
+
+def test_saga_state_is_saved_then_reduce_stock_published():
+    store, publisher = FakeAsyncSagaStore(), FakeAsyncPublisher()
+
+    assert asyncio.run(orchestrator(store, publisher).start_order_saga_async(OrderCreateRequest(**ORDER), token="t"))
+
+    (command,) = publisher.commands
+    transaction_id = command["transaction_id"]
+    assert command == {
+        "event": "reduce_stock",
+        "transaction_id": transaction_id,
+        "data": {"products": [{"product_id": "p-1", "quantity": 2}, {"product_id": "p-2", "quantity": 1}]},
+    }
+    assert set(store.sagas) == {f"order_saga:{transaction_id}", f"product_saga:{transaction_id}"}
+    order_saga = store.sagas[f"order_saga:{transaction_id}"]
+    assert order_saga["user_email"] == ORDER["user_email"]
+    assert order_saga["vendor_email"] == ORDER["vendor_email"]
+    assert order_saga["payment_method"] == ORDER["payment_method"]
+    assert order_saga["items"] == ORDER["items"]
+    assert store.sagas[f"product_saga:{transaction_id}"]["product_id"] == "p-1"
+
+
+def test_publish_failure_propagates_after_the_state_is_saved():
+    store, publisher = FakeAsyncSagaStore(), FakeAsyncPublisher(ConnectionError("broker down"))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(orchestrator(store, publisher).start_order_saga_async(OrderCreateRequest(**ORDER), token="t"))
+
+    # The saga states expire with their TTL; nothing was published to act on them
+    assert len(store.sagas) == 2
+    assert publisher.commands == []
+
+
+@pytest.fixture
+def fakes():
+    store, publisher = FakeAsyncSagaStore(), FakeAsyncPublisher()
+    app.dependency_overrides[authenticate_user] = lambda: "customer"
+    app.dependency_overrides[get_saga_orchestrator] = lambda: orchestrator(store, publisher)
+    try:
+        yield store, publisher
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_create_order_endpoint(fakes):
+    store, publisher = fakes
+
+    response = TestClient(app).post("/orders/create_order", json=ORDER, headers={"Authorization": "t"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+    assert len(publisher.commands) == 1
+    assert len(store.sagas) == 2
+
+
+def test_create_order_endpoint_fails_when_publishing_fails(fakes):
+    store, publisher = fakes
+    publisher.error = ConnectionError("broker down")
+
+    response = TestClient(app, raise_server_exceptions=False).post(
+        "/orders/create_order", json=ORDER, headers={"Authorization": "t"})
+
+    assert response.status_code == 500
+    assert publisher.commands == []
+
+
+def test_create_order_endpoint_rejects_unknown_payment_method(fakes):
+    store, publisher = fakes
+
+    response = TestClient(app).post("/orders/create_order", json={**ORDER, "payment_method": "Barter"},
+                                    headers={"Authorization": "t"})
+
+    assert response.status_code == 400
+    assert store.sagas == {} and publisher.commands == []
@@ -0,0 +1,20 @@
+"""Strong ETags from row versions and If-None-Match handling."""
+from typing import Optional
+from fastapi import Response, status
+
+
+def etag_for(version: int) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists the ETag (or is "*")."""
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -1,7 +1,7 @@
 """Api dependencies."""
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import APIKeyHeader
-from services.auth_service import AuthenticationService, get_auth_service
+from services.auth_service import AuthenticationService, get_auth_service, token_email
 from logger import logger
 
 
@@ -45,3 +45,30 @@ async def vendor_auth_dependency(
         logger.error(f"Vendor authentication failed: {str(exc)}")
         raise HTTPException(status_code=401, detail="Authentication failed")
     return {"status": "authenticated"}
+
+async def vendor_email_dependency(
+    token: str = Security(api_key_header),
+    auth_service: AuthenticationService = Depends(get_auth_service)
+) -> str | None:
+    """
+    The email of the authenticated vendor, taken from the accepted token.
+    None for an admin, who may act on any vendor's orders.
+    """
+    try:
+        # first, let admins through
+        try:
+            await auth_service.authenticate_admin(token)
+            return None
+        except HTTPException:
+            # not an admin → try vendor
+            await auth_service.authenticate_vendor(token)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as exc:
+        logger.error(f"Vendor authentication failed: {str(exc)}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+    email = token_email(token)
+    if not email:
+        logger.error("Vendor token has no email claim")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+    return email
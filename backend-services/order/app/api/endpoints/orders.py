@@ -1,12 +1,23 @@
 """Orders endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
-from api.dependencies import admin_auth_dependency, customer_auth_dependency, vendor_auth_dependency
-from dtos.order_schema import OrderCreate, OrderResponse
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, status
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from api.conditional import etag_for, etag_matches, not_modified
+from api.dependencies import admin_auth_dependency, customer_auth_dependency, vendor_auth_dependency, vendor_email_dependency
+from core import config
+from dtos.order_schema import (
+    OrderCreate, OrderResponse, BulkStatusUpdate, BulkStatusResult, BulkStatusResponse,
+    BulkRollback, BulkRollbackResult, BulkRollbackResponse,
+    VendorDailyStats, VendorStatsSummary
+)
 from entity import ALLOWED_STATUSES
 from services.order_service import (
     get_order_service, OrderService
 )
+from services.async_order_service import get_async_order_service, AsyncOrderService
+from services import order_export, order_queries
+from services.order_cache import payload_version
 from logger import logger
 
 router = APIRouter(
@@ -14,17 +25,38 @@ router = APIRouter(
     tags=["orders"]
 )
 
-@router.get("/", response_model=list[OrderResponse], dependencies=[Depends(admin_auth_dependency)])
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def page_response(page: list[dict], next_cursor: Optional[str]) -> ORJSONResponse:
+    """
+    List body as before; the cursor for the next page travels in a header.
+    Pages are plain dicts of column values, so orjson encodes them directly
+    without a response_model validation pass or jsonable_encoder.
+    """
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ORJSONResponse(content=page, headers=headers)
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": list[OrderResponse], "description": "One page of orders; the next cursor is in X-Next-Cursor"}},
+    dependencies=[Depends(admin_auth_dependency)]
+)
 def list_orders(
+    limit: int = Query(config.ORDER_PAGE_DEFAULT_LIMIT, ge=1, le=config.ORDER_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,total_price"),
     order_service: OrderService = Depends(get_order_service),
     ):
     """
-    Retrieve all orders. admin only.
+    Retrieve orders one page at a time, newest first. admin only.
     """
     try:
-        logger.info("Listing all orders")
-        orders = order_service.get_all_orders()
-        return orders
+        logger.info(f"Listing orders (limit={limit}, cursor={cursor}, fields={fields})")
+        page, next_cursor = order_service.list_orders_page(limit, cursor, fields)
+        return page_response(page, next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching orders: {str(e)}")
         raise HTTPException(
@@ -32,18 +64,84 @@ def list_orders(
             detail=f"An error occurred while fetching orders: {str(e)}"
         )
 
+@router.get(
+    "/changes",
+    response_model=None,
+    responses={200: {"model": list[OrderResponse], "description": "Changed orders, oldest change first; resume from X-Next-Cursor"}},
+    dependencies=[Depends(admin_auth_dependency)]
+)
+async def list_order_changes(
+    since: Optional[str] = Query(None, description="X-Next-Cursor value from the previous poll; omit to start from the beginning"),
+    limit: int = Query(config.ORDER_PAGE_DEFAULT_LIMIT, ge=1, le=config.ORDER_PAGE_MAX_LIMIT),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,updated_at"),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
+    ):
+    """
+    Orders created or updated since the cursor, in the order they changed. admin only.
+    Keep polling with the returned cursor; a page shorter than limit means you are caught up.
+    """
+    try:
+        logger.info(f"Listing order changes (since={since}, limit={limit}, fields={fields})")
+        page, next_cursor = await order_service.list_changes_page(limit, since, fields)
+        return page_response(page, next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching order changes: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while fetching order changes: {str(e)}"
+        )
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}, "application/gzip": {}}}},
+    dependencies=[Depends(admin_auth_dependency)]
+)
+def export_orders(
+    export_format: str = Query("csv", alias="format", description="csv or ndjson"),
+    compress: bool = Query(False, alias="gzip", description="gzip-compress the file"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, description="Only orders placed at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only orders placed before this time"),
+    ):
+    """
+    Stream every order with its items as CSV or NDJSON, one record per order. admin only.
+    """
+    try:
+        logger.info(f"Exporting orders as {export_format} (gzip={compress}, status={order_status})")
+        criteria = order_queries.filter_criteria(order_status, date_from, date_to)
+        body = order_export.export_orders(export_format, compress, *criteria)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    filename = f"orders.{export_format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if compress else order_export.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 @router.get("/{order_id}", response_model=OrderResponse, dependencies=[Depends(customer_auth_dependency)])
-def get_order(
+async def get_order(
     order_id: str,
-    order_service: OrderService = Depends(get_order_service),
+    if_none_match: Optional[str] = Header(None),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
     ):
     """
     Retrieve an order by its ID. admin and customer only.
+    Answers 304 when If-None-Match still holds the order's ETag.
     """
     try:
         logger.info(f"Fetching order with ID: {order_id}")
-        order = order_service.get_order_by_id(order_id)
-        return order
+        if if_none_match:
+            etag = etag_for(await order_service.get_order_version(order_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        payload = await order_service.get_order_payload(order_id)
+        version = payload_version(payload)
+        headers = {"ETag": etag_for(version)} if version is not None else None
+        return Response(content=payload, media_type="application/json", headers=headers)
     except ValueError as e:
         logger.warning(f"Order not found: {order_id} - {str(e)}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -54,21 +152,34 @@ def get_order(
             detail=f"An error occurred while fetching the order: {str(e)}"
         )
 
-@router.get("/user/{email}", response_model=list[OrderResponse], dependencies=[Depends(customer_auth_dependency)])
-def get_orders_by_user(
-    email: str, 
-    order_service: OrderService = Depends(get_order_service),
+@router.get(
+    "/user/{email}",
+    response_model=None,
+    responses={200: {"model": list[OrderResponse], "description": "One page of orders; the next cursor is in X-Next-Cursor"}},
+    dependencies=[Depends(customer_auth_dependency)]
+)
+async def get_orders_by_user(
+    email: str,
+    limit: int = Query(config.ORDER_PAGE_DEFAULT_LIMIT, ge=1, le=config.ORDER_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, description="Only orders placed at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only orders placed before this time"),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
     ):
     """
-    Retrieve all orders for the specified user. admin and customer only.
+    Retrieve the specified user's orders one page at a time, newest first. admin and customer only.
     """
     try:
         logger.info(f"Fetching orders for user: {email}")
-        orders = order_service.get_user_orders(email)
-        return orders
+        page, next_cursor = await order_service.list_user_orders_page(
+            email, limit, cursor, fields, order_status, date_from, date_to
+        )
+        return page_response(page, next_cursor)
     except ValueError as e:
-        logger.warning(f"Orders not found for user: {email} - {str(e)}")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        logger.warning(f"Invalid order query for user: {email} - {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching orders for user {email}: {str(e)}")
         raise HTTPException(
@@ -76,21 +187,34 @@ def get_orders_by_user(
             detail=f"An error occurred while fetching user orders: {str(e)}"
         )
 
-@router.get("/vendor/{vendor_id}", response_model=list[OrderResponse], dependencies=[Depends(vendor_auth_dependency)])
-def get_orders_by_vendor(
+@router.get(
+    "/vendor/{vendor_id}",
+    response_model=None,
+    responses={200: {"model": list[OrderResponse], "description": "One page of orders; the next cursor is in X-Next-Cursor"}},
+    dependencies=[Depends(vendor_auth_dependency)]
+)
+async def get_orders_by_vendor(
     vendor_id: str,
-    order_service: OrderService = Depends(get_order_service),
+    limit: int = Query(config.ORDER_PAGE_DEFAULT_LIMIT, ge=1, le=config.ORDER_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, description="Only orders placed at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Only orders placed before this time"),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
     ):
     """
-    Retrieve all orders for the specified vendor. admin and vendor only.
+    Retrieve the specified vendor's orders one page at a time, newest first. admin and vendor only.
     """
     try:
         logger.info(f"Fetching orders for vendor: {vendor_id}")
-        orders = order_service.get_vendor_orders(vendor_id)
-        return orders
+        page, next_cursor = await order_service.list_vendor_orders_page(
+            vendor_id, limit, cursor, fields, order_status, date_from, date_to
+        )
+        return page_response(page, next_cursor)
     except ValueError as e:
-        logger.warning(f"Orders not found for vendor: {vendor_id} - {str(e)}")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        logger.warning(f"Invalid order query for vendor: {vendor_id} - {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching orders for vendor {vendor_id}: {str(e)}")
         raise HTTPException(
@@ -98,6 +222,53 @@ def get_orders_by_vendor(
             detail=f"An error occurred while fetching vendor orders: {str(e)}"
         )
 
+@router.get("/vendor/{vendor_id}/stats/daily", response_model=list[VendorDailyStats], dependencies=[Depends(vendor_auth_dependency)])
+async def get_vendor_daily_stats(
+    vendor_id: str,
+    date_from: Optional[date] = Query(None, description="First day, defaults to VENDOR_STATS_DEFAULT_DAYS ago"),
+    date_to: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
+    ):
+    """
+    Order count and revenue per day and status for the vendor's dashboard. admin and vendor only.
+    """
+    try:
+        logger.info(f"Fetching daily stats for vendor: {vendor_id}")
+        return ORJSONResponse(content=await order_service.get_vendor_daily_stats(vendor_id, date_from, date_to, order_status))
+    except ValueError as e:
+        logger.warning(f"Invalid stats query for vendor: {vendor_id} - {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching stats for vendor {vendor_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while fetching vendor stats: {str(e)}"
+        )
+
+@router.get("/vendor/{vendor_id}/stats/summary", response_model=VendorStatsSummary, dependencies=[Depends(vendor_auth_dependency)])
+async def get_vendor_stats_summary(
+    vendor_id: str,
+    date_from: Optional[date] = Query(None, description="First day, defaults to VENDOR_STATS_DEFAULT_DAYS ago"),
+    date_to: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    order_service: AsyncOrderService = Depends(get_async_order_service),
+    ):
+    """
+    Order count and revenue totals over a date range for the vendor's dashboard. admin and vendor only.
+    """
+    try:
+        logger.info(f"Fetching stats summary for vendor: {vendor_id}")
+        return await order_service.get_vendor_stats_summary(vendor_id, date_from, date_to)
+    except ValueError as e:
+        logger.warning(f"Invalid stats query for vendor: {vendor_id} - {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching stats summary for vendor {vendor_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while fetching vendor stats: {str(e)}"
+        )
+
 @router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(customer_auth_dependency)])
 def create_order_endpoint(
     order: OrderCreate, 
@@ -118,6 +289,63 @@ def create_order_endpoint(
             detail=f"An error occurred while creating the order: {str(e)}"
         )
 
+@router.put("/vendor/{vendor_id}/status", response_model=BulkStatusResponse)
+def update_vendor_order_statuses(
+    vendor_id: str,
+    request: BulkStatusUpdate,
+    vendor_email: str | None = Depends(vendor_email_dependency),
+    order_service: OrderService = Depends(get_order_service),
+    ):
+    """
+    Set the status of several of the vendor's orders at once, with an outcome per order ID.
+    vendor and admin only; a vendor can only update its own orders.
+    """
+    if vendor_email is not None and vendor_id != vendor_email:
+        logger.warning(f"Vendor {vendor_email} tried to update the orders of vendor {vendor_id}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Vendors can only update their own orders.")
+    try:
+        logger.info(f"Updating {len(request.order_ids)} orders of vendor {vendor_id} to status {request.status}")
+        outcomes = order_service.update_vendor_order_statuses(vendor_id, request.order_ids, request.status)
+        return BulkStatusResponse(
+            status=request.status,
+            updated=sum(outcome == "updated" for outcome in outcomes.values()),
+            results=[BulkStatusResult(order_id=order_id, outcome=outcome) for order_id, outcome in outcomes.items()],
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid bulk status update for vendor {vendor_id}: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error updating order statuses for vendor {vendor_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while updating the order statuses: {str(e)}"
+        )
+
+@router.post("/rollback", response_model=BulkRollbackResponse, dependencies=[Depends(admin_auth_dependency)])
+def rollback_orders(
+    request: BulkRollback,
+    order_service: OrderService = Depends(get_order_service),
+    ):
+    """
+    Cancel the orders of many saga transactions at once, with an outcome per transaction ID. admin only.
+    """
+    try:
+        logger.info(f"Rolling back orders of {len(request.transaction_ids)} transactions")
+        outcomes = order_service.rollback_orders(request.transaction_ids)
+        return BulkRollbackResponse(
+            canceled=sum(outcome == "canceled" for outcome in outcomes.values()),
+            results=[BulkRollbackResult(transaction_id=tid, outcome=outcome) for tid, outcome in outcomes.items()],
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid bulk rollback: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error rolling back orders: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while rolling back the orders: {str(e)}"
+        )
+
 @router.put("/{order_id}/status/{new_status}", response_model=OrderResponse, dependencies=[Depends(vendor_auth_dependency)])
 def update_status(
     order_id: str,
@@ -6,10 +6,26 @@ DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD",default="root")
 DATABASE_HOST = os.getenv("DATABASE_HOST",default="localhost")  # 'localhost' works if you're connecting from the host
 DATABASE_NAME = os.getenv("DATABASE_NAME",default="orders_db")
 
-SQLALCHEMY_DATABASE_URL = (
-    f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    default=f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
 )
 
+def async_database_url(url: str) -> str:
+    """The same database through an asyncio driver."""
+    return url.replace("mysql+pymysql://", "mysql+asyncmy://", 1).replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# Used by the async read endpoints
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", default=async_database_url(SQLALCHEMY_DATABASE_URL))
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", default=20))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", default=20))
+
+# Comma-separated read replicas for @reads_from_replica service methods; empty means primary only
+REPLICA_DATABASE_URLS = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", default="").split(",") if url.strip()]
+# Reads stay on the primary this long after any write committed by this process
+REPLICA_READ_AFTER_WRITE_SECONDS = float(os.getenv("REPLICA_READ_AFTER_WRITE_SECONDS", default=1.0))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", default=10))
+
 AUTHERIZATION_SERVER_URL = os.getenv("AUTHERIZATION_SERVER_URL",default="http://localhost")
 AUTHORIZATION_SERVER_PORT = os.getenv("AUTHORIZATION_SERVER_PORT",default=8086)
 AUTHORIZATION_SERVER_CUSTOMER_ENDPOINT = "/customer-policy"
@@ -22,4 +38,53 @@ RABBITMQ_USER = os.getenv("RABBITMQ_USER", default="guest")
 RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD", default="guest")
 RABBITMQ_PRODUCTS_QUEUE = "products_queue"
 RABBITMQ_ORDERS_QUEUE = "orders_queue"
-RABBITMQ_ORCHESTRATION_QUEUE = "orchestration_queue"
\ No newline at end of file
+RABBITMQ_ORCHESTRATION_QUEUE = "orchestration_queue"
+# The order consumer inserts up to this many create_order messages in one transaction,
+# waiting at most ORDER_CREATE_BATCH_WAIT_MS for a batch to fill; 1 disables batching
+ORDER_CREATE_BATCH_SIZE = int(os.getenv("ORDER_CREATE_BATCH_SIZE", default=50))
+ORDER_CREATE_BATCH_WAIT_MS = float(os.getenv("ORDER_CREATE_BATCH_WAIT_MS", default=20))
+
+EVENT_LOOP_MONITOR_INTERVAL = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", default=0.25))
+EVENT_LOOP_LAG_THRESHOLD = float(os.getenv("EVENT_LOOP_LAG_THRESHOLD", default=0.1))
+EVENT_LOOP_REPORT_INTERVAL = float(os.getenv("EVENT_LOOP_REPORT_INTERVAL", default=60))
+
+QUEUE_MONITOR_INTERVAL = float(os.getenv("QUEUE_MONITOR_INTERVAL", default=15))
+QUEUE_MONITOR_QUEUES = os.getenv("QUEUE_MONITOR_QUEUES", default=RABBITMQ_ORDERS_QUEUE).split(",")
+
+# Span export appends to TRACE_EXPORT_PATH without rotation, so it is opt-in
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", default="false").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", default="traces.jsonl")
+
+ORDER_PAGE_DEFAULT_LIMIT = int(os.getenv("ORDER_PAGE_DEFAULT_LIMIT", default=50))
+ORDER_PAGE_MAX_LIMIT = int(os.getenv("ORDER_PAGE_MAX_LIMIT", default=200))
+# Changes newer than this are held back from the change feed until in-flight transactions commit
+ORDER_CHANGES_SAFETY_LAG_SECONDS = float(os.getenv("ORDER_CHANGES_SAFETY_LAG_SECONDS", default=5))
+
+# Rows fetched per round trip from the server-side cursor, and bytes per streamed chunk
+ORDER_EXPORT_YIELD_PER = int(os.getenv("ORDER_EXPORT_YIELD_PER", default=2000))
+ORDER_EXPORT_CHUNK_BYTES = int(os.getenv("ORDER_EXPORT_CHUNK_BYTES", default=64 * 1024))
+
+# Most order IDs accepted by one bulk status update
+ORDER_BULK_STATUS_MAX_ORDERS = int(os.getenv("ORDER_BULK_STATUS_MAX_ORDERS", default=500))
+
+# Transaction IDs per SELECT/UPDATE round of a mass rollback (each round commits on its own)
+ORDER_ROLLBACK_CHUNK_SIZE = int(os.getenv("ORDER_ROLLBACK_CHUNK_SIZE", default=500))
+
+# Vendor dashboard ranges read from the daily rollup
+VENDOR_STATS_DEFAULT_DAYS = int(os.getenv("VENDOR_STATS_DEFAULT_DAYS", default=30))
+VENDOR_STATS_MAX_DAYS = int(os.getenv("VENDOR_STATS_MAX_DAYS", default=366))
+
+# Read-through cache for GET /orders/{order_id}
+ORDER_CACHE_ENABLED = os.getenv("ORDER_CACHE_ENABLED", default="true").lower() == "true"
+ORDER_CACHE_MAX_ENTRIES = int(os.getenv("ORDER_CACHE_MAX_ENTRIES", default=10000))
+ORDER_CACHE_TTL = float(os.getenv("ORDER_CACHE_TTL", default=30))
+# Fraction of cache hits re-read from the database to measure staleness
+ORDER_CACHE_VERIFY_RATE = float(os.getenv("ORDER_CACHE_VERIFY_RATE", default=0.01))
+ORDER_CACHE_REDIS_ENABLED = os.getenv("ORDER_CACHE_REDIS_ENABLED", default="false").lower() == "true"
+ORDER_CACHE_REDIS_TTL = int(os.getenv("ORDER_CACHE_REDIS_TTL", default=300))
+# How long an invalidated order stays uncacheable in Redis; must outlast the slowest single-order read
+ORDER_CACHE_TOMBSTONE_TTL = int(os.getenv("ORDER_CACHE_TOMBSTONE_TTL", default=10))
+ORDER_CACHE_CHANNEL = os.getenv("ORDER_CACHE_CHANNEL", default="order-cache-invalidate")
+REDIS_HOST = os.getenv("REDIS_HOST", default="localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", default=6379))
+REDIS_DB = int(os.getenv("REDIS_DB", default=0))
@@ -2,11 +2,49 @@
 import time
 
 from sqlalchemy import create_engine
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, TimeoutError as SATimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool
 
-from core.config import SQLALCHEMY_DATABASE_URL
+from core.config import (
+    SQLALCHEMY_DATABASE_URL, ASYNC_SQLALCHEMY_DATABASE_URL, ASYNC_DB_POOL_SIZE, ASYNC_DB_MAX_OVERFLOW,
+    REPLICA_DATABASE_URLS, REPLICA_READ_AFTER_WRITE_SECONDS, REPLICA_HEALTH_CHECK_INTERVAL, async_database_url
+)
+from monitoring.metrics import (
+    DB_POOL_CHECKOUTS, DB_POOL_WAIT, DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_TIMEOUTS
+)
+from monitoring.tracing import instrument_engine
+from db.routing import AsyncRoutingSession, Replica, ReplicaSet, RoutingSession
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that counts checkouts and records how long each caller waited
+    for a connection (including time to open a new overflow connection),
+    plus the checked-out and overflow levels after every checkout and return.
+    """
+    def _record_levels(self):
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(self.overflow())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except SATimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+            DB_POOL_CHECKOUTS.inc()
+            self._record_levels()
+
+    def _do_return_conn(self, record):
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._record_levels()
 
 def create_engine_with_retry(
     url: str,
@@ -35,15 +73,57 @@ def create_engine_with_retry(
 
 engine = create_engine_with_retry(
     SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,       # auto-check stale connections
     pool_size=10,             # optional, tune as you like
     max_overflow=20,          # optional
 )
+instrument_engine(engine)
+
+# Replicas are not connected at startup: one that is down only leaves the rotation
+replicas = ReplicaSet(
+    read_after_write=REPLICA_READ_AFTER_WRITE_SECONDS,
+    check_interval=REPLICA_HEALTH_CHECK_INTERVAL,
+)
+for replica_url in REPLICA_DATABASE_URLS:
+    replica_engine = create_engine(replica_url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    replica_async_engine = create_async_engine(
+        async_database_url(replica_url),
+        pool_pre_ping=True,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    )
+    instrument_engine(replica_engine)
+    instrument_engine(replica_async_engine.sync_engine)
+    replicas.add(Replica(
+        name=replica_engine.url.render_as_string(hide_password=True),
+        engine=replica_engine,
+        async_engine=replica_async_engine,
+    ))
 
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    replicas=replicas,
+)
+
+# The async engine only opens connections on first use
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=ASYNC_DB_POOL_SIZE,
+    max_overflow=ASYNC_DB_MAX_OVERFLOW,
+)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    replicas=replicas,
 )
 
 Base = declarative_base()
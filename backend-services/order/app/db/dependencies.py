@@ -1,9 +1,30 @@
 """ Database dependencies """
-from db.base import SessionLocal
+from contextlib import contextmanager
+from db.base import SessionLocal, AsyncSessionLocal
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@contextmanager
+def session_scope():
+    """
+    Short-lived unit of work for code outside a request (e.g. message handlers):
+    commits on success, rolls back on error and always closes the session.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,243 @@
+"""
+Read-replica routing.
+
+Sessions made by SessionLocal and AsyncSessionLocal are RoutingSessions: every
+statement goes to the primary unless it runs inside a service method marked
+with @reads_from_replica, in which case a healthy replica is picked round robin.
+Reads stay on the primary for a session that has already written, and for
+REPLICA_READ_AFTER_WRITE_SECONDS after any write committed by this process, so
+callers read their own writes despite replication lag.
+
+Replicas are taken out of rotation when a query on them fails with a
+disconnect (the method is then retried on the primary) or when the periodic
+health check cannot reach them, and come back once a health check succeeds.
+"""
+import functools
+import inspect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from monitoring.metrics import DB_REPLICA_HEALTHY, DB_ROUTED_READS
+from logger import logger
+
+READ_ONLY_KEY = "read_only"
+WROTE_KEY = "wrote"
+REPLICA_KEY = "replica"
+LAST_REPLICA_KEY = "last_replica"
+
+
+class Replica:
+    """One replica URL with its sync engine and, optionally, an async engine."""
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine | None = None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.healthy = True
+        DB_REPLICA_HEALTHY.labels(replica=name).set(1)
+
+
+class ReplicaSet:
+    """
+    Health-checked round robin over the configured replicas, plus the
+    process-wide read-after-write window.
+    """
+    def __init__(self, read_after_write: float, check_interval: float):
+        self.replicas: list[Replica] = []
+        self.read_after_write = read_after_write
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._last_write = float("-inf")
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, replica: Replica):
+        self.replicas.append(replica)
+        for engine in filter(None, (replica.engine, replica.async_engine and replica.async_engine.sync_engine)):
+            event.listen(engine, "handle_error", functools.partial(self._on_error, replica))
+
+    def _on_error(self, replica: Replica, context):
+        if context.is_disconnect:
+            self.mark_down(replica, str(context.original_exception))
+
+    def choose(self) -> Replica | None:
+        """Next healthy replica, or None when reads must go to the primary."""
+        if not self.replicas or time.monotonic() - self._last_write < self.read_after_write:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def record_write(self):
+        self._last_write = time.monotonic()
+
+    def mark_down(self, replica: Replica, reason: str):
+        if replica.healthy:
+            logger.warning(f"Replica {replica.name} taken out of rotation: {reason}")
+        replica.healthy = False
+        DB_REPLICA_HEALTHY.labels(replica=replica.name).set(0)
+
+    def mark_up(self, replica: Replica):
+        if not replica.healthy:
+            logger.info(f"Replica {replica.name} back in rotation")
+        replica.healthy = True
+        DB_REPLICA_HEALTHY.labels(replica=replica.name).set(1)
+
+    def check(self):
+        """Ping every replica once through its sync engine."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as e:
+                self.mark_down(replica, str(e))
+            else:
+                self.mark_up(replica)
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def start(self):
+        if not self.replicas:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"Replica health check started for {[r.name for r in self.replicas]} "
+                    f"(interval={self.check_interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends read-only work to a replica. Any write, or any read
+    outside a read_only block, uses the session's own bind (the primary).
+    """
+    engine_attr = "engine"
+
+    def __init__(self, *args, replicas: ReplicaSet | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replicas is not None
+            and self.info.get(READ_ONLY_KEY)
+            and not self.info.get(WROTE_KEY)
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            replica = self.info.get(REPLICA_KEY) or self.replicas.choose()
+            if replica is not None:
+                self.info[REPLICA_KEY] = self.info[LAST_REPLICA_KEY] = replica
+                DB_ROUTED_READS.labels(target="replica").inc()
+                engine = getattr(replica, self.engine_attr)
+                return engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+            DB_ROUTED_READS.labels(target="primary").inc()
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+class AsyncRoutingSession(RoutingSession):
+    """sync_session_class for AsyncSessionLocal: routes to the replicas' async engines."""
+    engine_attr = "async_engine"
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_orm_write(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_commit(session):
+    if session.info.get(WROTE_KEY) and session.replicas is not None:
+        session.replicas.record_write()
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session, transaction):
+    # The next transaction may pick a different replica
+    if transaction.parent is None:
+        session.info.pop(REPLICA_KEY, None)
+
+
+@contextmanager
+def read_only(session):
+    """Let the session route the reads issued inside the block to a replica."""
+    previous = session.info.get(READ_ONLY_KEY, False)
+    session.info[READ_ONLY_KEY] = True
+    try:
+        yield
+    finally:
+        session.info[READ_ONLY_KEY] = previous
+
+
+def _failed_replica(session, error: Exception) -> Replica | None:
+    """
+    The replica that served a failed read-only call, if the failure was a
+    connection problem. Services re-raise database errors as SQLAlchemyError,
+    so the original exception is looked for in the chain as well.
+    """
+    replica = session.info.get(LAST_REPLICA_KEY)
+    if replica is None:
+        return None
+    while error is not None:
+        if isinstance(error, OperationalError):
+            session.replicas.mark_down(replica, str(error.orig))
+            return replica
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def reads_from_replica(method):
+    """
+    Run a read-only service method against a replica when one is available.
+    The service must keep its session in self.db. If the replica cannot be
+    reached it is taken out of rotation and the method is retried on the primary.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            self.db.info.pop(LAST_REPLICA_KEY, None)
+            try:
+                with read_only(self.db):
+                    return await method(self, *args, **kwargs)
+            except SQLAlchemyError as e:
+                if _failed_replica(self.db, e) is None:
+                    raise
+                await self.db.rollback()
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.db.info.pop(LAST_REPLICA_KEY, None)
+        try:
+            with read_only(self.db):
+                return method(self, *args, **kwargs)
+        except SQLAlchemyError as e:
+            if _failed_replica(self.db, e) is None:
+                raise
+            self.db.rollback()
+            return method(self, *args, **kwargs)
+    return wrapper
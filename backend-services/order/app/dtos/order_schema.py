@@ -1,7 +1,7 @@
 """Order schema."""
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List
+from datetime import date, datetime
 
 class OrderItemCreate(BaseModel):
     product_id: str
@@ -32,7 +32,51 @@ class OrderResponse(BaseModel):
     order_date: datetime
     delivery_date: Optional[datetime] = None
     payment_id: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
     items: List[OrderItemResponse]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkStatusUpdate(BaseModel):
+    order_ids: List[str]
+    status: str
+
+class BulkStatusResult(BaseModel):
+    order_id: str
+    outcome: str  # "updated", "unchanged" or "not_found"
+
+class BulkStatusResponse(BaseModel):
+    status: str
+    updated: int
+    results: List[BulkStatusResult]
+
+class BulkRollback(BaseModel):
+    transaction_ids: List[str]
+
+class BulkRollbackResult(BaseModel):
+    transaction_id: str
+    outcome: str  # "canceled", "unchanged" or "not_found"
+
+class BulkRollbackResponse(BaseModel):
+    canceled: int
+    results: List[BulkRollbackResult]
+
+class VendorDailyStats(BaseModel):
+    day: date
+    status: str
+    order_count: int
+    revenue: float
+
+class StatusTotals(BaseModel):
+    order_count: int
+    revenue: float
+
+class VendorStatsSummary(BaseModel):
+    vendor_email: str
+    date_from: date
+    date_to: date
+    order_count: int
+    revenue: float  # excludes Canceled and Refund orders
+    by_status: Dict[str, StatusTotals]
@@ -1,5 +1,7 @@
 """Order model."""
-from sqlalchemy import Column, String, TIMESTAMP, func, Float, Enum
+from datetime import datetime
+from sqlalchemy import Column, String, TIMESTAMP, DateTime, Integer, func, Float, Enum, Index, literal_column
+from sqlalchemy.dialects import mysql
 from entity.order_item import OrderItem
 from db.base import Base
 from sqlalchemy.orm import relationship
@@ -19,8 +21,25 @@ class Order(Base):
     delivery_address = Column(String(255), nullable=False)
     transaction_id = Column(String(36), nullable=True)
     status = Column(Enum(*ALLOWED_STATUSES), nullable=False, default="Pending")
+    # Set on every INSERT and UPDATE (ORM and Core alike); microseconds on MySQL keep the change feed ordered
+    updated_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), nullable=False,
+                        default=datetime.now, onupdate=datetime.now)
+    # Row version behind the order's ETag; every UPDATE (ORM or Core alike) bumps it in SQL
+    version = Column(Integer, nullable=False, default=1, onupdate=literal_column("version") + 1)
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination of the unfiltered listing (newest first)
+        Index("ix_orders_order_date_id", "order_date", "id"),
+        # Keyset pagination of a user's / vendor's orders by date
+        Index("ix_orders_user_email_order_date", "user_email", "order_date"),
+        Index("ix_orders_vendor_email_order_date", "vendor_email", "order_date"),
+        # Keyset pagination of the change feed
+        Index("ix_orders_updated_at_id", "updated_at", "id"),
+        # One order per saga transaction: a redelivered create_order finds the existing order
+        Index("ux_orders_transaction_id", "transaction_id", unique=True),
+    )
+
     def __init__(self, user_email: str, vendor_email: str, total_price: float, delivery_address: str,
                  description: str = None, delivery_date = None, status: str = "Pending", transaction_id: str = None):
         """
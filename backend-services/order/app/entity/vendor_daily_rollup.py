@@ -0,0 +1,22 @@
+"""Vendor daily rollup model."""
+from sqlalchemy import Column, String, Date, Integer, Float, Enum
+from db.base import Base
+from . import ALLOWED_STATUSES
+
+class VendorDailyRollup(Base):
+    """
+    Order count and revenue per vendor, day and status. Maintained in the same
+    transaction as the order writes (see services/order_rollups.py), so vendor
+    dashboards read one row per day and status instead of every order.
+    """
+    __tablename__ = "vendor_daily_rollups"
+
+    vendor_email = Column(String(100), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(*ALLOWED_STATUSES), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+    def __str__(self):
+        return (f"<VendorDailyRollup(vendor_email={self.vendor_email}, day={self.day}, status={self.status}, "
+                f"order_count={self.order_count}, revenue={self.revenue})>")
@@ -5,10 +5,16 @@ from core import config
 from db.dependencies import get_db
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
-from db.base import engine, Base
-from entity import order, order_item
-from api.endpoints import orders, logs
+from db.base import engine, async_engine, replicas, Base
+from db.migrations import apply_migrations
+from entity import order, order_item, vendor_daily_rollup
+from api.endpoints import orders, logs, metrics, admin
 from services.rabbitmq_consumer import get_consumer_service
+from monitoring.event_loop_monitor import get_event_loop_monitor
+from monitoring.middleware import MetricsMiddleware
+from monitoring.queue_monitor import get_queue_monitor
+from services.order_cache import get_order_cache
+from services.order_rollups import check_dialect as check_rollup_dialect
 # Add these imports for logging
 from logger import logger
 
@@ -16,7 +22,17 @@ from logger import logger
 async def lifespan(app: FastAPI):
     # Startup: create and start the consumer thread
     Base.metadata.create_all(bind=engine)
+    apply_migrations(engine)
+    # Every order write maintains the rollups: refuse to start rather than fail them all
+    check_rollup_dialect(engine.dialect.name)
     logger.info("Database connected")
+    loop_monitor = get_event_loop_monitor()
+    loop_monitor.start()
+    queue_monitor = get_queue_monitor()
+    queue_monitor.start()
+    replicas.start()
+    order_cache = get_order_cache()
+    order_cache.start()
     consumer = get_consumer_service(queue=config.RABBITMQ_ORDERS_QUEUE)
     thread = threading.Thread(target=consumer.start_consuming, daemon=True)
     thread.start()
@@ -28,6 +44,11 @@ async def lifespan(app: FastAPI):
         consumer.stop_consuming()
         thread.join(timeout=5)
         logger.info("Consumer stopped.")
+        queue_monitor.stop()
+        replicas.stop()
+        await order_cache.stop()
+        await async_engine.dispose()
+        await loop_monitor.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -38,10 +59,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor for list endpoints
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(orders.router)
 app.include_router(logs.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root(db: Session = Depends(get_db)):
@@ -0,0 +1,123 @@
+"""
+Prometheus metrics for the order service.
+All metrics live in the default registry and are served by GET /metrics.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the event loop should have woken the monitor and when it did.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Number of times the event loop was blocked longer than the threshold, by offending code location.",
+    ["location"],
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+CONSUMER_HANDLER_LATENCY = Histogram(
+    "consumer_handler_duration_seconds",
+    "Time spent handling one consumed message, by event type.",
+    ["event", "outcome"],
+)
+CONSUMER_BATCH_SIZE = Histogram(
+    "consumer_batch_size",
+    "Messages handled together in one consumer batch, by event type.",
+    ["event"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+MESSAGES_CONSUMED = Counter(
+    "messages_consumed_total",
+    "Messages consumed from RabbitMQ.",
+    ["queue", "event"],
+)
+MESSAGES_PUBLISHED = Counter(
+    "messages_published_total",
+    "Messages published to RabbitMQ.",
+    ["queue", "event"],
+)
+AUTH_REQUEST_LATENCY = Histogram(
+    "auth_request_duration_seconds",
+    "Latency of calls to the authorization server.",
+    ["endpoint", "outcome"],
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the SQLAlchemy pool.",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool.",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling).",
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout because the pool was exhausted.",
+)
+QUEUE_MESSAGES = Gauge(
+    "rabbitmq_queue_messages",
+    "Messages ready in the queue, from the last passive declare.",
+    ["queue"],
+)
+QUEUE_CONSUMERS = Gauge(
+    "rabbitmq_queue_consumers",
+    "Consumers attached to the queue, from the last passive declare.",
+    ["queue"],
+)
+CONSUMER_LAG = Histogram(
+    "message_consumer_lag_seconds",
+    "Time between a message being published and a consumer receiving it.",
+    ["queue"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+DB_ROUTED_READS = Counter(
+    "db_routed_reads_total",
+    "Statements issued by read-only service methods, by where they were sent.",
+    ["target"],
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "1 while the read replica is in rotation, 0 while it is out after a failed check or query.",
+    ["replica"],
+)
+ORDER_CACHE_LOOKUPS = Counter(
+    "order_cache_lookups_total",
+    "Single-order cache lookups by outcome (local_hit, redis_hit, miss).",
+    ["result"],
+)
+ORDER_CACHE_INVALIDATIONS = Counter(
+    "order_cache_invalidations_total",
+    "Cache entries dropped or refreshed because the order changed, by mutation.",
+    ["reason"],
+)
+ORDER_CACHE_ENTRY_AGE = Histogram(
+    "order_cache_entry_age_seconds",
+    "Age of in-process cache entries when they are served.",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+ORDER_CACHE_STALE = Counter(
+    "order_cache_stale_total",
+    "Sampled cache hits that no longer matched the database.",
+)
+ORDER_CACHE_VERIFIED = Counter(
+    "order_cache_verified_total",
+    "Cache hits re-read from the database to measure staleness.",
+)
+ORDER_CREATE_DUPLICATES = Counter(
+    "order_create_duplicates_total",
+    "create_order requests whose transaction_id already had an order (redeliveries), by path.",
+    ["path"],
+)
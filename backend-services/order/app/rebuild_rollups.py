@@ -0,0 +1,30 @@
+"""
+Recompute the vendor daily rollups from the orders table.
+
+Run once after deploying the rollup table on a database that already has
+orders, or whenever the rollup is suspected to have drifted:
+
+    PYTHONPATH=app python app/rebuild_rollups.py --chunk-size 10000 [--vendor vendor@example.com]
+"""
+import argparse
+import time
+
+from db.base import Base, engine
+from entity import order, order_item, vendor_daily_rollup  # noqa: F401
+from services.order_rollups import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="orders aggregated per query")
+    parser.add_argument("--vendor", default=None, help="only rebuild this vendor's rows")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    rows = rebuild_rollups(engine, chunk_size=args.chunk_size, vendor_email=args.vendor)
+    print(f"Rebuilt {rows} rollup rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Async read path for orders.
+
+Serves the read endpoints on the event loop over the async engine instead of
+Starlette's threadpool, so concurrency is bounded by the connection pool rather
+than by worker threads. Statements come from order_queries and match the sync
+OrderService listings.
+"""
+import random
+from datetime import date, datetime, timedelta
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from core import config
+from db.dependencies import get_async_db
+from db.routing import reads_from_replica
+from entity import ALLOWED_STATUSES
+from entity.order import Order
+from services import order_queries, order_rollups
+from services.order_cache import OrderCache, get_order_cache, payload_version, serialize_order
+from monitoring.metrics import ORDER_CACHE_STALE, ORDER_CACHE_VERIFIED
+from logger import logger
+
+class AsyncOrderService:
+    """
+    Read-only order queries over an AsyncSession.
+    """
+    def __init__(self, db: AsyncSession, cache: OrderCache | None = None):
+        self.db = db
+        self.cache = cache or get_order_cache()
+
+    @reads_from_replica
+    async def get_order_by_id(self, order_id: str) -> dict:
+        """
+        Retrieve an order and its items by the order's ID.
+
+        Returns:
+            dict: The order, shaped like OrderResponse.
+
+        Raises:
+            ValueError: If the order ID is invalid or no order is found.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not order_id or not isinstance(order_id, str):
+            raise ValueError("Invalid order ID.")
+
+        try:
+            row = (await self.db.execute(order_queries.select_order(order_id))).mappings().first()
+            if not row:
+                raise ValueError(f"No order found with ID: {order_id}")
+            items = (await self.db.execute(order_queries.select_items_for([order_id]))).mappings().all()
+            return order_queries.build_order(row, items)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving order with ID {order_id}: {str(e)}")
+            raise SQLAlchemyError(f"Database error while retrieving order with ID {order_id}: {str(e)}")
+
+    async def get_order_payload(self, order_id: str) -> bytes:
+        """
+        The serialized OrderResponse for an order, read through the order cache.
+        A sample of hits (ORDER_CACHE_VERIFY_RATE) is compared with the database
+        to measure how often the cache serves a stale order.
+
+        Raises:
+            ValueError: If the order ID is invalid or no order is found.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not config.ORDER_CACHE_ENABLED:
+            return serialize_order(await self.get_order_by_id(order_id))
+
+        cached = await self.cache.get(order_id)
+        if cached is not None and random.random() >= config.ORDER_CACHE_VERIFY_RATE:
+            return cached
+
+        epoch = self.cache.begin()
+        payload = serialize_order(await self.get_order_by_id(order_id))
+        if cached is not None:
+            ORDER_CACHE_VERIFIED.inc()
+            if cached != payload:
+                ORDER_CACHE_STALE.inc()
+                logger.warning(f"Order cache served a stale copy of order {order_id}")
+        await self.cache.put(order_id, payload, epoch)
+        return payload
+
+    async def _page_items(self, rows: list, projection: tuple[str, ...], limit: int) -> list | None:
+        """Item rows for a page's orders, with one query, when the projection asks for items."""
+        if order_queries.ITEMS_FIELD not in projection or not rows:
+            return None
+        order_ids = order_queries.page_order_ids(rows, limit)
+        return (await self.db.execute(order_queries.select_items_for(order_ids))).mappings().all()
+
+    async def get_order_version(self, order_id: str) -> int:
+        """
+        The current version of an order, for If-None-Match checks. Taken from
+        the cached payload when there is one, otherwise read with a primary key
+        lookup of the version column alone; items are never loaded.
+
+        Raises:
+            ValueError: If the order ID is invalid or no order is found.
+            SQLAlchemyError: If there is a database error.
+        """
+        if config.ORDER_CACHE_ENABLED:
+            cached = await self.cache.get(order_id)
+            # Payloads cached before versions were served carry none
+            version = payload_version(cached) if cached is not None else None
+            if version is not None:
+                return version
+        return await self._select_order_version(order_id)
+
+    @reads_from_replica
+    async def _select_order_version(self, order_id: str) -> int:
+        if not order_id or not isinstance(order_id, str):
+            raise ValueError("Invalid order ID.")
+
+        try:
+            version = (await self.db.execute(order_queries.select_order_version(order_id))).scalar()
+            if version is None:
+                raise ValueError(f"No order found with ID: {order_id}")
+            return version
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving the version of order {order_id}: {str(e)}")
+            raise SQLAlchemyError(f"Database error while retrieving the version of order {order_id}: {str(e)}")
+
+    @reads_from_replica
+    async def list_orders_page(self, limit: int, cursor: str | None = None, fields: str | None = None,
+                               *criteria) -> tuple[list[dict], str | None]:
+        """
+        Async counterpart of OrderService.list_orders_page.
+
+        Raises:
+            ValueError: If the cursor or a requested field is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        projection = order_queries.parse_fields(fields)
+        stmt = order_queries.select_orders_page(projection, limit, cursor, *criteria)
+        try:
+            rows = (await self.db.execute(stmt)).mappings().all()
+            items = await self._page_items(rows, projection, limit)
+            return order_queries.build_page(rows, items, projection, limit)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while listing orders: {str(e)}")
+            raise SQLAlchemyError(f"Database error while listing orders: {str(e)}")
+
+    async def list_user_orders_page(self, email: str, limit: int, cursor: str | None = None,
+                                    fields: str | None = None, status: str | None = None,
+                                    date_from: datetime | None = None,
+                                    date_to: datetime | None = None) -> tuple[list[dict], str | None]:
+        """Async counterpart of OrderService.list_user_orders_page."""
+        if not email or not isinstance(email, str):
+            raise ValueError("Invalid email address.")
+        criteria = order_queries.filter_criteria(status, date_from, date_to)
+        return await self.list_orders_page(limit, cursor, fields, Order.user_email == email, *criteria)
+
+    async def list_vendor_orders_page(self, vendor_email: str, limit: int, cursor: str | None = None,
+                                      fields: str | None = None, status: str | None = None,
+                                      date_from: datetime | None = None,
+                                      date_to: datetime | None = None) -> tuple[list[dict], str | None]:
+        """Async counterpart of OrderService.list_vendor_orders_page."""
+        if not vendor_email or not isinstance(vendor_email, str):
+            raise ValueError("Invalid vendor email.")
+        criteria = order_queries.filter_criteria(status, date_from, date_to)
+        return await self.list_orders_page(limit, cursor, fields, Order.vendor_email == vendor_email, *criteria)
+
+    async def list_changes_page(self, limit: int, since: str | None = None,
+                                fields: str | None = None) -> tuple[list[dict], str | None]:
+        """
+        Orders created or updated after the since cursor, oldest change first.
+
+        Rows changed within the last ORDER_CHANGES_SAFETY_LAG_SECONDS are held
+        back: a transaction that stamped updated_at earlier but commits later
+        would otherwise land behind a cursor the consumer has already passed.
+        Always reads the primary, since a lagging replica has the same problem.
+        Deleted orders do not appear in the feed.
+
+        Returns:
+            tuple: The page and the cursor to resume from. A page shorter than limit means the consumer is caught up.
+
+        Raises:
+            ValueError: If the cursor or a requested field is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        projection = order_queries.parse_fields(fields)
+        until = datetime.now() - timedelta(seconds=config.ORDER_CHANGES_SAFETY_LAG_SECONDS)
+        stmt = order_queries.select_changes_page(projection, limit, since, until)
+        try:
+            rows = (await self.db.execute(stmt)).mappings().all()
+            items = await self._page_items(rows, projection, limit)
+            page = order_queries.shape_rows(rows[:limit], items, projection)
+            return page, order_queries.changes_cursor(rows, limit, since)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while listing order changes: {str(e)}")
+            raise SQLAlchemyError(f"Database error while listing order changes: {str(e)}")
+
+    @reads_from_replica
+    async def get_vendor_daily_stats(self, vendor_email: str, date_from: date | None = None,
+                                     date_to: date | None = None, status: str | None = None) -> list[dict]:
+        """
+        Order count and revenue per day and status for a vendor, read from the
+        daily rollup (one row per day and status, never the orders themselves).
+
+        Raises:
+            ValueError: If the vendor, status or date range is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not vendor_email or not isinstance(vendor_email, str):
+            raise ValueError("Invalid vendor email.")
+        if status is not None and status not in ALLOWED_STATUSES:
+            raise ValueError(f"Invalid status. Allowed statuses: {ALLOWED_STATUSES}")
+        date_from, date_to = order_rollups.stats_range(date_from, date_to)
+        try:
+            stmt = order_rollups.select_vendor_rollups(vendor_email, date_from, date_to, status)
+            return [dict(row) for row in (await self.db.execute(stmt)).mappings().all()]
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while reading stats for vendor {vendor_email}: {str(e)}")
+            raise SQLAlchemyError(f"Database error while reading stats for vendor {vendor_email}: {str(e)}")
+
+    async def get_vendor_stats_summary(self, vendor_email: str, date_from: date | None = None,
+                                       date_to: date | None = None) -> dict:
+        """
+        Totals over a date range for a vendor, with a per-status breakdown.
+
+        Raises:
+            ValueError: If the vendor or date range is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        date_from, date_to = order_rollups.stats_range(date_from, date_to)
+        rows = await self.get_vendor_daily_stats(vendor_email, date_from, date_to)
+        return order_rollups.summarize(vendor_email, date_from, date_to, rows)
+
+def get_async_order_service(db: AsyncSession = Depends(get_async_db)) -> AsyncOrderService:
+    """
+    Create an AsyncOrderService bound to the request-scoped async session.
+    """
+    return AsyncOrderService(db)
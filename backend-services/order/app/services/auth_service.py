@@ -1,7 +1,11 @@
 """Authentication service."""
+import base64
+import json
+import time
 import httpx
 from core import config
 from fastapi import HTTPException
+from monitoring.metrics import AUTH_REQUEST_LATENCY
 from logger import logger
 
 
@@ -18,7 +22,13 @@ class AuthenticationService:
         payload = {"token": jwt_token}
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             try:
-                response = await client.post(url, headers=self.headers, json=payload)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    response = await client.post(url, headers=self.headers, json=payload)
+                    outcome = str(response.status_code)
+                finally:
+                    AUTH_REQUEST_LATENCY.labels(endpoint=endpoint, outcome=outcome).observe(time.perf_counter() - started)
                 response.raise_for_status()
                 return response.json()
             except httpx.HTTPStatusError as e:
@@ -37,5 +47,18 @@ class AuthenticationService:
     async def authenticate_admin(self, jwt_token: str):
         return await self._authenticate(config.AUTHORIZATION_SERVER_ADMIN_ENDPOINT, jwt_token)
 
+def token_email(jwt_token: str) -> str | None:
+    """
+    The email claim of a JWT. The signature is not checked here, so only use
+    this on a token the authorization server has just accepted.
+    """
+    try:
+        payload = jwt_token.removeprefix("Bearer ").strip().split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return None
+    email = claims.get("email") if isinstance(claims, dict) else None
+    return email if isinstance(email, str) and email else None
+
 def get_auth_service():
     return AuthenticationService()
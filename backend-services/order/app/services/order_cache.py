@@ -0,0 +1,255 @@
+"""
+Read-through cache for single-order payloads.
+
+GET /orders/{order_id} caches the serialized OrderResponse. The first tier is an
+in-process LRU with a short TTL; the optional second tier is Redis, shared by
+every instance. OrderService invalidates (or refreshes) an entry at each point
+where an order changes. With Redis enabled the invalidation is also published on
+ORDER_CACHE_CHANNEL so the other instances drop their local copy immediately;
+without it a stale local copy lives at most ORDER_CACHE_TTL seconds.
+
+Redis writes are compare-and-set on the order version, and an invalidation
+leaves a short-lived tombstone instead of deleting the key, so a slow read on
+any instance cannot put an older copy back over a newer write.
+
+Cache failures never fail a request: Redis errors are logged and treated as misses.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+
+from core import config
+from dtos.order_schema import OrderResponse
+from monitoring.metrics import ORDER_CACHE_ENTRY_AGE, ORDER_CACHE_INVALIDATIONS, ORDER_CACHE_LOOKUPS
+from logger import logger
+
+
+# Left in place of an invalidated entry for ORDER_CACHE_TOMBSTONE_TTL seconds
+TOMBSTONE = b""
+
+# SET the payload unless the key holds a tombstone or a payload of the same or a newer version
+SET_IF_NEWER = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    if current == '' then
+        return 0
+    end
+    local ok, cached = pcall(cjson.decode, current)
+    if ok and type(cached) == 'table' and tonumber(cached['version']) and
+            tonumber(cached['version']) >= tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+
+def cache_key(order_id: str) -> str:
+    return f"order:{order_id}"
+
+
+def serialize_order(order) -> bytes:
+    """The OrderResponse JSON body for an Order entity or a build_order dict."""
+    return OrderResponse.model_validate(order, from_attributes=True).model_dump_json().encode()
+
+
+def payload_version(payload: bytes) -> int | None:
+    """The order version recorded in a serialized OrderResponse."""
+    return orjson.loads(payload).get("version")
+
+
+class OrderCache:
+    """
+    Two-tier cache of serialized orders keyed by order ID.
+
+    Every invalidation bumps a process-wide epoch. A reader takes the epoch with
+    begin() before going to the database and put() ignores its payload if the
+    order was invalidated since, so a slow read cannot re-cache a stale order
+    locally. Reads on other instances are kept out of Redis by the version
+    compare-and-set and the invalidation tombstones.
+    """
+    def __init__(self, max_entries: int = config.ORDER_CACHE_MAX_ENTRIES, ttl: float = config.ORDER_CACHE_TTL,
+                 redis_enabled: bool = config.ORDER_CACHE_REDIS_ENABLED):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.redis = self.async_redis = None
+        if redis_enabled:
+            params = dict(host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_DB)
+            self.redis = redis.Redis(**params)
+            self.async_redis = aioredis.Redis(**params)
+            self._set_if_newer = self.redis.register_script(SET_IF_NEWER)
+            self._async_set_if_newer = self.async_redis.register_script(SET_IF_NEWER)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- local tier --------------------------------------------------------
+
+    def _get_local(self, order_id: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            entry = self._entries.get(order_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self.ttl:
+                del self._entries[order_id]
+                return None
+            self._entries.move_to_end(order_id)
+            return entry
+
+    def _put_local(self, order_id: str, payload: bytes, cached_at: float | None = None):
+        with self._lock:
+            self._entries[order_id] = (payload, time.monotonic() if cached_at is None else cached_at)
+            self._entries.move_to_end(order_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _evict_local(self, order_id: str):
+        with self._lock:
+            self._entries.pop(order_id, None)
+            self._epoch += 1
+            self._invalidated[order_id] = self._epoch
+            self._invalidated.move_to_end(order_id)
+            while len(self._invalidated) > self.max_entries:
+                self._invalidated.popitem(last=False)
+
+    # -- read path ---------------------------------------------------------
+
+    def begin(self) -> int:
+        """Epoch to pass to put() for a payload read from the database after this call."""
+        with self._lock:
+            return self._epoch
+
+    async def get(self, order_id: str) -> bytes | None:
+        entry = self._get_local(order_id)
+        if entry is not None:
+            ORDER_CACHE_LOOKUPS.labels(result="local_hit").inc()
+            ORDER_CACHE_ENTRY_AGE.observe(time.monotonic() - entry[1])
+            return entry[0]
+        if self.async_redis is not None:
+            try:
+                payload = await self.async_redis.get(cache_key(order_id))
+            except redis.RedisError as e:
+                logger.warning(f"Order cache read failed for {order_id}: {str(e)}")
+                payload = None
+            if payload:
+                ORDER_CACHE_LOOKUPS.labels(result="redis_hit").inc()
+                self._put_local(order_id, payload)
+                return payload
+        ORDER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    async def put(self, order_id: str, payload: bytes, epoch: int):
+        with self._lock:
+            if self._invalidated.get(order_id, -1) > epoch:
+                return
+        self._put_local(order_id, payload)
+        if self.async_redis is not None:
+            try:
+                await self._async_set_if_newer(keys=[cache_key(order_id)], args=self._set_args(payload))
+            except redis.RedisError as e:
+                logger.warning(f"Order cache write failed for {order_id}: {str(e)}")
+
+    @staticmethod
+    def _set_args(payload: bytes) -> list:
+        return [payload, payload_version(payload) or 0, config.ORDER_CACHE_REDIS_TTL]
+
+    # -- write path (called by OrderService after commit) -------------------
+
+    def invalidate(self, order_id: str, reason: str):
+        """Drop the order from every tier and tell the other instances to do the same."""
+        self.invalidate_many([order_id], reason)
+
+    def invalidate_many(self, order_ids: list[str], reason: str):
+        """
+        invalidate() for several orders, with one Redis round trip. The keys are
+        overwritten with tombstones rather than deleted: the writer does not know
+        the new versions, so this is what stops a read that started before the
+        write from caching its copy afterwards.
+        """
+        if not order_ids:
+            return
+        ORDER_CACHE_INVALIDATIONS.labels(reason=reason).inc(len(order_ids))
+        for order_id in order_ids:
+            self._evict_local(order_id)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for order_id in order_ids:
+                    pipe.set(cache_key(order_id), TOMBSTONE, ex=config.ORDER_CACHE_TOMBSTONE_TTL)
+                    pipe.publish(config.ORDER_CACHE_CHANNEL, order_id)
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Order cache invalidation failed for {len(order_ids)} orders: {str(e)}")
+
+    def refresh(self, order_id: str, payload: bytes, reason: str):
+        """
+        Replace the order in every tier with the payload the writer just read
+        back from the primary. Its version orders it against concurrent reads,
+        so no tombstone is needed.
+        """
+        ORDER_CACHE_INVALIDATIONS.labels(reason=reason).inc()
+        self._evict_local(order_id)
+        self._put_local(order_id, payload)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                self._set_if_newer(keys=[cache_key(order_id)], args=self._set_args(payload), client=pipe)
+                pipe.publish(config.ORDER_CACHE_CHANNEL, order_id)
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Order cache refresh failed for {order_id}: {str(e)}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # -- cross-instance invalidation ---------------------------------------
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(config.ORDER_CACHE_CHANNEL)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._evict_local(message["data"].decode())
+                pubsub.close()
+            except redis.RedisError as e:
+                # Without the channel only the TTL bounds staleness; drop everything and retry
+                logger.warning(f"Order cache invalidation listener failed: {str(e)}")
+                self.clear()
+                self._stop.wait(5)
+
+    def start(self):
+        if self.redis is None:
+            return
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+        logger.info(f"Order cache invalidation listener started on {config.ORDER_CACHE_CHANNEL}")
+
+    async def stop(self):
+        self._stop.set()
+        if self._thread:
+            await asyncio.to_thread(self._thread.join, 5)
+        if self.async_redis is not None:
+            await self.async_redis.aclose()
+
+
+_order_cache: OrderCache | None = None
+
+def get_order_cache() -> OrderCache:
+    """Return the process-wide order cache."""
+    global _order_cache
+    if _order_cache is None:
+        _order_cache = OrderCache()
+    return _order_cache
@@ -0,0 +1,130 @@
+"""
+Streaming order export.
+
+Orders and their items are read with one LEFT OUTER JOIN ordered by order ID
+over a server-side cursor (stream_results + yield_per), grouped into one record
+per order as the rows arrive and encoded straight into output chunks, so memory
+use does not depend on the number of orders exported. The export reads from a
+replica when one is in rotation.
+"""
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterator
+from itertools import groupby
+from operator import itemgetter
+from sqlalchemy import Select, select
+from core import config
+from db.base import engine, replicas
+from entity.order import Order
+from entity.order_item import OrderItem
+from services.order_queries import ITEMS_FIELD, ORDER_FIELDS
+from logger import logger
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+ITEM_FIELDS = ("product_id", "quantity", "unit_price")
+
+
+def select_export_rows(*criteria) -> Select:
+    """One row per order item (or per order without items), grouped by order ID."""
+    stmt = (
+        select(
+            *(column.label(name) for name, column in ORDER_FIELDS.items()),
+            *(getattr(OrderItem, name).label(f"item_{name}") for name in ITEM_FIELDS),
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.id)
+    )
+    return stmt.where(*criteria) if criteria else stmt
+
+
+def _records(rows) -> Iterator[dict]:
+    """Fold consecutive rows of the same order into one record with its items."""
+    for _, order_rows in groupby(rows, key=itemgetter("id")):
+        first = next(order_rows)
+        record = {name: first[name] for name in ORDER_FIELDS}
+        record[ITEMS_FIELD] = [
+            {name: row[f"item_{name}"] for name in ITEM_FIELDS}
+            for row in (first, *order_rows)
+            if row["item_product_id"] is not None
+        ]
+        yield record
+
+
+def _encode_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _ndjson_lines(records: Iterator[dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, default=_encode_value) + "\n"
+
+
+def _csv_lines(records: Iterator[dict]) -> Iterator[str]:
+    """One CSV row per order; the items column holds the order's items as a JSON array."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = list(ORDER_FIELDS) + [ITEMS_FIELD]
+    writer.writerow(header)
+    for record in records:
+        writer.writerow(
+            [_encode_value(record[name]) for name in ORDER_FIELDS] + [json.dumps(record[ITEMS_FIELD])]
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _chunks(lines: Iterator[str], chunk_bytes: int, compress: bool) -> Iterator[bytes]:
+    """Join lines into chunks of about chunk_bytes, gzip-compressing them if asked."""
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    pending, size = [], 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def export_orders(export_format: str, compress: bool = False, *criteria) -> Iterator[bytes]:
+    """
+    Stream every matching order as CSV or NDJSON bytes.
+
+    Raises:
+        ValueError: If the format is not supported (raised before streaming starts).
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format. Supported formats: {list(EXPORT_FORMATS)}")
+    encode = _csv_lines if export_format == "csv" else _ndjson_lines
+
+    def stream() -> Iterator[bytes]:
+        replica = replicas.choose()
+        bind = replica.engine if replica is not None else engine
+        exported = 0
+        with bind.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=config.ORDER_EXPORT_YIELD_PER
+            ).execute(select_export_rows(*criteria)).mappings()
+
+            def counted(records):
+                nonlocal exported
+                for record in records:
+                    exported += 1
+                    yield record
+
+            yield from _chunks(encode(counted(_records(result))), config.ORDER_EXPORT_CHUNK_BYTES, compress)
+        logger.info(f"Exported {exported} orders as {export_format}{' (gzip)' if compress else ''}")
+
+    return stream()
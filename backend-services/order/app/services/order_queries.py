@@ -0,0 +1,196 @@
+"""
+Core statement builders for order listings.
+
+Listings are keyset-paginated on (order_date, id), newest first, and select only
+the requested columns, so a page costs O(page size) regardless of table size.
+Cursors are opaque base64 strings holding the (order_date, id) of the last row.
+The change feed is keyset-paginated the same way on (updated_at, id), oldest first.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import Select, and_, or_, select
+from entity import ALLOWED_STATUSES
+from entity.order import Order
+from entity.order_item import OrderItem
+
+# Columns a caller may project; "items" pulls the order's items with one extra query
+ORDER_FIELDS = {
+    "id": Order.id,
+    "user_email": Order.user_email,
+    "vendor_email": Order.vendor_email,
+    "delivery_address": Order.delivery_address,
+    "description": Order.description,
+    "status": Order.status,
+    "total_price": Order.total_price,
+    "order_date": Order.order_date,
+    "delivery_date": Order.delivery_date,
+    "payment_id": Order.payment_id,
+    "updated_at": Order.updated_at,
+    "version": Order.version,
+}
+ITEMS_FIELD = "items"
+ALL_FIELDS = tuple(ORDER_FIELDS) + (ITEMS_FIELD,)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """
+    Turn a comma-separated projection into a tuple of field names.
+
+    Raises:
+        ValueError: If an unknown field is requested.
+    """
+    if not fields:
+        return ALL_FIELDS
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in ALL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}. Allowed fields: {list(ALL_FIELDS)}")
+    return requested or ALL_FIELDS
+
+
+def filter_criteria(status: str | None = None, date_from: datetime | None = None,
+                    date_to: datetime | None = None) -> list:
+    """
+    WHERE clauses for the optional listing filters. Combined with an equality on
+    user_email or vendor_email they stay within the (email, order_date) indexes.
+
+    Raises:
+        ValueError: If the status is not an allowed order status.
+    """
+    criteria = []
+    if status is not None:
+        if status not in ALLOWED_STATUSES:
+            raise ValueError(f"Invalid status. Allowed statuses: {ALLOWED_STATUSES}")
+        criteria.append(Order.status == status)
+    if date_from is not None:
+        criteria.append(Order.order_date >= date_from)
+    if date_to is not None:
+        criteria.append(Order.order_date < date_to)
+    return criteria
+
+
+def encode_cursor(timestamp: datetime, order_id: str) -> str:
+    raw = json.dumps([timestamp.isoformat(), order_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, order_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), str(order_id)
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+def select_orders_page(fields: tuple[str, ...], limit: int, cursor: str | None = None, *criteria) -> Select:
+    """
+    SELECT the projected order columns for one page.
+    One row more than limit is fetched so the caller can tell whether a next page exists.
+    """
+    # id and order_date are always read: they form the cursor
+    columns = {"id": Order.id, "order_date": Order.order_date}
+    columns.update((f, ORDER_FIELDS[f]) for f in fields if f in ORDER_FIELDS)
+    stmt = select(*(column.label(name) for name, column in columns.items()))
+    if criteria:
+        stmt = stmt.where(*criteria)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Order.order_date < last_date,
+            and_(Order.order_date == last_date, Order.id < last_id),
+        ))
+    return stmt.order_by(Order.order_date.desc(), Order.id.desc()).limit(limit + 1)
+
+
+def select_changes_page(fields: tuple[str, ...], limit: int, since: str | None, until: datetime) -> Select:
+    """
+    SELECT the projected columns of orders changed after the since cursor and
+    at or before until, in (updated_at, id) order. One row more than limit is fetched.
+    """
+    columns = {"id": Order.id, "updated_at": Order.updated_at}
+    columns.update((f, ORDER_FIELDS[f]) for f in fields if f in ORDER_FIELDS)
+    stmt = select(*(column.label(name) for name, column in columns.items())).where(Order.updated_at <= until)
+    if since:
+        last_updated, last_id = decode_cursor(since)
+        stmt = stmt.where(or_(
+            Order.updated_at > last_updated,
+            and_(Order.updated_at == last_updated, Order.id > last_id),
+        ))
+    return stmt.order_by(Order.updated_at, Order.id).limit(limit + 1)
+
+
+def select_order(order_id: str) -> Select:
+    """SELECT every order column for a single order."""
+    return select(*(column.label(name) for name, column in ORDER_FIELDS.items())).where(Order.id == order_id)
+
+
+def select_order_version(order_id: str) -> Select:
+    """SELECT only the version of an order, for conditional GETs."""
+    return select(Order.version).where(Order.id == order_id)
+
+
+def select_items_for(order_ids: list[str]) -> Select:
+    return (
+        select(OrderItem.order_id, OrderItem.product_id, OrderItem.quantity, OrderItem.unit_price)
+        .where(OrderItem.order_id.in_(order_ids))
+        .order_by(OrderItem.order_id, OrderItem.id)
+    )
+
+
+def page_order_ids(rows: list, limit: int) -> list[str]:
+    return [row["id"] for row in rows[:limit]]
+
+
+def group_items(items: list | None) -> dict[str, list[dict]]:
+    """Group fetched item rows by order id, shaped like OrderItemResponse."""
+    items_by_order: dict[str, list] = {}
+    for item in items or ():
+        items_by_order.setdefault(item["order_id"], []).append({
+            "product_id": item["product_id"],
+            "quantity": item["quantity"],
+            "unit_price": item["unit_price"],
+        })
+    return items_by_order
+
+
+def build_order(row, items: list) -> dict:
+    """Shape a select_order row and its item rows like OrderResponse."""
+    order = dict(row)
+    order[ITEMS_FIELD] = group_items(items).get(order["id"], [])
+    return order
+
+
+def shape_rows(rows: list, items: list | None, fields: tuple[str, ...]) -> list[dict]:
+    """Shape fetched rows into response dicts holding only the requested fields."""
+    items_by_order = group_items(items)
+    page = []
+    for row in rows:
+        entry = {f: row[f] for f in fields if f in ORDER_FIELDS}
+        if ITEMS_FIELD in fields:
+            entry[ITEMS_FIELD] = items_by_order.get(row["id"], [])
+        page.append(entry)
+    return page
+
+
+def build_page(rows: list, items: list | None, fields: tuple[str, ...], limit: int) -> tuple[list[dict], str | None]:
+    """Shape fetched rows into response dicts and compute the next cursor."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    page = shape_rows(rows, items, fields)
+    next_cursor = encode_cursor(rows[-1]["order_date"], rows[-1]["id"]) if has_more and rows else None
+    return page, next_cursor
+
+
+def changes_cursor(rows: list, limit: int, since: str | None) -> str | None:
+    """
+    The feed position after the returned rows. Unlike listing cursors it is
+    handed out even on the last page, so a caught-up consumer can resume from it.
+    """
+    rows = rows[:limit]
+    return encode_cursor(rows[-1]["updated_at"], rows[-1]["id"]) if rows else since
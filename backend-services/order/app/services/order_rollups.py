@@ -0,0 +1,188 @@
+"""
+Per-vendor daily rollups of order count and revenue.
+
+The rollup is keyed by (vendor_email, day, status). Writers call
+apply_rollup_delta inside their own transaction: with sign=+1 after orders are
+inserted or moved into a status, and with sign=-1 before orders leave one. The
+delta is computed by the database from the orders table itself
+(INSERT ... SELECT ... GROUP BY with a dialect-specific upsert), so a batch of
+orders costs one statement and the day always matches DATE(order_date).
+"""
+from datetime import date, timedelta
+from sqlalchemy import Select, delete, func, insert, literal, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from core import config
+from entity.order import Order
+from entity.vendor_daily_rollup import VendorDailyRollup
+from logger import logger
+
+ROLLUP_TABLE = VendorDailyRollup.__table__
+ROLLUP_KEY = ("vendor_email", "day", "status")
+ROLLUP_COLUMNS = ROLLUP_KEY + ("order_count", "revenue")
+# Databases upsert_totals has an upsert for
+SUPPORTED_DIALECTS = ("mysql", "sqlite")
+# Orders in these statuses are counted but left out of the revenue totals
+NON_REVENUE_STATUSES = ("Canceled", "Refund")
+
+
+def select_order_totals(*criteria, sign: int = 1) -> Select:
+    """(vendor, day, status, count, revenue) of the matching orders, multiplied by sign."""
+    day = func.date(Order.order_date)
+    return (
+        select(
+            Order.vendor_email,
+            day,
+            Order.status,
+            func.count() * literal(sign),
+            func.coalesce(func.sum(Order.total_price), 0) * literal(sign),
+        )
+        .where(*criteria)
+        .group_by(Order.vendor_email, day, Order.status)
+    )
+
+
+def check_dialect(dialect_name: str):
+    """
+    Check that upsert_totals has an upsert for the database; run once at startup.
+
+    Raises:
+        ValueError: If the rollups cannot be maintained on this database.
+    """
+    if dialect_name not in SUPPORTED_DIALECTS:
+        raise ValueError(f"Vendor rollups do not support the {dialect_name} dialect "
+                         f"(supported: {', '.join(SUPPORTED_DIALECTS)})")
+
+
+def upsert_totals(dialect_name: str, totals: Select):
+    """
+    INSERT the totals, adding them to the rows that already exist.
+
+    Raises:
+        ValueError: If the dialect has no upsert here.
+    """
+    check_dialect(dialect_name)
+    if dialect_name == "mysql":
+        stmt = mysql.insert(ROLLUP_TABLE).from_select(ROLLUP_COLUMNS, totals)
+        return stmt.on_duplicate_key_update(
+            order_count=ROLLUP_TABLE.c.order_count + stmt.inserted.order_count,
+            revenue=ROLLUP_TABLE.c.revenue + stmt.inserted.revenue,
+        )
+    stmt = sqlite.insert(ROLLUP_TABLE).from_select(ROLLUP_COLUMNS, totals)
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            "order_count": ROLLUP_TABLE.c.order_count + stmt.excluded.order_count,
+            "revenue": ROLLUP_TABLE.c.revenue + stmt.excluded.revenue,
+        },
+    )
+
+
+def apply_rollup_delta(db: Session, order_ids: list[str], sign: int):
+    """Add (sign=+1) or remove (sign=-1) the given orders' current totals from the rollup."""
+    if not order_ids:
+        return
+    dialect_name = db.get_bind().dialect.name
+    db.execute(upsert_totals(dialect_name, select_order_totals(Order.id.in_(order_ids), sign=sign)))
+
+
+def select_vendor_rollups(vendor_email: str, date_from: date, date_to: date, status: str | None = None) -> Select:
+    """Rollup rows of one vendor for days in [date_from, date_to], oldest first; a range scan of the primary key."""
+    stmt = select(
+        VendorDailyRollup.day,
+        VendorDailyRollup.status,
+        VendorDailyRollup.order_count,
+        VendorDailyRollup.revenue,
+    ).where(
+        VendorDailyRollup.vendor_email == vendor_email,
+        VendorDailyRollup.day >= date_from,
+        VendorDailyRollup.day <= date_to,
+        VendorDailyRollup.order_count != 0,
+    )
+    if status is not None:
+        stmt = stmt.where(VendorDailyRollup.status == status)
+    return stmt.order_by(VendorDailyRollup.day, VendorDailyRollup.status)
+
+
+def stats_range(date_from: date | None, date_to: date | None) -> tuple[date, date]:
+    """
+    Resolve the dashboard date range: the last VENDOR_STATS_DEFAULT_DAYS days by default.
+
+    Raises:
+        ValueError: If the range is reversed or longer than VENDOR_STATS_MAX_DAYS.
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=config.VENDOR_STATS_DEFAULT_DAYS - 1)
+    if date_from > date_to:
+        raise ValueError("date_from must not be after date_to.")
+    if (date_to - date_from).days + 1 > config.VENDOR_STATS_MAX_DAYS:
+        raise ValueError(f"At most {config.VENDOR_STATS_MAX_DAYS} days can be requested at once.")
+    return date_from, date_to
+
+
+def summarize(vendor_email: str, date_from: date, date_to: date, rows: list) -> dict:
+    """Totals and per-status breakdown of select_vendor_rollups rows."""
+    by_status: dict[str, dict] = {}
+    for row in rows:
+        entry = by_status.setdefault(row["status"], {"order_count": 0, "revenue": 0.0})
+        entry["order_count"] += row["order_count"]
+        entry["revenue"] += row["revenue"]
+    return {
+        "vendor_email": vendor_email,
+        "date_from": date_from,
+        "date_to": date_to,
+        "order_count": sum(entry["order_count"] for entry in by_status.values()),
+        "revenue": sum(entry["revenue"] for status, entry in by_status.items() if status not in NON_REVENUE_STATUSES),
+        "by_status": by_status,
+    }
+
+
+def _next_chunk_end(conn, last_id: str, chunk_size: int, *criteria) -> str | None:
+    """Highest order ID of the next chunk, or None when the remaining orders fit in one chunk."""
+    return conn.execute(
+        select(Order.id).where(Order.id > last_id, *criteria).order_by(Order.id).offset(chunk_size - 1).limit(1)
+    ).scalar()
+
+
+def rebuild_rollups(engine: Engine, chunk_size: int = 10_000, vendor_email: str | None = None) -> int:
+    """
+    Recompute the rollup (for one vendor, or all of them) from the orders table.
+
+    Orders are aggregated one primary-key range of chunk_size orders at a time
+    and the totals are kept in memory (one entry per vendor, day and status).
+    The old rows are then replaced in a single transaction, so dashboards never
+    see a half-built rollup. Orders written while the scan runs may be missed;
+    run it with the consumer paused, or run it again afterwards.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    criteria = [Order.vendor_email == vendor_email] if vendor_email else []
+    totals: dict[tuple, list] = {}
+    last_id, scanned_chunks = "", 0
+    with engine.connect() as conn:
+        while last_id is not None:
+            chunk_end = _next_chunk_end(conn, last_id, chunk_size, *criteria)
+            chunk = [Order.id > last_id] + ([Order.id <= chunk_end] if chunk_end is not None else [])
+            for vendor, day, status, order_count, revenue in conn.execute(select_order_totals(*chunk, *criteria)):
+                day = date.fromisoformat(day) if isinstance(day, str) else day
+                entry = totals.setdefault((vendor, day, status), [0, 0.0])
+                entry[0] += order_count
+                entry[1] += revenue
+            last_id = chunk_end
+            scanned_chunks += 1
+            logger.info(f"Rollup rebuild: scanned {scanned_chunks} chunks, {len(totals)} rollup rows so far")
+
+    rows = [
+        {"vendor_email": vendor, "day": day, "status": status, "order_count": count, "revenue": revenue}
+        for (vendor, day, status), (count, revenue) in totals.items()
+    ]
+    with engine.begin() as conn:
+        stmt = delete(VendorDailyRollup)
+        if vendor_email:
+            stmt = stmt.where(VendorDailyRollup.vendor_email == vendor_email)
+        conn.execute(stmt)
+        for start in range(0, len(rows), chunk_size):
+            conn.execute(insert(VendorDailyRollup), rows[start:start + chunk_size])
+    return len(rows)
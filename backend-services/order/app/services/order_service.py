@@ -1,76 +1,105 @@
 """Order business logic."""
 from datetime import datetime
+from fastapi import Depends
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from core import config
 from services.rabbitmq_publisher import get_publisher_service
+from services import order_queries
+from services.order_cache import OrderCache, get_order_cache, serialize_order
+from services.order_rollups import apply_rollup_delta
+from monitoring.metrics import ORDER_CREATE_DUPLICATES
 from entity.order import Order
 from entity.order_item import OrderItem
+from entity import ALLOWED_STATUSES, generate_uuid
 from db.dependencies import get_db
+from db.routing import reads_from_replica
 from logger import logger
 
 class OrderService:
     """
     Service class for handling order-related operations.
     """
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: OrderCache | None = None):
         self.db = db
-    
-    def get_all_orders(self) -> list[Order]:
+        self.cache = cache or get_order_cache()
+
+    @reads_from_replica
+    def list_orders_page(self, limit: int, cursor: str | None = None, fields: str | None = None,
+                         *criteria) -> tuple[list[dict], str | None]:
         """
-        Retrieve all orders from the database, including their associated items.
+        Retrieve one keyset-paginated page of orders, newest first.
+
+        Rows are read with Core selects of the projected columns only; items are
+        fetched with one extra query for the page when requested.
+
+        Args:
+            limit (int): Maximum number of orders to return.
+            cursor (str): Cursor returned with the previous page, if any.
+            fields (str): Comma-separated projection (default: every field).
+            *criteria: Extra WHERE clauses (e.g. restricting to one user).
 
         Returns:
-            List[Order]: A list of all orders.
+            tuple: The page as a list of dicts, and the cursor for the next page (None on the last page).
 
         Raises:
+            ValueError: If the cursor or a requested field is invalid.
             SQLAlchemyError: If there is a database error.
         """
+        projection = order_queries.parse_fields(fields)
+        stmt = order_queries.select_orders_page(projection, limit, cursor, *criteria)
         try:
-            orders = self.db.query(Order).options(joinedload(Order.items)).all()
-            return orders
-        
+            rows = self.db.execute(stmt).mappings().all()
+            items = None
+            if order_queries.ITEMS_FIELD in projection and rows:
+                order_ids = order_queries.page_order_ids(rows, limit)
+                items = self.db.execute(order_queries.select_items_for(order_ids)).mappings().all()
+            return order_queries.build_page(rows, items, projection, limit)
+
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders: {str(e)}")
-            raise SQLAlchemyError(f"Database error while retrieving orders: {str(e)}")
-        
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
+            logger.error(f"Database error while listing orders: {str(e)}")
+            raise SQLAlchemyError(f"Database error while listing orders: {str(e)}")
 
-    def get_user_orders(self, email: str) -> list[Order]:
+    def list_user_orders_page(self, email: str, limit: int, cursor: str | None = None, fields: str | None = None,
+                              status: str | None = None, date_from: datetime | None = None,
+                              date_to: datetime | None = None) -> tuple[list[dict], str | None]:
         """
-        Retrieve all orders for the specified user.
+        Retrieve one page of a user's orders, newest first, optionally filtered
+        by status and order date range [date_from, date_to).
 
-        Args:
-            email (str): The email of the user whose orders are to be retrieved.
-
-        Returns:
-            List[Order]: A list of orders for the specified user.
+        Served by the (user_email, order_date) index, so the cost of a page does
+        not depend on the length of the user's history.
 
         Raises:
+            ValueError: If the email, cursor, status or a requested field is invalid.
             SQLAlchemyError: If there is a database error.
-            ValueError: If the email is invalid or no orders are found.
         """
         if not email or not isinstance(email, str):
             raise ValueError("Invalid email address.")
-        
-        try:
-            orders = self.db.query(Order).filter(Order.user_email == email).options(joinedload(Order.items)).all()
-            
-            if not orders:
-                raise ValueError(f"No orders found for user with email: {email}")
-            
-            return orders
-        
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders for user {email}: {str(e)}")
-            raise SQLAlchemyError(f"Database error while retrieving orders for user {email}: {str(e)}")
-        
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
+        criteria = order_queries.filter_criteria(status, date_from, date_to)
+        return self.list_orders_page(limit, cursor, fields, Order.user_email == email, *criteria)
+
+    def list_vendor_orders_page(self, vendor_email: str, limit: int, cursor: str | None = None,
+                                fields: str | None = None, status: str | None = None,
+                                date_from: datetime | None = None,
+                                date_to: datetime | None = None) -> tuple[list[dict], str | None]:
+        """
+        Retrieve one page of a vendor's orders, newest first, optionally filtered
+        by status and order date range [date_from, date_to).
+
+        Served by the (vendor_email, order_date) index.
+
+        Raises:
+            ValueError: If the vendor email, cursor, status or a requested field is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not vendor_email or not isinstance(vendor_email, str):
+            raise ValueError("Invalid vendor email.")
+        criteria = order_queries.filter_criteria(status, date_from, date_to)
+        return self.list_orders_page(limit, cursor, fields, Order.vendor_email == vendor_email, *criteria)
 
+    @reads_from_replica
     def get_order_by_id(self, order_id: str) -> Order:
         """
         Retrieve an order by its ID.
@@ -104,15 +133,50 @@ class OrderService:
             logger.error(f"An unexpected error occurred: {str(e)}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
+    @staticmethod
+    def _validate_order(order_data: dict, items_data: list, transaction_id: str) -> float:
+        """
+        Check a create_order payload and return the order's total price.
+
+        Raises:
+            ValueError: If the items, quantities, prices or transaction ID are invalid.
+            KeyError: If required keys are missing.
+        """
+        if not isinstance(items_data, list):
+            raise ValueError("Items data must be a list.")
+
+        if not isinstance(transaction_id, str):
+            raise ValueError("Transaction ID must be a string.")
+
+        total_price = 0
+        for item in items_data:
+            if not all(key in item for key in ["quantity", "unit_price", "product_id"]):
+                raise KeyError("Each item must contain 'quantity', 'unit_price', and 'product_id'.")
+            if not isinstance(item["quantity"], int) or item["quantity"] <= 0:
+                raise ValueError("Quantity must be a positive integer.")
+            if not isinstance(item["unit_price"], (int, float)) or item["unit_price"] < 0:
+                raise ValueError("Unit price must be a non-negative number.")
+            total_price += item["quantity"] * item["unit_price"]
+
+        required_fields = ["user_email", "vendor_email", "delivery_address"]
+        if not all(field in order_data for field in required_fields):
+            raise KeyError(f"Order data must contain the following fields: {required_fields}")
+
+        return total_price
+
     def create_order(self, order_data: dict, transaction_id: str) -> Order:
         """
         Create a new order with the provided order data.
+
+        Idempotent per transaction_id: the INSERT is attempted directly, and if
+        the unique index on transaction_id rejects it (a redelivered message)
+        the existing order is returned instead, with nothing written.
         
         Args:
             order_data (Dict): Dictionary containing order details.
             
         Returns:
-            Order: The newly created order.
+            Order: The newly created order, or the transaction's existing order.
             
         Raises:
             ValueError: If the input data is invalid.
@@ -121,27 +185,8 @@ class OrderService:
         """
         try:
             items_data = order_data.pop("items", [])
-            
-            if not isinstance(items_data, list):
-                raise ValueError("Items data must be a list.")
-            
-            if not isinstance(transaction_id, str):
-                raise ValueError("Transaction ID must be a string.")
-
-            total_price = 0
-            for item in items_data:
-                if not all(key in item for key in ["quantity", "unit_price", "product_id"]):
-                    raise KeyError("Each item must contain 'quantity', 'unit_price', and 'product_id'.")
-                if not isinstance(item["quantity"], int) or item["quantity"] <= 0:
-                    raise ValueError("Quantity must be a positive integer.")
-                if not isinstance(item["unit_price"], (int, float)) or item["unit_price"] < 0:
-                    raise ValueError("Unit price must be a non-negative number.")
-                total_price += item["quantity"] * item["unit_price"]
-            
-            required_fields = ["user_email", "vendor_email", "delivery_address"]
-            if not all(field in order_data for field in required_fields):
-                raise KeyError(f"Order data must contain the following fields: {required_fields}")
-            
+            total_price = self._validate_order(order_data, items_data, transaction_id)
+
             new_order = Order(
                 user_email=order_data["user_email"],
                 vendor_email=order_data["vendor_email"],
@@ -154,6 +199,8 @@ class OrderService:
             
             self.db.add(new_order)
             new_order.add_items(items_data)
+            self.db.flush()
+            apply_rollup_delta(self.db, [new_order.id], +1)
             self.db.commit()
             self.db.refresh(new_order)
             return new_order
@@ -170,6 +217,11 @@ class OrderService:
         
         except IntegrityError as e:
             self.db.rollback()
+            existing = self.db.query(Order).filter(Order.transaction_id == transaction_id).first()
+            if existing is not None:
+                ORDER_CREATE_DUPLICATES.labels(path="single").inc()
+                logger.info(f"Order for transaction {transaction_id} already exists: {existing.id}")
+                return existing
             logger.error(f"Database integrity error: {str(e)}")
             raise ValueError(f"Database integrity error: {str(e)}")
         
@@ -183,6 +235,117 @@ class OrderService:
             logger.error(f"An unexpected error occurred: {str(e)}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
         
+    def create_orders(self, orders: list[tuple[dict, str]]) -> list[str]:
+        """
+        Create several orders in one transaction, with one multi-row INSERT for
+        the orders and one for all of their items.
+
+        Like create_order it is idempotent per transaction_id: transactions that
+        already have an order (or appear twice in the batch) are not inserted
+        again and map to that order's ID.
+
+        Args:
+            orders (list): (order_data, transaction_id) pairs, as passed to create_order.
+
+        Returns:
+            list[str]: The order IDs, in the same order as the input.
+
+        Raises:
+            ValueError: If any order is invalid; nothing is inserted.
+            KeyError: If required keys are missing from any order.
+            SQLAlchemyError: If there is a database error; nothing is inserted.
+        """
+        validated = [
+            (order_data, transaction_id, self._validate_order(order_data, order_data.get("items", []), transaction_id))
+            for order_data, transaction_id in orders
+        ]
+
+        try:
+            # Redelivered messages already have an order; one SELECT maps their transactions to it
+            order_ids_by_transaction = dict(self.db.execute(
+                select(Order.transaction_id, Order.id)
+                .where(Order.transaction_id.in_({transaction_id for _, transaction_id, _ in validated}))
+            ).all())
+
+            order_rows, item_rows, order_ids = [], [], []
+            for order_data, transaction_id, total_price in validated:
+                if transaction_id not in order_ids_by_transaction:
+                    order_id = order_ids_by_transaction[transaction_id] = generate_uuid()
+                    order_rows.append({
+                        "id": order_id,
+                        "user_email": order_data["user_email"],
+                        "vendor_email": order_data["vendor_email"],
+                        "delivery_address": order_data["delivery_address"],
+                        "description": order_data.get("description"),
+                        "status": order_data.get("status", "Pending"),
+                        "total_price": total_price,
+                        "transaction_id": transaction_id,
+                    })
+                    item_rows.extend(
+                        {
+                            "order_id": order_id,
+                            "product_id": item["product_id"],
+                            "unit_price": item["unit_price"],
+                            "quantity": item.get("quantity", 1),
+                        }
+                        for item in order_data.get("items", [])
+                    )
+                order_ids.append(order_ids_by_transaction[transaction_id])
+
+            if len(order_rows) < len(validated):
+                ORDER_CREATE_DUPLICATES.labels(path="batch").inc(len(validated) - len(order_rows))
+            if order_rows:
+                self.db.execute(insert(Order), order_rows)
+                if item_rows:
+                    self.db.execute(insert(OrderItem), item_rows)
+                apply_rollup_delta(self.db, [row["id"] for row in order_rows], +1)
+            self.db.commit()
+            return order_ids
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error while creating {len(validated)} orders: {str(e)}")
+            raise SQLAlchemyError(f"Database error while creating {len(validated)} orders: {str(e)}")
+
+    def _update_order_fields(self, order_id: str, values: dict, action: str, return_order: bool = True) -> Order | None:
+        """
+        Apply a column update with a single conditional UPDATE ... WHERE id = ?.
+
+        Not-found is detected from the affected row count, so no SELECT is
+        issued before the write. When return_order is set the updated order is
+        read back once (with its items) for the caller.
+
+        Raises:
+            ValueError: If no order has the given ID.
+            SQLAlchemyError: If there is a database error.
+        """
+        # A status change moves the order between rollup rows in the same transaction
+        moves_rollup = "status" in values
+        try:
+            if moves_rollup:
+                apply_rollup_delta(self.db, [order_id], -1)
+            result = self.db.execute(
+                update(Order).where(Order.id == order_id).values(**values)
+            )
+            if result.rowcount == 0:
+                self.db.rollback()
+                raise ValueError(f"No order found with ID: {order_id}")
+            if moves_rollup:
+                apply_rollup_delta(self.db, [order_id], +1)
+            self.db.commit()
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error while updating {action}: {str(e)}")
+            raise SQLAlchemyError(f"Database error while updating {action}: {str(e)}")
+
+        if not return_order:
+            self.cache.invalidate(order_id, action)
+            return None
+        order = self.get_order_by_id(order_id)
+        self.cache.refresh(order_id, serialize_order(order), action)
+        return order
+
     def update_order_status(self, order_id: str, new_status: str) -> Order:
         """
         Update the status of an order.
@@ -203,38 +366,85 @@ class OrderService:
         
         if not new_status or not isinstance(new_status, str):
             raise ValueError("Invalid status.")
-        
+
+        if new_status not in ALLOWED_STATUSES:
+            raise ValueError(f"Invalid status. Allowed statuses: {ALLOWED_STATUSES}")
+
+        return self._update_order_fields(order_id, {"status": new_status}, "order status")
+
+    def update_vendor_order_statuses(self, vendor_email: str, order_ids: list[str], new_status: str) -> dict[str, str]:
+        """
+        Set the status of several of a vendor's orders with one set-based UPDATE.
+
+        One SELECT classifies the requested IDs, then a single
+        UPDATE ... WHERE vendor_email = ? AND id IN (...) changes the ones that
+        belong to the vendor and are not already in new_status. Orders of other
+        vendors are reported as not found.
+
+        Args:
+            vendor_email (str): The vendor the orders must belong to.
+            order_ids (list[str]): The orders to update; duplicates are ignored.
+            new_status (str): The status to set.
+
+        Returns:
+            dict[str, str]: Outcome per order ID: "updated", "unchanged" or "not_found".
+
+        Raises:
+            ValueError: If the vendor, the status or the list of IDs is invalid.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not vendor_email or not isinstance(vendor_email, str):
+            raise ValueError("Invalid vendor email.")
+
+        if new_status not in ALLOWED_STATUSES:
+            raise ValueError(f"Invalid status. Allowed statuses: {ALLOWED_STATUSES}")
+
+        order_ids = list(dict.fromkeys(order_ids))
+        if not order_ids or not all(order_id and isinstance(order_id, str) for order_id in order_ids):
+            raise ValueError("Invalid order IDs.")
+
+        if len(order_ids) > config.ORDER_BULK_STATUS_MAX_ORDERS:
+            raise ValueError(f"At most {config.ORDER_BULK_STATUS_MAX_ORDERS} orders can be updated at once.")
+
         try:
-            order = self.db.query(Order).filter(Order.id == order_id).first()
-            
-            if not order:
-                raise ValueError(f"No order found with ID: {order_id}")
-            
-            order.update_status(new_status)
+            current = dict(self.db.execute(
+                select(Order.id, Order.status)
+                .where(Order.vendor_email == vendor_email, Order.id.in_(order_ids))
+            ).all())
+            to_update = [order_id for order_id, order_status in current.items() if order_status != new_status]
+            if to_update:
+                apply_rollup_delta(self.db, to_update, -1)
+                self.db.execute(
+                    update(Order)
+                    .where(Order.vendor_email == vendor_email, Order.id.in_(to_update))
+                    .values(status=new_status)
+                )
+                apply_rollup_delta(self.db, to_update, +1)
             self.db.commit()
-            self.db.refresh(order)
-            return order
-        
+
         except SQLAlchemyError as e:
-            self.db.rollback() 
-            logger.error(f"Database error while updating order status: {str(e)}")
-            raise SQLAlchemyError(f"Database error while updating order status: {str(e)}")
-        
-        except Exception as e:
-            self.db.rollback()  
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
+            self.db.rollback()
+            logger.error(f"Database error while updating order statuses for vendor {vendor_email}: {str(e)}")
+            raise SQLAlchemyError(f"Database error while updating order statuses for vendor {vendor_email}: {str(e)}")
+
+        self.cache.invalidate_many(to_update, "bulk status")
+        updated = set(to_update)
+        return {
+            order_id: "updated" if order_id in updated else "unchanged" if order_id in current else "not_found"
+            for order_id in order_ids
+        }
 
-    def update_order_payment(self, order_id: str, payment_id: str) -> Order:
+    def update_order_payment(self, order_id: str, payment_id: str, return_order: bool = True) -> Order | None:
         """
         Update the payment ID for an order.
 
         Args:
             order_id (str): The ID of the order to update.
             payment_id (str): The new payment ID to set for the order.
+            return_order (bool): Read the updated order back (the consumer does not need it).
 
         Returns:
-            Order: The updated order.
+            Order: The updated order, or None when return_order is False.
 
         Raises:
             ValueError: If the order ID is invalid, the order is not found, or the payment ID is invalid.
@@ -245,28 +455,8 @@ class OrderService:
         
         if not payment_id or not isinstance(payment_id, str):
             raise ValueError("Invalid payment ID.")
-        
-        try:
-            order = self.db.query(Order).filter(Order.id == order_id).first()
-            
-            if not order:
-                raise ValueError(f"No order found with ID: {order_id}")
-            
-            order.update_payment(payment_id)
-            self.db.commit()
-            self.db.refresh(order)
-            
-            return order
-        
-        except SQLAlchemyError as e:
-            self.db.rollback()  
-            logger.error(f"Database error while updating payment ID: {str(e)}")
-            raise SQLAlchemyError(f"Database error while updating payment ID: {str(e)}")
-        
-        except Exception as e:
-            self.db.rollback() 
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
+
+        return self._update_order_fields(order_id, {"payment_id": payment_id}, "payment ID", return_order)
 
     def update_order_delivery_date(self, order_id: str) -> Order:
         """
@@ -284,27 +474,8 @@ class OrderService:
         """
         if not order_id or not isinstance(order_id, str):
             raise ValueError("Invalid order ID.")
-        
-        try:
-            order = self.db.query(Order).filter(Order.id == order_id).first()
-            
-            if not order:
-                raise ValueError(f"No order found with ID: {order_id}")
-            order.update_delivery_date(datetime.now())
-            self.db.commit()
-            self.db.refresh(order)
-            
-            return order
-        
-        except SQLAlchemyError as e:
-            self.db.rollback()  
-            logger.error(f"Database error while updating delivery date: {str(e)}")
-            raise SQLAlchemyError(f"Database error while updating delivery date: {str(e)}")
-        
-        except Exception as e:
-            self.db.rollback()  
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
+
+        return self._update_order_fields(order_id, {"delivery_date": datetime.now()}, "delivery date")
 
     def update_order_address(self, order_id: str, new_address: str) -> Order:
         """
@@ -326,29 +497,8 @@ class OrderService:
         
         if not new_address or not isinstance(new_address, str):
             raise ValueError("Invalid delivery address.")
-        
-        try:
-            order = self.db.query(Order).filter(Order.id == order_id).first()
-            
-            if not order:
-                raise ValueError(f"No order found with ID: {order_id}")
-            
-            order.update_delivery_address(new_address)
-            self.db.commit()
-            self.db.refresh(order)
-            
-            return order
-        
-        except SQLAlchemyError as e:
-            self.db.rollback()  
-            logger.error(f"Database error while updating delivery address: {str(e)}")
-            raise SQLAlchemyError(f"Database error while updating delivery address: {str(e)}")
-        
-        except Exception as e:
-            self.db.rollback()  
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
-        
+
+        return self._update_order_fields(order_id, {"delivery_address": new_address}, "delivery address")
 
     def delete_order(self, order_id: str) -> None:
         """
@@ -372,10 +522,12 @@ class OrderService:
             if not order:
                 raise ValueError(f"No order found with ID: {order_id}")
             
+            apply_rollup_delta(self.db, [order_id], -1)
             self.db.query(OrderItem).filter(OrderItem.order_id == order_id).delete()
             
             self.db.query(Order).filter(Order.id == order_id).delete()
             self.db.commit()
+            self.cache.invalidate(order_id, "delete")
         
         except SQLAlchemyError as e:
             self.db.rollback()  
@@ -397,8 +549,12 @@ class OrderService:
             if not order:
                 raise ValueError(f"No order found with transaction ID: {transaction_id}")
             
+            apply_rollup_delta(self.db, [order.id], -1)
             order.update_status("Canceled")
+            self.db.flush()
+            apply_rollup_delta(self.db, [order.id], +1)
             self.db.commit()
+            self.cache.invalidate(order.id, "rollback")
         
         except SQLAlchemyError as e:
             self.db.rollback()  
@@ -410,41 +566,62 @@ class OrderService:
             logger.error(f"An unexpected error occurred: {str(e)}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
-    def get_vendor_orders(self, vendor_email: str) -> list[Order]:
+    def rollback_orders(self, transaction_ids: list[str]) -> dict[str, str]:
         """
-        Retrieve all orders for the specified vendor.
+        Cancel the orders of many saga transactions with set-based statements.
+
+        Transaction IDs are handled ORDER_ROLLBACK_CHUNK_SIZE at a time: one
+        SELECT on the transaction_id index classifies the chunk, then a single
+        UPDATE ... WHERE id IN (...) cancels the orders that are not canceled
+        yet, wrapped in the vendor rollup deltas, and the chunk commits. Chunks
+        are idempotent, so a mass compensation that fails part-way can simply be
+        retried.
 
         Args:
-            vendor_email (str): The email of the vendor whose orders are to be retrieved.
+            transaction_ids (list[str]): The transactions to roll back; duplicates are ignored.
 
         Returns:
-            List[Order]: A list of orders for the specified vendor.
+            dict[str, str]: Outcome per transaction ID: "canceled", "unchanged" or "not_found".
 
         Raises:
-            SQLAlchemyError: If there is a database error.
-            ValueError: If the email is invalid or no orders are found.
+            ValueError: If the list of transaction IDs is invalid.
+            SQLAlchemyError: If there is a database error; earlier chunks stay committed.
         """
-        
-        try:
-            orders = self.db.query(Order).filter(Order.vendor_email == vendor_email).options(joinedload(Order.items)).all()
-            
-            if not orders:
-                return []
-            
-            return orders
-        
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders for vendor {vendor_email}: {str(e)}")
-            raise SQLAlchemyError(f"Database error while retrieving orders for vendor {vendor_email}: {str(e)}")
-        
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {str(e)}")
-            raise Exception(f"An unexpected error occurred: {str(e)}")
-
-def get_order_service() -> OrderService:
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        if not transaction_ids or not all(tid and isinstance(tid, str) for tid in transaction_ids):
+            raise ValueError("Invalid transaction IDs.")
+
+        outcomes = dict.fromkeys(transaction_ids, "not_found")
+        chunk_size = config.ORDER_ROLLBACK_CHUNK_SIZE
+        for start in range(0, len(transaction_ids), chunk_size):
+            chunk = transaction_ids[start:start + chunk_size]
+            try:
+                rows = self.db.execute(
+                    select(Order.id, Order.transaction_id, Order.status).where(Order.transaction_id.in_(chunk))
+                ).all()
+                to_cancel = [row.id for row in rows if row.status != "Canceled"]
+                if to_cancel:
+                    apply_rollup_delta(self.db, to_cancel, -1)
+                    self.db.execute(update(Order).where(Order.id.in_(to_cancel)).values(status="Canceled"))
+                    apply_rollup_delta(self.db, to_cancel, +1)
+                self.db.commit()
+
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                logger.error(f"Database error while rolling back {len(chunk)} orders: {str(e)}")
+                raise SQLAlchemyError(f"Database error while rolling back {len(chunk)} orders: {str(e)}")
+
+            self.cache.invalidate_many(to_cancel, "rollback")
+            for row in rows:
+                outcomes[row.transaction_id] = "canceled" if row.status != "Canceled" else "unchanged"
+
+        logger.info(f"Rolled back {sum(o == 'canceled' for o in outcomes.values())} of {len(outcomes)} transactions")
+        return outcomes
+
+def get_order_service(db: Session = Depends(get_db)) -> OrderService:
     """
-    Create an instance of the OrderService class."
+    Create an OrderService bound to the request-scoped session from get_db,
+    which FastAPI closes (returning the connection to the pool) once the
+    response has been sent.
     """
-    db_gen = get_db()         # this is a generator
-    db: Session = next(db_gen)
     return OrderService(db)
@@ -9,18 +9,31 @@ Message structure:
 }
 
 """
+import time
 import pika
 import json
 from core import config
-from services.order_service import OrderService, get_order_service
+from services.order_service import OrderService
+from db.dependencies import session_scope
 from services.rabbitmq_publisher import RabbitMQPublisher, get_publisher_service
 from logger import logger
+from monitoring.metrics import CONSUMER_BATCH_SIZE, CONSUMER_HANDLER_LATENCY, MESSAGES_CONSUMED
+from monitoring.queue_monitor import record_consumer_lag
+from monitoring.tracing import start_span, extract_context
 
 class RabbitMQConsumer:
-    def __init__(self, queue: str, order_service: OrderService, publisher: RabbitMQPublisher):
-        self.order_service = order_service
+    def __init__(self, queue: str, publisher: RabbitMQPublisher,
+                 batch_size: int = config.ORDER_CREATE_BATCH_SIZE,
+                 batch_wait_ms: float = config.ORDER_CREATE_BATCH_WAIT_MS):
         self.publisher = publisher
         self.queue = queue
+        # create_order messages are collected until batch_size arrive or batch_wait has passed
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait_ms / 1000
+        self._batch: list[tuple] = []
+        self._batch_timer = None
+        # Tags of failed messages not settled yet; a multiple ack must not cover them
+        self._unacked: set[int] = set()
         credentials = pika.PlainCredentials(
             username=config.RABBITMQ_USER,
             password=config.RABBITMQ_PASSWORD
@@ -38,6 +51,7 @@ class RabbitMQConsumer:
             "create_order": self.handle_order_created,
             "update_order_payment_id": self.handle_update_order_payment_id,
             "rollback_order": self.handle_rollback_order,
+            "rollback_orders": self.handle_rollback_orders,
             # Add more event mappings as needed
         }
 
@@ -47,34 +61,150 @@ class RabbitMQConsumer:
             self.connection = pika.BlockingConnection(self.connection_params)
             self.channel = self.connection.channel()
             self.channel.queue_declare(queue=self.queue, durable=True)
+            self._unacked.clear()
         except Exception as e:
             logger.error(f"Error connecting to RabbitMQ: {str(e)}")
             raise
 
+    def _dispatch(self, event_type: str, message: dict):
+        """
+        Run the handler for event_type in its own session, recording its latency.
+        The session is committed or rolled back and closed before the message is
+        acked, so nothing loaded for one message outlives it.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with session_scope() as db:
+                self.event_handlers[event_type](message, OrderService(db))
+            outcome = "success"
+        finally:
+            CONSUMER_HANDLER_LATENCY.labels(event=event_type, outcome=outcome).observe(time.perf_counter() - started)
+
+    def _nack(self, ch, delivery_tag: int, requeue: bool):
+        """
+        Settle a failed message. Once nacked its tag no longer blocks multiple acks.
+        Without requeue RabbitMQ drops the message (or dead-letters it, if the queue has a DLX).
+        """
+        try:
+            ch.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+            self._unacked.discard(delivery_tag)
+        except Exception as e:
+            logger.error(f"Error nacking message {delivery_tag}: {str(e)}")
+
+    def _fail(self, ch, method, error: Exception):
+        """A message whose handler failed is retried once, then dropped."""
+        logger.error(f"Error processing message: {str(error)}")
+        self._unacked.add(method.delivery_tag)
+        self._nack(ch, method.delivery_tag, requeue=not method.redelivered)
+
+    def _process(self, ch, delivery_tag: int, message: dict, properties):
+        """Handle one message in its own session and ack it."""
+        event_type = message.get("event")
+        # Dispatch the message to the appropriate handler if it exists
+        if event_type in self.event_handlers:
+            trace_id, parent_id = extract_context(properties)
+            with start_span(
+                f"consume {event_type}",
+                trace_id=trace_id or message.get("transaction_id"),
+                parent_id=parent_id,
+                queue=self.queue
+            ):
+                self._dispatch(event_type, message)
+        else:
+            logger.warning(f"Unhandled event type: {event_type}")
+
+        # Acknowledge the message after processing
+        ch.basic_ack(delivery_tag=delivery_tag)
+
     def callback(self, ch, method, properties, body):
         """Callback function to process incoming messages."""
         try:
             message = json.loads(body)
             event_type = message.get("event")
 
-            # Dispatch the message to the appropriate handler if it exists
-            if event_type in self.event_handlers:
-                self.event_handlers[event_type](message)
-            else:
-                logger.warning(f"Unhandled event type: {event_type}")
+            MESSAGES_CONSUMED.labels(queue=self.queue, event=str(event_type)).inc()
+            record_consumer_lag(self.queue, properties)
+
+            if event_type == "create_order" and self.batch_size > 1:
+                self._batch.append((ch, method, message, properties))
+                if len(self._batch) >= self.batch_size:
+                    self.flush_batch()
+                elif len(self._batch) == 1 and self.connection is not None:
+                    self._batch_timer = self.connection.call_later(self.batch_wait, self.flush_batch)
+                return
+
+            # Other events may refer to orders still waiting in the batch
+            self.flush_batch()
+            self._process(ch, method.delivery_tag, message, properties)
+        except Exception as e:
+            self._fail(ch, method, e)
+
+    def flush_batch(self):
+        """
+        Create every order waiting in the batch in one transaction, publish their
+        responses and ack the batch at once. If the batch cannot be inserted
+        (an invalid message or a database error) nothing is committed and each
+        message is processed on its own, exactly as without batching.
+        """
+        if self._batch_timer is not None:
+            self.connection.remove_timeout(self._batch_timer)
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
 
-            # Acknowledge the message after processing
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+        CONSUMER_BATCH_SIZE.labels(event="create_order").observe(len(batch))
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with start_span("consume create_order batch", queue=self.queue, batch_size=len(batch)):
+                with session_scope() as db:
+                    order_ids = OrderService(db).create_orders(
+                        [(message.get("data", {}), message.get("transaction_id")) for _, _, message, _ in batch]
+                    )
+            outcome = "success"
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
-            # Optionally, you might choose to nack the message or log it for further inspection
+            logger.warning(f"Batch of {len(batch)} create_order messages failed, processing them one by one: {str(e)}")
+        finally:
+            CONSUMER_HANDLER_LATENCY.labels(event="create_order_batch", outcome=outcome).observe(
+                time.perf_counter() - started
+            )
+
+        if outcome != "success":
+            for ch, method, message, properties in batch:
+                try:
+                    self._process(ch, method.delivery_tag, message, properties)
+                except Exception as e:
+                    self._fail(ch, method, e)
+            return
 
-    def handle_order_created(self, message):
+        ch = batch[0][0]
+        try:
+            self.publisher.publish_order_created_responses(
+                [(order_id, message.get("transaction_id")) for order_id, (_, _, message, _) in zip(order_ids, batch)]
+            )
+        except Exception as e:
+            # The orders are committed; creation is idempotent per transaction, so the
+            # redelivered messages only publish the responses again
+            logger.error(f"Error publishing create_order responses for a batch of {len(batch)}: {str(e)}")
+            for _, method, _, _ in batch:
+                self._unacked.add(method.delivery_tag)
+                self._nack(ch, method.delivery_tag, requeue=True)
+            return
+
+        if self._unacked:
+            for _, method, _, _ in batch:
+                ch.basic_ack(delivery_tag=method.delivery_tag)
+        else:
+            ch.basic_ack(delivery_tag=batch[-1][1].delivery_tag, multiple=True)
+
+    def handle_order_created(self, message, order_service: OrderService):
         """Handle order creation logic."""
         try:
             data = message.get("data", {})
             transection_id = message.get("transaction_id")
-            order = self.order_service.create_order(
+            order = order_service.create_order(
                 order_data=data, transaction_id=transection_id
             )
             self.publisher.publish_order_created_response(order_id=order.id, transaction_id=transection_id)
@@ -82,32 +212,45 @@ class RabbitMQConsumer:
             logger.error(f"Error handling order creation: {str(e)}")
             raise
 
-    def handle_update_order_payment_id(self, message):
+    def handle_update_order_payment_id(self, message, order_service: OrderService):
         """Handle order payment ID update logic."""
         try:
             data = message.get("data", {})
             order_id = data.get("order_id")
             payment_id = data.get("payment_id")
-            self.order_service.update_order_payment(order_id, payment_id)
+            order_service.update_order_payment(order_id, payment_id, return_order=False)
         except Exception as e:
             logger.error(f"Error updating order payment ID: {str(e)}")
             raise
 
-    def handle_rollback_order(self, message):
+    def handle_rollback_order(self, message, order_service: OrderService):
         """Handle order rollback logic."""
         try:
             transaction_id = message.get("transaction_id")
-            self.order_service.rollback_order(transaction_id)
+            order_service.rollback_order(transaction_id)
         except Exception as e:
             logger.error(f"Error rolling back order: {str(e)}")
             raise
 
+    def handle_rollback_orders(self, message, order_service: OrderService):
+        """Handle a mass rollback: data.transaction_ids lists every transaction to cancel."""
+        try:
+            transaction_ids = message.get("data", {}).get("transaction_ids", [])
+            outcomes = order_service.rollback_orders(transaction_ids)
+            missing = [tid for tid, outcome in outcomes.items() if outcome == "not_found"]
+            if missing:
+                logger.warning(f"No order found for {len(missing)} of {len(outcomes)} rolled back transactions")
+        except Exception as e:
+            logger.error(f"Error rolling back orders: {str(e)}")
+            raise
+
     def start_consuming(self):
         """Start consuming messages from the specified queue."""
         if not self.connection or self.connection.is_closed:
             self.connect()
         
-        self.channel.basic_qos(prefetch_count=1)
+        # Enough unacked messages in flight to fill a batch
+        self.channel.basic_qos(prefetch_count=self.batch_size)
         self.channel.basic_consume(
             queue=self.queue,
             on_message_callback=self.callback
@@ -119,6 +262,8 @@ class RabbitMQConsumer:
             logger.error(f"Error during consuming: {str(e)}")
         finally:
             if self.connection and not self.connection.is_closed:
+                if self.channel and self.channel.is_open:
+                    self.flush_batch()
                 self.connection.close()
 
     def stop_consuming(self):
@@ -130,6 +275,5 @@ class RabbitMQConsumer:
 def get_consumer_service(
         queue: str,
         ) -> RabbitMQConsumer:
-    order_service = get_order_service()
     publisher = get_publisher_service()
-    return RabbitMQConsumer(queue, order_service, publisher)
\ No newline at end of file
+    return RabbitMQConsumer(queue, publisher)
\ No newline at end of file
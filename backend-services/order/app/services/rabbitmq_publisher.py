@@ -3,6 +3,9 @@ import pika
 import json
 from core import config
 from logger import logger
+from monitoring.metrics import MESSAGES_PUBLISHED
+from monitoring.queue_monitor import publish_properties
+from monitoring.tracing import start_span, inject_headers
 
 class RabbitMQPublisher:
     def __init__(self):
@@ -29,28 +32,35 @@ class RabbitMQPublisher:
 
     def publish_message(self, message: dict, queue: str):
         """Publish a message to the specified RabbitMQ queue."""
+        self.publish_messages([message], queue)
+
+    def publish_messages(self, messages: list[dict], queue: str):
+        """Publish several messages to the specified queue, declaring it once."""
         if not self.connection or self.connection.is_closed:
             self.connect()
 
         # Declare the queue dynamically based on the provided name
         self.channel.queue_declare(queue=queue, durable=True)
-        
-        try:
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=queue,
-                body=json.dumps(message),
-                properties=pika.BasicProperties(
-                    delivery_mode=2  # make message persistent
-                )
-            )
-            logger.info(f"Message published successfully to queue {queue}: {message}")
-        except Exception as e:
-            logger.error(f"Error publishing message to queue {queue}: {str(e)}")
-            raise
-    
-    def publish_order_created_response(self, order_id: str, transaction_id: str):
-        command = {
+
+        for message in messages:
+            try:
+                with start_span(f"publish {message.get('event')}", trace_id=message.get("transaction_id"), queue=queue):
+                    self.channel.basic_publish(
+                        exchange='',
+                        routing_key=queue,
+                        body=json.dumps(message),
+                        # persistent, stamped with publish time and trace context
+                        properties=publish_properties(headers=inject_headers())
+                    )
+                MESSAGES_PUBLISHED.labels(queue=queue, event=str(message.get("event"))).inc()
+                logger.info(f"Message published successfully to queue {queue}: {message}")
+            except Exception as e:
+                logger.error(f"Error publishing message to queue {queue}: {str(e)}")
+                raise
+
+    @staticmethod
+    def _order_created_response(order_id: str, transaction_id: str) -> dict:
+        return {
             "transaction_id": transaction_id,
             "event": "create_order",
             "message": "Order created successfully",
@@ -59,7 +69,16 @@ class RabbitMQPublisher:
                 "order_id": order_id,
             }
         }
-        self.publish_message(command, config.RABBITMQ_ORCHESTRATION_QUEUE)
+
+    def publish_order_created_response(self, order_id: str, transaction_id: str):
+        self.publish_message(self._order_created_response(order_id, transaction_id), config.RABBITMQ_ORCHESTRATION_QUEUE)
+
+    def publish_order_created_responses(self, orders: list[tuple[str, str]]):
+        """Publish the create_order response for each (order_id, transaction_id) pair."""
+        self.publish_messages(
+            [self._order_created_response(order_id, transaction_id) for order_id, transaction_id in orders],
+            config.RABBITMQ_ORCHESTRATION_QUEUE
+        )
 
     def close(self):
         if self.connection and not self.connection.is_closed:
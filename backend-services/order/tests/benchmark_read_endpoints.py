@@ -0,0 +1,81 @@
+"""
+Load benchmark for the order read endpoints.
+
+Runs N concurrent clients against a running order service for a fixed duration,
+alternating GET /orders/{id}, GET /orders/user/{email} and
+GET /orders/vendor/{vendor_id}, and reports requests per second and latency
+percentiles. Run it once against a build serving the reads from the threadpool
+and once against the async engine with the same CONCURRENCY to compare.
+
+    BASE_URL=http://localhost:8000 TOKEN="Bearer ..." ORDER_ID=... \
+        USER_EMAIL=user@example.com VENDOR_EMAIL=vendor@example.com \
+        CONCURRENCY=256 DURATION=30 python tests/benchmark_read_endpoints.py
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000").rstrip("/")
+TOKEN = os.environ.get("TOKEN", "")
+ORDER_ID = os.environ.get("ORDER_ID", "")
+USER_EMAIL = os.environ.get("USER_EMAIL", "user@example.com")
+VENDOR_EMAIL = os.environ.get("VENDOR_EMAIL", "vendor@example.com")
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 256))
+DURATION = float(os.environ.get("DURATION", 30))
+
+
+async def client_loop(client: httpx.AsyncClient, paths: list, deadline: float, latencies: list, errors: list):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def main():
+    paths = [f"/orders/user/{USER_EMAIL}", f"/orders/vendor/{VENDOR_EMAIL}"]
+    if ORDER_ID:
+        paths.insert(0, f"/orders/{ORDER_ID}")
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    headers = {"Authorization": TOKEN}
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        deadline = started + DURATION
+        await asyncio.gather(*(client_loop(client, paths, deadline, latencies, errors) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    print(f"clients={CONCURRENCY} duration={elapsed:.1f}s ok={len(latencies)} errors={len(errors)}")
+    if not latencies:
+        return
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        "latency ms: "
+        f"mean={statistics.mean(latencies) * 1000:.1f} "
+        f"p50={percentile(latencies, 50) * 1000:.1f} "
+        f"p95={percentile(latencies, 95) * 1000:.1f} "
+        f"p99={percentile(latencies, 99) * 1000:.1f} "
+        f"max={max(latencies) * 1000:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
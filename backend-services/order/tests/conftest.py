@@ -0,0 +1,62 @@
+"""
+Shared fixtures for the in-process order service tests.
+
+The service modules read their configuration at import time, so the database
+URL is pointed at a throwaway SQLite file before anything from app/ is imported.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="order-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_DB_DIR, 'orders.db')}")
+os.environ.setdefault("TRACING_ENABLED", "false")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from sqlalchemy import event  # noqa: E402
+from db.base import Base, SessionLocal, engine  # noqa: E402
+from entity import order, order_item, vendor_daily_rollup  # noqa: E402,F401
+
+
+class QueryCounter:
+    """Records every statement sent to the database while active."""
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self):
+        self.statements.clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
@@ -0,0 +1,91 @@
+"""
+Connection-pool load test for the order service.
+
+Drives more concurrent requests than the pool can hold (pool_size + max_overflow
+is 30) through endpoints that use the request-scoped session, then checks the
+pool metrics from GET /metrics: every connection must be back in the pool once
+the load stops, the checked-out level must never have exceeded the pool limit,
+and no checkout may have timed out.
+
+    BASE_URL=http://localhost:8000 TOKEN="Bearer ..." USER_EMAIL=user@example.com \
+        CONCURRENCY=64 DURATION=30 python tests/load_test_pool.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000").rstrip("/")
+TOKEN = os.environ.get("TOKEN", "")
+USER_EMAIL = os.environ.get("USER_EMAIL", "user@example.com")
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 64))
+DURATION = float(os.environ.get("DURATION", 30))
+POOL_LIMIT = int(os.environ.get("POOL_LIMIT", 30))  # pool_size + max_overflow in db/base.py
+
+
+def read_metric(text: str, name: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(name + " ") or line.startswith(name + "{"):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+async def sample_pool(client: httpx.AsyncClient, deadline: float, peaks: list):
+    while time.perf_counter() < deadline:
+        response = await client.get("/metrics")
+        peaks.append(read_metric(response.text, "db_pool_checked_out"))
+        await asyncio.sleep(0.5)
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, counts: dict):
+    paths = ["/", f"/orders/user/{USER_EMAIL}"]
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        try:
+            response = await client.get(path)
+            key = "ok" if response.status_code < 500 else f"http_{response.status_code}"
+        except httpx.HTTPError as e:
+            key = type(e).__name__
+        counts[key] = counts.get(key, 0) + 1
+
+
+async def main() -> int:
+    counts, peaks = {}, []
+    limits = httpx.Limits(max_connections=CONCURRENCY + 1, max_keepalive_connections=CONCURRENCY + 1)
+    headers = {"Authorization": TOKEN}
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, limits=limits, timeout=60) as client:
+        before = (await client.get("/metrics")).text
+        deadline = time.perf_counter() + DURATION
+        await asyncio.gather(
+            sample_pool(client, deadline, peaks),
+            *(client_loop(client, deadline, counts) for _ in range(CONCURRENCY))
+        )
+        await asyncio.sleep(1)
+        after = (await client.get("/metrics")).text
+
+    checked_out = read_metric(after, "db_pool_checked_out")
+    timeouts = read_metric(after, "db_pool_timeouts_total") - read_metric(before, "db_pool_timeouts_total")
+    checkouts = read_metric(after, "db_pool_checkouts_total") - read_metric(before, "db_pool_checkouts_total")
+    peak = max(peaks, default=0.0)
+    print(f"clients={CONCURRENCY} duration={DURATION:.0f}s responses={counts}")
+    print(f"checkouts={checkouts:.0f} peak_checked_out={peak:.0f} checked_out_after={checked_out:.0f} timeouts={timeouts:.0f}")
+
+    failures = []
+    if peak > POOL_LIMIT:
+        failures.append(f"checked-out connections peaked at {peak:.0f} (limit {POOL_LIMIT})")
+    # The /metrics request itself holds no connection, so an idle pool reads zero
+    if checked_out > 0:
+        failures.append(f"{checked_out:.0f} connections still checked out after the load stopped")
+    if timeouts:
+        failures.append(f"{timeouts:.0f} pool checkouts timed out")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,123 @@
+"""
+Memory soak test for the order consumer.
+
+Feeds create_order / update_order_payment_id / rollback_order messages straight
+into RabbitMQConsumer.callback (no broker needed) against the database in
+DATABASE_URL and samples the process RSS. With a session per message the RSS
+should level off after warm-up; the run fails if the last window is more than
+MAX_GROWTH_MB above the first window after warm-up.
+
+    DATABASE_URL=sqlite:////tmp/order_soak.db MESSAGES=200000 \
+        PYTHONPATH=app python tests/soak_consumer.py
+"""
+import gc
+import json
+import os
+import resource
+import sys
+import time
+import uuid
+
+# Keep span export out of the measurement
+os.environ.setdefault("TRACING_ENABLED", "false")
+
+MESSAGES = int(os.environ.get("MESSAGES", 200_000))
+WINDOW = int(os.environ.get("WINDOW", 10_000))
+MAX_GROWTH_MB = float(os.environ.get("MAX_GROWTH_MB", 20))
+
+from db.base import Base, engine  # noqa: E402
+from entity import order, order_item  # noqa: E402,F401
+from services.rabbitmq_consumer import RabbitMQConsumer  # noqa: E402
+
+
+class RecordingPublisher:
+    """Stands in for RabbitMQPublisher; keeps only the last created order id."""
+    def __init__(self):
+        self.last_order_id = None
+
+    def publish_order_created_response(self, order_id: str, transaction_id: str):
+        self.last_order_id = order_id
+
+
+class AckChannel:
+    def __init__(self):
+        self.acked = 0
+
+    def basic_ack(self, delivery_tag):
+        self.acked += 1
+
+    def basic_nack(self, delivery_tag, requeue):
+        pass
+
+
+class Delivery:
+    delivery_tag = 1
+    redelivered = False
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is a high-water mark (KiB on Linux), still fine for spotting growth
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def messages(publisher: RecordingPublisher):
+    while True:
+        transaction_id = str(uuid.uuid4())
+        yield {
+            "event": "create_order",
+            "transaction_id": transaction_id,
+            "data": {
+                "user_email": "soak@example.com",
+                "vendor_email": "vendor@example.com",
+                "delivery_address": "1 Soak Street",
+                "description": "soak",
+                "status": "Pending",
+                "items": [{"product_id": "soak-product", "quantity": 1, "unit_price": 9.99}],
+            },
+        }
+        yield {
+            "event": "update_order_payment_id",
+            "data": {"order_id": publisher.last_order_id, "payment_id": str(uuid.uuid4())},
+        }
+        yield {"event": "rollback_order", "transaction_id": transaction_id}
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    publisher = RecordingPublisher()
+    # One message at a time: each update refers to the order created just before it
+    consumer = RabbitMQConsumer("orders_queue", publisher, batch_size=1)
+    channel, delivery = AckChannel(), Delivery()
+
+    samples = []
+    started = time.perf_counter()
+    source = messages(publisher)
+    for i in range(1, MESSAGES + 1):
+        consumer.callback(channel, delivery, None, json.dumps(next(source)))
+        if i % WINDOW == 0:
+            gc.collect()
+            samples.append(rss_mb())
+            print(f"messages={i} acked={channel.acked} rss={samples[-1]:.1f}MB "
+                  f"rate={i / (time.perf_counter() - started):.0f} msg/s")
+
+    if len(samples) < 3:
+        print("Not enough samples; raise MESSAGES or lower WINDOW")
+        return 1
+    # The first window includes import and pool warm-up
+    growth = samples[-1] - samples[1]
+    print(f"RSS growth after warm-up: {growth:.1f}MB (limit {MAX_GROWTH_MB}MB)")
+    if growth > MAX_GROWTH_MB:
+        print("FAIL: consumer memory keeps growing")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Async read path: AsyncOrderService and the endpoints served by it."""
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import customer_auth_dependency, vendor_auth_dependency
+from db.base import AsyncSessionLocal
+from main import app
+from services.async_order_service import AsyncOrderService
+from services.order_service import OrderService
+
+
+def run(coro_fn, *args, **kwargs):
+    async def with_session():
+        async with AsyncSessionLocal() as session:
+            return await coro_fn(AsyncOrderService(session), *args, **kwargs)
+    return asyncio.run(with_session())
+
+
+@pytest.fixture
+def vendor_orders(db):
+    vendor = f"async-{uuid.uuid4().hex[:8]}@example.com"
+    service = OrderService(db)
+    return vendor, [
+        service.create_order(
+            order_data={
+                "user_email": "async-reader@example.com",
+                "vendor_email": vendor,
+                "delivery_address": "1 Test Street",
+                "items": [
+                    {"product_id": "p-1", "quantity": 2, "unit_price": 3.0},
+                    {"product_id": "p-2", "quantity": 1, "unit_price": 4.0},
+                ],
+            },
+            transaction_id=str(uuid.uuid4()),
+        ).id
+        for _ in range(3)
+    ]
+
+
+def test_get_order_by_id_matches_sync_service(db, vendor_orders):
+    _, order_ids = vendor_orders
+    order = run(AsyncOrderService.get_order_by_id, order_ids[0])
+    expected = OrderService(db).get_order_by_id(order_ids[0])
+
+    assert order["id"] == expected.id
+    assert order["total_price"] == expected.total_price
+    assert [(i["product_id"], i["quantity"]) for i in order["items"]] == [
+        (i.product_id, i.quantity) for i in expected.items
+    ]
+
+
+def test_get_order_by_id_unknown_raises_value_error():
+    with pytest.raises(ValueError):
+        run(AsyncOrderService.get_order_by_id, "does-not-exist")
+
+
+def test_vendor_page_matches_sync_service(db, vendor_orders):
+    vendor, _ = vendor_orders
+    page, cursor = run(AsyncOrderService.list_vendor_orders_page, vendor, 2)
+    expected, expected_cursor = OrderService(db).list_vendor_orders_page(vendor, 2)
+
+    assert page == expected
+    assert cursor == expected_cursor
+
+
+def test_read_endpoints_served_async(vendor_orders):
+    vendor, order_ids = vendor_orders
+    app.dependency_overrides[customer_auth_dependency] = lambda: None
+    app.dependency_overrides[vendor_auth_dependency] = lambda: None
+    try:
+        with TestClient(app) as client:
+            response = client.get(f"/orders/{order_ids[0]}")
+            assert response.status_code == 200
+            assert response.json()["id"] == order_ids[0]
+            assert len(response.json()["items"]) == 2
+
+            assert client.get("/orders/does-not-exist").status_code == 404
+
+            response = client.get(f"/orders/vendor/{vendor}", params={"fields": "id"})
+            assert response.status_code == 200
+            assert {o["id"] for o in response.json()} == set(order_ids)
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,81 @@
+"""Set-based rollback of many saga transactions."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from api.dependencies import admin_auth_dependency
+from core import config
+from entity.order import Order
+from entity.vendor_daily_rollup import VendorDailyRollup
+from main import app
+from services.order_service import OrderService
+
+
+@pytest.fixture
+def transactions(db):
+    service = OrderService(db)
+    vendor = f"rollback-{uuid.uuid4().hex[:8]}@example.com"
+    transaction_ids = [str(uuid.uuid4()) for _ in range(5)]
+    for transaction_id in transaction_ids:
+        service.create_order(
+            order_data={
+                "user_email": "rollback@example.com",
+                "vendor_email": vendor,
+                "delivery_address": "1 Test Street",
+                "items": [{"product_id": "p-1", "quantity": 1, "unit_price": 4.0}],
+            },
+            transaction_id=transaction_id,
+        )
+    return vendor, transaction_ids
+
+
+def test_chunks_of_set_based_statements(db, query_counter, monkeypatch, transactions):
+    vendor, transaction_ids = transactions
+    service = OrderService(db)
+    service.rollback_order(transaction_ids[0])
+    monkeypatch.setattr(config, "ORDER_ROLLBACK_CHUNK_SIZE", 3)
+
+    query_counter.reset()
+    outcomes = service.rollback_orders(transaction_ids + ["missing", transaction_ids[1]])
+
+    assert outcomes == {
+        transaction_ids[0]: "unchanged",
+        **{tid: "canceled" for tid in transaction_ids[1:]},
+        "missing": "not_found",
+    }
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    # Two chunks, each one SELECT and one UPDATE wrapped in the rollup deltas
+    assert statements == ["SELECT", "INSERT", "UPDATE", "INSERT"] * 2
+    db.expire_all()
+    orders = db.query(Order).filter(Order.vendor_email == vendor).all()
+    assert {order.status for order in orders} == {"Canceled"}
+    assert all(order.version == 2 for order in orders)
+    rollups = dict(db.execute(
+        select(VendorDailyRollup.status, func.sum(VendorDailyRollup.order_count))
+        .where(VendorDailyRollup.vendor_email == vendor).group_by(VendorDailyRollup.status)
+    ).all())
+    assert rollups.get("Pending", 0) == 0 and rollups["Canceled"] == 5
+
+
+@pytest.mark.parametrize("transaction_ids", [[], [""], [None]])
+def test_invalid_transaction_ids_raise_value_error(db, transaction_ids):
+    with pytest.raises(ValueError):
+        OrderService(db).rollback_orders(transaction_ids)
+
+
+def test_rollback_endpoint(transactions):
+    _, transaction_ids = transactions
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        with TestClient(app) as client:
+            response = client.post("/orders/rollback", json={"transaction_ids": transaction_ids[:2] + ["missing"]})
+            assert response.status_code == 200
+            body = response.json()
+            assert body["canceled"] == 2
+            assert [r["outcome"] for r in body["results"]] == ["canceled", "canceled", "not_found"]
+
+            assert client.post("/orders/rollback", json={"transaction_ids": []}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,162 @@
+"""Bulk vendor status updates."""
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from core import config
+from entity.order import Order
+from main import app
+from services.auth_service import get_auth_service, token_email
+from services.order_service import OrderService
+
+
+def jwt_for(email: str) -> str:
+    """An unsigned token carrying an email claim; the authorization server is stubbed out."""
+    def part(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    return f"{part({'alg': 'HS256', 'typ': 'JWT'})}.{part({'email': email, 'uid': '1'})}.signature"
+
+
+def make_orders(service: OrderService, vendor: str, count: int) -> list[str]:
+    return [
+        service.create_order(
+            order_data={
+                "user_email": "bulk@example.com",
+                "vendor_email": vendor,
+                "delivery_address": "1 Test Street",
+                "items": [{"product_id": "p-1", "quantity": 1, "unit_price": 1.0}],
+            },
+            transaction_id=str(uuid.uuid4()),
+        ).id
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def vendors(db):
+    service = OrderService(db)
+    mine, other = (f"bulk-{uuid.uuid4().hex[:8]}@example.com" for _ in range(2))
+    return mine, make_orders(service, mine, 4), make_orders(service, other, 1)
+
+
+def test_one_select_and_one_update_with_outcomes(db, query_counter, vendors):
+    vendor, mine, others = vendors
+    service = OrderService(db)
+    service.update_order_status(mine[0], "Shipped")
+
+    query_counter.reset()
+    outcomes = service.update_vendor_order_statuses(vendor, mine + others + ["missing"], "Shipped")
+
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    # The UPDATE is wrapped in the two vendor rollup deltas
+    assert statements == ["SELECT", "INSERT", "UPDATE", "INSERT"]
+    assert outcomes == {
+        mine[0]: "unchanged",
+        **{order_id: "updated" for order_id in mine[1:]},
+        others[0]: "not_found",
+        "missing": "not_found",
+    }
+    db.expire_all()
+    assert {o.status for o in db.query(Order).filter(Order.vendor_email == vendor)} == {"Shipped"}
+    assert service.get_order_by_id(others[0]).status == "Pending"
+
+
+@pytest.mark.parametrize("order_ids, new_status", [
+    (["a"], "Lost"),
+    ([], "Shipped"),
+    ([""], "Shipped"),
+])
+def test_invalid_requests_raise_value_error(db, order_ids, new_status):
+    with pytest.raises(ValueError):
+        OrderService(db).update_vendor_order_statuses("vendor@example.com", order_ids, new_status)
+
+
+def test_too_many_orders_raise_value_error(db, monkeypatch):
+    monkeypatch.setattr(config, "ORDER_BULK_STATUS_MAX_ORDERS", 2)
+    with pytest.raises(ValueError):
+        OrderService(db).update_vendor_order_statuses("vendor@example.com", ["a", "b", "c"], "Shipped")
+
+
+@pytest.mark.parametrize("token, email", [
+    (jwt_for("vendor@example.com"), "vendor@example.com"),
+    (f"Bearer {jwt_for('vendor@example.com')}", "vendor@example.com"),
+    ("not-a-jwt", None),
+    ("a.!!!.c", None),
+    (jwt_for(""), None),
+])
+def test_token_email(token, email):
+    assert token_email(token) == email
+
+
+ADMIN_TOKEN = jwt_for("admin@example.com")
+
+
+class FakeAuthService:
+    """Accepts ADMIN_TOKEN as an admin and any other token as a vendor."""
+    async def authenticate_admin(self, jwt_token: str):
+        if jwt_token != ADMIN_TOKEN:
+            raise HTTPException(status_code=403, detail="Authentication failed")
+
+    async def authenticate_vendor(self, jwt_token: str):
+        pass
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_auth_service] = FakeAuthService
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_bulk_status_endpoint(client, vendors):
+    vendor, mine, others = vendors
+    headers = {"Authorization": f"Bearer {jwt_for(vendor)}"}
+    response = client.put(f"/orders/vendor/{vendor}/status", headers=headers,
+                          json={"order_ids": mine[:2] + others, "status": "Shipped"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 2
+    assert [r["outcome"] for r in body["results"]] == ["updated", "updated", "not_found"]
+
+    response = client.put(f"/orders/vendor/{vendor}/status", headers=headers,
+                          json={"order_ids": mine, "status": "Lost"})
+    assert response.status_code == 400
+
+
+def test_admin_can_update_any_vendors_orders(client, db, vendors):
+    vendor, mine, _ = vendors
+
+    response = client.put(f"/orders/vendor/{vendor}/status", headers={"Authorization": ADMIN_TOKEN},
+                          json={"order_ids": mine, "status": "Canceled"})
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == len(mine)
+    db.expire_all()
+    assert {o.status for o in db.query(Order).filter(Order.vendor_email == vendor)} == {"Canceled"}
+
+
+def test_vendor_cannot_update_another_vendors_orders(client, db, vendors):
+    vendor, mine, _ = vendors
+    headers = {"Authorization": f"Bearer {jwt_for('intruder@example.com')}"}
+
+    response = client.put(f"/orders/vendor/{vendor}/status", headers=headers,
+                          json={"order_ids": mine, "status": "Canceled"})
+
+    assert response.status_code == 403
+    assert {o.status for o in db.query(Order).filter(Order.vendor_email == vendor)} == {"Pending"}
+
+
+def test_token_without_email_is_rejected(client, vendors):
+    vendor, mine, _ = vendors
+
+    response = client.put(f"/orders/vendor/{vendor}/status", headers={"Authorization": "opaque"},
+                          json={"order_ids": mine, "status": "Shipped"})
+
+    assert response.status_code == 401
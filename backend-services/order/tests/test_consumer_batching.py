@@ -0,0 +1,235 @@
+"""Batched create_order handling in the order consumer."""
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from entity.order import Order
+from entity.order_item import OrderItem
+from services.order_service import OrderService
+from services.rabbitmq_consumer import RabbitMQConsumer
+
+
+class RecordingPublisher:
+    def __init__(self):
+        self.responses = []
+
+    def publish_order_created_response(self, order_id: str, transaction_id: str):
+        self.responses.append((order_id, transaction_id))
+
+    def publish_order_created_responses(self, orders: list[tuple[str, str]]):
+        self.responses.extend(orders)
+
+
+class AckChannel:
+    def __init__(self):
+        self.acks = []
+        self.nacks = []
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, requeue):
+        self.nacks.append((delivery_tag, requeue))
+
+
+class Delivery:
+    def __init__(self, delivery_tag: int, redelivered: bool = False):
+        self.delivery_tag = delivery_tag
+        self.redelivered = redelivered
+
+
+class TimerConnection:
+    """Stands in for the BlockingConnection timers used by the batch wait."""
+    def __init__(self):
+        self.timers = {}
+
+    def call_later(self, delay, callback):
+        timer = object()
+        self.timers[timer] = callback
+        return timer
+
+    def remove_timeout(self, timer):
+        self.timers.pop(timer, None)
+
+    def fire(self):
+        for callback in list(self.timers.values()):
+            callback()
+
+
+def create_message(vendor: str, items: int = 2, quantity=1) -> dict:
+    return {
+        "event": "create_order",
+        "transaction_id": str(uuid.uuid4()),
+        "data": {
+            "user_email": "batch@example.com",
+            "vendor_email": vendor,
+            "delivery_address": "1 Batch Street",
+            "items": [{"product_id": f"p-{i}", "quantity": quantity, "unit_price": 2.5} for i in range(items)],
+        },
+    }
+
+
+@pytest.fixture
+def vendor():
+    return f"batch-{uuid.uuid4().hex[:8]}@example.com"
+
+
+@pytest.fixture
+def consumer():
+    consumer = RabbitMQConsumer("orders_queue", RecordingPublisher(), batch_size=3, batch_wait_ms=20)
+    consumer.connection = TimerConnection()
+    return consumer
+
+
+def deliver(consumer: RabbitMQConsumer, channel: AckChannel, messages: list[dict], first_tag: int = 1,
+            redelivered: bool = False):
+    for tag, message in enumerate(messages, start=first_tag):
+        consumer.callback(channel, Delivery(tag, redelivered), None, json.dumps(message))
+
+
+def vendor_orders(db, vendor: str) -> list[Order]:
+    return db.query(Order).filter(Order.vendor_email == vendor).all()
+
+
+def test_full_batch_is_inserted_published_and_acked_once(db, query_counter, consumer, vendor):
+    channel = AckChannel()
+    messages = [create_message(vendor) for _ in range(3)]
+    deliver(consumer, channel, messages)
+
+    assert channel.acks == [(3, True)]
+    # One INSERT for the orders, one for all of their items and one rollup upsert
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in query_counter.statements) == 3
+    orders = vendor_orders(db, vendor)
+    assert len(orders) == 3
+    assert all(len(order.items) == 2 and order.total_price == 5.0 for order in orders)
+    assert sorted(t for _, t in consumer.publisher.responses) == sorted(m["transaction_id"] for m in messages)
+    assert {o for o, _ in consumer.publisher.responses} == {order.id for order in orders}
+
+
+def test_partial_batch_is_flushed_by_the_timer(db, consumer, vendor):
+    channel = AckChannel()
+    deliver(consumer, channel, [create_message(vendor) for _ in range(2)])
+    assert channel.acks == []
+
+    consumer.connection.fire()
+    assert channel.acks == [(2, True)]
+    assert len(vendor_orders(db, vendor)) == 2
+
+
+def test_other_events_flush_the_batch_first(db, consumer, vendor):
+    channel = AckChannel()
+    created = create_message(vendor)
+    deliver(consumer, channel, [created, {"event": "rollback_order", "transaction_id": created["transaction_id"]}])
+
+    assert channel.acks == [(1, True), (2, False)]
+    assert [order.status for order in vendor_orders(db, vendor)] == ["Canceled"]
+
+
+def test_invalid_message_falls_back_to_one_by_one(db, consumer, vendor):
+    channel = AckChannel()
+    deliver(consumer, channel, [create_message(vendor), create_message(vendor, quantity=0), create_message(vendor)])
+
+    # The valid orders are created and acked individually; the invalid one is requeued once
+    assert channel.acks == [(1, False), (3, False)]
+    assert channel.nacks == [(2, True)]
+    assert len(vendor_orders(db, vendor)) == 2
+
+    # Once nacked the failed message no longer holds back multiple acks
+    deliver(consumer, channel, [create_message(vendor) for _ in range(3)], first_tag=4)
+    assert channel.acks[2:] == [(6, True)]
+
+
+def test_redelivered_failure_is_dropped(consumer, vendor):
+    channel = AckChannel()
+    deliver(consumer, channel, [{"event": "rollback_order", "transaction_id": "missing"}], redelivered=True)
+
+    assert channel.acks == []
+    assert channel.nacks == [(1, False)]
+    assert consumer._unacked == set()
+
+
+def test_unsettled_failure_keeps_acks_individual(consumer, vendor):
+    class ClosedChannel(AckChannel):
+        def basic_nack(self, delivery_tag, requeue):
+            raise RuntimeError("channel closed")
+
+    deliver(consumer, ClosedChannel(), [{"event": "rollback_order", "transaction_id": "missing"}])
+    assert consumer._unacked == {1}
+
+    channel = AckChannel()
+    deliver(consumer, channel, [create_message(vendor) for _ in range(3)], first_tag=2)
+    assert channel.acks == [(2, False), (3, False), (4, False)]
+
+
+def test_publish_failure_requeues_the_committed_batch(db, monkeypatch, consumer, vendor):
+    def fail(orders):
+        raise RuntimeError("broker unavailable")
+    monkeypatch.setattr(consumer.publisher, "publish_order_created_responses", fail)
+
+    channel = AckChannel()
+    messages = [create_message(vendor) for _ in range(3)]
+    deliver(consumer, channel, messages)
+
+    assert channel.acks == []
+    assert channel.nacks == [(1, True), (2, True), (3, True)]
+    assert consumer._unacked == set()
+
+    # The redelivery creates nothing new and acks as a batch again
+    monkeypatch.undo()
+    deliver(consumer, channel, messages, first_tag=4, redelivered=True)
+    assert channel.acks == [(6, True)]
+    assert len(vendor_orders(db, vendor)) == 3
+
+
+def test_database_error_falls_back_to_one_by_one(db, monkeypatch, consumer, vendor):
+    def fail(self, orders):
+        raise RuntimeError("bulk insert failed")
+    monkeypatch.setattr(OrderService, "create_orders", fail)
+
+    channel = AckChannel()
+    deliver(consumer, channel, [create_message(vendor) for _ in range(3)])
+
+    assert channel.acks == [(1, False), (2, False), (3, False)]
+    assert len(vendor_orders(db, vendor)) == 3
+    assert len(consumer.publisher.responses) == 3
+
+
+def test_create_orders_inserts_nothing_when_one_order_is_invalid(db, vendor):
+    service = OrderService(db)
+    valid = create_message(vendor)
+    invalid = create_message(vendor, quantity=-1)
+    with pytest.raises(ValueError):
+        service.create_orders([(valid["data"], valid["transaction_id"]), (invalid["data"], invalid["transaction_id"])])
+
+    assert db.execute(select(func.count()).select_from(Order).where(Order.vendor_email == vendor)).scalar_one() == 0
+    assert db.execute(select(func.count()).select_from(OrderItem).join(Order)
+                      .where(Order.vendor_email == vendor)).scalar_one() == 0
+
+
+def test_redelivered_batch_republishes_existing_orders(db, consumer, vendor):
+    channel = AckChannel()
+    messages = [create_message(vendor) for _ in range(3)]
+    deliver(consumer, channel, messages)
+    first = list(consumer.publisher.responses)
+
+    # The same messages again, e.g. after a crash between commit and ack
+    deliver(consumer, channel, messages, first_tag=4)
+
+    assert channel.acks == [(3, True), (6, True)]
+    assert len(vendor_orders(db, vendor)) == 3
+    assert consumer.publisher.responses[3:] == first
+
+
+def test_rollback_orders_event(db, consumer, vendor):
+    channel = AckChannel()
+    messages = [create_message(vendor) for _ in range(2)]
+    deliver(consumer, channel, messages)
+    consumer.connection.fire()
+
+    rollback = {"event": "rollback_orders", "data": {"transaction_ids": [m["transaction_id"] for m in messages]}}
+    deliver(consumer, channel, [rollback], first_tag=3)
+
+    assert channel.acks[-1] == (3, False)
+    assert {order.status for order in vendor_orders(db, vendor)} == {"Canceled"}
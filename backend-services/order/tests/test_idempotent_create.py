@@ -0,0 +1,91 @@
+"""create_order and create_orders are idempotent per transaction_id."""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+
+from entity.order import Order
+from entity.vendor_daily_rollup import VendorDailyRollup
+from services.order_service import OrderService
+
+
+def order_data(vendor: str) -> dict:
+    return {
+        "user_email": "idempotent@example.com",
+        "vendor_email": vendor,
+        "delivery_address": "1 Test Street",
+        "items": [{"product_id": "p-1", "quantity": 2, "unit_price": 3.0}],
+    }
+
+
+@pytest.fixture
+def vendor():
+    return f"idem-{uuid.uuid4().hex[:8]}@example.com"
+
+
+def vendor_order_count(db, vendor: str) -> int:
+    return db.execute(select(func.count()).select_from(Order).where(Order.vendor_email == vendor)).scalar_one()
+
+
+def rollup_count(db, vendor: str) -> int:
+    return db.execute(select(func.sum(VendorDailyRollup.order_count))
+                      .where(VendorDailyRollup.vendor_email == vendor)).scalar_one()
+
+
+def test_create_order_returns_the_existing_order(db, query_counter, vendor):
+    service = OrderService(db)
+    transaction_id = str(uuid.uuid4())
+    created = service.create_order(order_data(vendor), transaction_id)
+
+    query_counter.reset()
+    again = service.create_order(order_data(vendor), transaction_id)
+
+    assert again.id == created.id
+    assert len(again.items) == 1
+    assert vendor_order_count(db, vendor) == 1
+    assert rollup_count(db, vendor) == 1
+    # The rejected INSERT, then the lookup of the existing order
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    assert statements[:2] == ["INSERT", "SELECT"] and "UPDATE" not in statements
+
+
+def test_create_orders_skips_known_and_repeated_transactions(db, vendor):
+    service = OrderService(db)
+    known = str(uuid.uuid4())
+    existing_id = service.create_order(order_data(vendor), known).id
+    fresh = str(uuid.uuid4())
+
+    order_ids = service.create_orders([
+        (order_data(vendor), fresh),
+        (order_data(vendor), known),
+        (order_data(vendor), fresh),
+    ])
+
+    assert order_ids[1] == existing_id
+    assert order_ids[0] == order_ids[2] != existing_id
+    assert vendor_order_count(db, vendor) == 2
+    assert rollup_count(db, vendor) == 2
+
+
+def test_unique_index_is_skipped_while_duplicates_exist(tmp_path):
+    from db.migrations import apply_migrations
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Order.__table__.create(legacy, checkfirst=True)
+    with legacy.begin() as conn:
+        conn.execute(text("DROP INDEX ux_orders_transaction_id"))
+        for order_id in ("a", "b"):
+            conn.execute(text(
+                "INSERT INTO orders (id, user_email, vendor_email, order_date, total_price, delivery_address, "
+                "status, transaction_id, updated_at, version) VALUES (:id, 'a@example.com', 'b@example.com', "
+                "'2024-05-01 10:00:00', 1.0, 'x', 'Pending', 'dup', '2024-05-01 10:00:00', 1)"
+            ), {"id": order_id})
+
+    apply_migrations(legacy)  # logs the duplicates instead of failing startup
+    assert "ux_orders_transaction_id" not in {index["name"] for index in inspect(legacy).get_indexes("orders")}
+
+    with legacy.begin() as conn:
+        conn.execute(text("DELETE FROM orders WHERE id = 'b'"))
+    apply_migrations(legacy)
+    assert "ux_orders_transaction_id" in {index["name"] for index in inspect(legacy).get_indexes("orders")}
+    legacy.dispose()
@@ -0,0 +1,151 @@
+"""Read-through order cache and its invalidation at the mutation points."""
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from core import config
+from db.base import AsyncSessionLocal, async_engine
+from monitoring.metrics import ORDER_CACHE_STALE
+from services.async_order_service import AsyncOrderService
+from services.order_cache import OrderCache
+from services.order_service import OrderService
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(config, "ORDER_CACHE_VERIFY_RATE", 0.0)
+    return OrderCache(max_entries=100, ttl=60, redis_enabled=False)
+
+
+@pytest.fixture
+def order(db, cache):
+    service = OrderService(db, cache)
+    return service.create_order(
+        order_data={
+            "user_email": "cache@example.com",
+            "vendor_email": f"cache-{uuid.uuid4().hex[:8]}@example.com",
+            "delivery_address": "1 Test Street",
+            "items": [{"product_id": "p-1", "quantity": 2, "unit_price": 5.0}],
+        },
+        transaction_id=str(uuid.uuid4()),
+    )
+
+
+def read(cache: OrderCache, order_id: str) -> tuple[dict, int]:
+    """GET /orders/{id} through the cache; returns the body and the statements it issued."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def fetch():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await AsyncOrderService(session, cache).get_order_payload(order_id)
+        finally:
+            # Pooled aiosqlite connections cannot outlive this event loop
+            await async_engine.dispose()
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        payload = asyncio.run(fetch())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return json.loads(payload), len(statements)
+
+
+def test_second_read_is_served_from_cache(cache, order):
+    body, queries = read(cache, order.id)
+    assert body["id"] == order.id and queries > 0
+
+    cached, queries = read(cache, order.id)
+    assert cached == body
+    assert queries == 0
+
+
+def test_status_update_refreshes_entry(db, cache, order):
+    read(cache, order.id)
+    OrderService(db, cache).update_order_status(order.id, "Delivered")
+
+    body, queries = read(cache, order.id)
+    assert body["status"] == "Delivered"
+    assert queries == 0
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda service, order: service.update_order_payment(order.id, "pay-1", return_order=False),
+    lambda service, order: service.rollback_order(order.transaction_id),
+])
+def test_mutations_invalidate_entry(db, cache, order, mutate):
+    read(cache, order.id)
+    mutate(OrderService(db, cache), order)
+
+    _, queries = read(cache, order.id)
+    assert queries > 0
+
+
+def test_delete_invalidates_entry(db, cache, order):
+    read(cache, order.id)
+    OrderService(db, cache).delete_order(order.id)
+
+    with pytest.raises(ValueError):
+        read(cache, order.id)
+
+
+def test_read_started_before_invalidation_is_not_cached(cache):
+    epoch = cache.begin()
+    cache.invalidate("order-1", "test")
+    asyncio.run(cache.put("order-1", b"{}", epoch))
+    assert asyncio.run(cache.get("order-1")) is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = OrderCache(max_entries=2, ttl=60, redis_enabled=False)
+    for order_id in ("a", "b"):
+        asyncio.run(cache.put(order_id, order_id.encode(), cache.begin()))
+    asyncio.run(cache.get("a"))
+    asyncio.run(cache.put("c", b"c", cache.begin()))
+
+    assert asyncio.run(cache.get("b")) is None
+    assert asyncio.run(cache.get("a")) == b"a"
+
+
+def test_sampled_verification_counts_and_repairs_stale_entries(monkeypatch, cache, order):
+    asyncio.run(cache.put(order.id, b'{"stale": true}', cache.begin()))
+    monkeypatch.setattr(config, "ORDER_CACHE_VERIFY_RATE", 1.0)
+    stale_before = ORDER_CACHE_STALE._value.get()
+
+    body, _ = read(cache, order.id)
+    assert body["id"] == order.id
+    assert ORDER_CACHE_STALE._value.get() == stale_before + 1
+
+
+def test_stop_joins_the_listener_without_blocking_the_event_loop(cache):
+    def listener():
+        cache._stop.wait()
+        time.sleep(0.2)  # still winding down when stop() joins it
+
+    cache._thread = threading.Thread(target=listener)
+    cache._thread.start()
+
+    async def stop():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await cache.stop()
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(stop()) > 5
+    assert not cache._thread.is_alive()
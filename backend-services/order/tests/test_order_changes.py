@@ -0,0 +1,148 @@
+"""Order change feed: updated_at maintenance and /orders/changes."""
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from api.dependencies import admin_auth_dependency
+from core import config
+from db.base import AsyncSessionLocal, async_engine
+from entity.order import Order
+from main import app
+from services.async_order_service import AsyncOrderService
+from services.order_service import OrderService
+
+
+def poll(since=None, limit=50, fields="id,status,updated_at"):
+    async def with_session():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await AsyncOrderService(session).list_changes_page(limit, since, fields)
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(with_session())
+
+
+def catch_up(since=None, limit=50) -> tuple[list[dict], str | None]:
+    changes = []
+    while True:
+        page, since = poll(since, limit)
+        changes.extend(page)
+        if len(page) < limit:
+            return changes, since
+
+
+def make_order(service: OrderService) -> str:
+    return service.create_order(
+        order_data={
+            "user_email": "feed@example.com",
+            "vendor_email": f"feed-{uuid.uuid4().hex[:8]}@example.com",
+            "delivery_address": "1 Test Street",
+            "items": [{"product_id": "p-1", "quantity": 1, "unit_price": 1.0}],
+        },
+        transaction_id=str(uuid.uuid4()),
+    ).id
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(monkeypatch):
+    monkeypatch.setattr(config, "ORDER_CHANGES_SAFETY_LAG_SECONDS", 0)
+
+
+def test_feed_returns_each_change_once_in_order(db):
+    service = OrderService(db)
+    _, cursor = catch_up()
+    created = [make_order(service) for _ in range(5)]
+
+    # Small pages so the cursor has to carry the position between polls
+    changes, cursor = catch_up(cursor, limit=2)
+    assert [c["id"] for c in changes] == created
+    keys = [(c["updated_at"], c["id"]) for c in changes]
+    assert keys == sorted(keys)
+
+    service.update_order_status(created[1], "Shipped")
+    service.update_vendor_order_statuses(service.get_order_by_id(created[3]).vendor_email, [created[3]], "Shipped")
+    changes, cursor = catch_up(cursor)
+    assert [(c["id"], c["status"]) for c in changes] == [(created[1], "Shipped"), (created[3], "Shipped")]
+
+    # Caught up: the cursor comes back unchanged
+    assert poll(cursor) == ([], cursor)
+
+
+def test_updates_move_updated_at_forward(db):
+    service = OrderService(db)
+    order_id = make_order(service)
+    created = service.get_order_by_id(order_id).updated_at
+    service.update_order_address(order_id, "2 Other Street")
+    db.expire_all()
+    assert service.get_order_by_id(order_id).updated_at > created
+
+
+def test_recent_changes_are_held_back(db, monkeypatch):
+    _, cursor = catch_up()
+    make_order(OrderService(db))
+    monkeypatch.setattr(config, "ORDER_CHANGES_SAFETY_LAG_SECONDS", 3600)
+    assert poll(cursor) == ([], cursor)
+
+
+def test_changes_endpoint(db):
+    _, cursor = catch_up()
+    order_id = make_order(OrderService(db))
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        with TestClient(app) as client:
+            response = client.get("/orders/changes", params={"since": cursor, "fields": "id,updated_at"})
+            assert response.status_code == 200
+            assert [row["id"] for row in response.json()] == [order_id]
+            next_cursor = response.headers["X-Next-Cursor"]
+
+            response = client.get("/orders/changes", params={"since": next_cursor})
+            assert response.json() == [] and response.headers["X-Next-Cursor"] == next_cursor
+
+            assert client.get("/orders/changes", params={"since": "garbage"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_migration_adds_and_backfills_columns(tmp_path):
+    from db.migrations import apply_migrations
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE orders (id VARCHAR(36) PRIMARY KEY, payment_id VARCHAR(36), user_email VARCHAR(100) NOT NULL, "
+            "vendor_email VARCHAR(100) NOT NULL, description VARCHAR(255), order_date TIMESTAMP NOT NULL, "
+            "delivery_date TIMESTAMP, total_price FLOAT NOT NULL, delivery_address VARCHAR(255) NOT NULL, "
+            "transaction_id VARCHAR(36), status VARCHAR(9) NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO orders (id, user_email, vendor_email, order_date, total_price, delivery_address, status) "
+            "VALUES ('legacy', 'a@example.com', 'b@example.com', '2024-05-01 10:00:00.000000', 1.0, 'x', 'Pending')"
+        ))
+    apply_migrations(legacy)
+    apply_migrations(legacy)  # idempotent
+
+    inspector = inspect(legacy)
+    assert "updated_at" in {column["name"] for column in inspector.get_columns("orders")}
+    assert "ix_orders_updated_at_id" in {index["name"] for index in inspector.get_indexes("orders")}
+    with legacy.connect() as conn:
+        updated_at, order_date, version = conn.execute(select(Order.updated_at, Order.order_date, Order.version)).one()
+    assert updated_at == order_date
+    assert version == 1
+    legacy.dispose()
+
+
+@pytest.mark.parametrize("dialect, expected", [
+    (mysql.dialect(), ["ALTER TABLE orders MODIFY COLUMN updated_at DATETIME(6) NOT NULL",
+                       "ALTER TABLE orders MODIFY COLUMN version INTEGER NOT NULL"]),
+    (postgresql.dialect(), ["ALTER TABLE orders ALTER COLUMN updated_at SET NOT NULL",
+                            "ALTER TABLE orders ALTER COLUMN version SET NOT NULL"]),
+    (sqlite.dialect(), [None, None]),
+])
+def test_not_null_ddl(dialect, expected):
+    from db.migrations import NOT_NULL_COLUMNS, not_null_ddl
+
+    assert [not_null_ddl(dialect, column) for column in NOT_NULL_COLUMNS] == expected
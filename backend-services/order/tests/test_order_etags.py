@@ -0,0 +1,114 @@
+"""Row versions and conditional GET /orders/{order_id}."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from api.conditional import etag_matches
+from api.dependencies import customer_auth_dependency
+from core import config
+from db.base import async_engine
+from main import app
+from services.order_cache import get_order_cache
+from services.order_service import OrderService
+
+
+@pytest.fixture
+def order_id(db):
+    return OrderService(db).create_order(
+        order_data={
+            "user_email": "etag@example.com",
+            "vendor_email": f"etag-{uuid.uuid4().hex[:8]}@example.com",
+            "delivery_address": "1 Test Street",
+            "items": [{"product_id": "p-1", "quantity": 1, "unit_price": 1.0}],
+        },
+        transaction_id=str(uuid.uuid4()),
+    ).id
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[customer_auth_dependency] = lambda: None
+    get_order_cache().clear()
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def async_statements():
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+def test_every_update_path_bumps_the_version(db, order_id):
+    service = OrderService(db)
+    assert service.get_order_by_id(order_id).version == 1
+    service.update_order_status(order_id, "Shipped")  # Core UPDATE
+    order = service.get_order_by_id(order_id)
+    assert order.version == 2
+    service.update_vendor_order_statuses(order.vendor_email, [order_id], "Delivered")  # bulk UPDATE
+    transaction_id = order.transaction_id
+    db.expire_all()
+    assert service.get_order_by_id(order_id).version == 3
+    service.rollback_order(transaction_id)  # ORM flush
+    db.expire_all()
+    assert service.get_order_by_id(order_id).version == 4
+
+
+def test_conditional_get(client, db, order_id):
+    response = client.get(f"/orders/{order_id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag == '"1"' and response.json()["version"] == 1
+
+    response = client.get(f"/orders/{order_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b"" and response.headers["ETag"] == etag
+
+    OrderService(db, get_order_cache()).update_order_address(order_id, "2 Other Street")
+    response = client.get(f"/orders/{order_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["delivery_address"] == "2 Other Street"
+
+    assert client.get("/orders/missing", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_not_modified_reads_only_the_version(client, order_id, monkeypatch, async_statements):
+    monkeypatch.setattr(config, "ORDER_CACHE_ENABLED", False)
+    response = client.get(f"/orders/{order_id}", headers={"If-None-Match": '"1"'})
+    assert response.status_code == 304
+    assert len(async_statements) == 1 and "order_items" not in async_statements[0]
+
+
+def test_not_modified_from_cached_version(client, order_id, monkeypatch, async_statements):
+    monkeypatch.setattr(config, "ORDER_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "ORDER_CACHE_VERIFY_RATE", 0.0)
+    assert client.get(f"/orders/{order_id}").status_code == 200
+    async_statements.clear()
+    assert client.get(f"/orders/{order_id}", headers={"If-None-Match": '"1"'}).status_code == 304
+    assert async_statements == []
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"3"', True),
+    ('W/"3"', True),
+    ('"1", "3"', True),
+    ("*", True),
+    ('"4"', False),
+    ("", False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"3"') is expected
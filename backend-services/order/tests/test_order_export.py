@@ -0,0 +1,85 @@
+"""Streaming order export."""
+import csv
+import gzip
+import io
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from api.dependencies import admin_auth_dependency
+from core import config
+from db.base import engine
+from entity.order import Order
+from main import app
+from services import order_export
+from services.order_service import OrderService
+
+
+@pytest.fixture
+def exported_orders(db):
+    """Three orders with 3, 1 and 0 items, keyed by ID."""
+    service = OrderService(db)
+    vendor = f"export-{uuid.uuid4().hex[:8]}@example.com"
+    orders = {}
+    for count in (3, 1):
+        items = [{"product_id": f"p-{i}", "quantity": i + 1, "unit_price": 2.5} for i in range(count)]
+        order = service.create_order(
+            order_data={"user_email": "export@example.com", "vendor_email": vendor,
+                        "delivery_address": "1 Test Street", "items": items},
+            transaction_id=str(uuid.uuid4()),
+        )
+        orders[order.id] = items
+    empty_id = str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(insert(Order), [{"id": empty_id, "user_email": "export@example.com", "vendor_email": vendor,
+                                      "delivery_address": "1 Test Street", "total_price": 0.0, "status": "Pending"}])
+    orders[empty_id] = []
+    return orders
+
+
+def test_ndjson_groups_items_across_fetch_batches(exported_orders, monkeypatch):
+    # Fetch batches smaller than an order's rows so groups span round trips
+    monkeypatch.setattr(config, "ORDER_EXPORT_YIELD_PER", 2)
+    monkeypatch.setattr(config, "ORDER_EXPORT_CHUNK_BYTES", 64)
+    records = [json.loads(line) for line in b"".join(order_export.export_orders("ndjson")).splitlines()]
+
+    ids = [record["id"] for record in records]
+    assert len(ids) == len(set(ids))
+    mine = {record["id"]: record for record in records if record["id"] in exported_orders}
+    assert mine.keys() == exported_orders.keys()
+    for order_id, items in exported_orders.items():
+        assert sorted(mine[order_id]["items"], key=lambda i: i["product_id"]) == items
+        assert set(mine[order_id]) == set(order_export.ORDER_FIELDS) | {"items"}
+
+
+def test_gzip_round_trips():
+    plain = b"".join(order_export.export_orders("csv"))
+    assert gzip.decompress(b"".join(order_export.export_orders("csv", True))) == plain
+
+
+def test_unknown_format_raises_value_error():
+    with pytest.raises(ValueError):
+        order_export.export_orders("xlsx")
+
+
+def test_export_endpoint_streams_gzipped_csv(exported_orders):
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        with TestClient(app) as client:
+            response = client.get("/orders/export", params={"format": "csv", "gzip": "true", "status": "Pending"})
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/gzip"
+            assert 'filename="orders.csv.gz"' in response.headers["content-disposition"]
+            rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+            mine = {row["id"]: json.loads(row["items"]) for row in rows if row["id"] in exported_orders}
+            assert {order_id: len(items) for order_id, items in mine.items()} == \
+                {order_id: len(items) for order_id, items in exported_orders.items()}
+            assert {row["status"] for row in rows} == {"Pending"}
+
+            assert client.get("/orders/export", params={"format": "xml"}).status_code == 400
+            assert client.get("/orders/export", params={"status": "Lost"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
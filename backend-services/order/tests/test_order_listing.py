@@ -0,0 +1,151 @@
+"""Keyset pagination and projection for GET /orders/."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from api.dependencies import admin_auth_dependency
+from entity.order import Order
+from main import app
+from services.order_service import OrderService
+
+
+@pytest.fixture
+def orders(db):
+    service = OrderService(db)
+    created = [
+        service.create_order(
+            order_data={
+                "user_email": f"list-{i}@example.com",
+                "vendor_email": "vendor@example.com",
+                "delivery_address": "1 Test Street",
+                "items": [
+                    {"product_id": "p-1", "quantity": 1, "unit_price": 2.0},
+                    {"product_id": "p-2", "quantity": 3, "unit_price": 1.5},
+                ],
+            },
+            transaction_id=str(uuid.uuid4()),
+        ).id
+        for i in range(7)
+    ]
+    # Spread every order over three timestamps so pages cross ties on order_date.
+    # Written through the ORM type so SQLite stores them in the same format it binds.
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    all_ids = db.execute(select(Order.id)).scalars().all()
+    for i, order_id in enumerate(all_ids):
+        db.execute(update(Order).where(Order.id == order_id).values(order_date=base + timedelta(seconds=i % 3)))
+    db.commit()
+    return created
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_pages_cover_every_order_once(db, orders):
+    service = OrderService(db)
+    total = db.execute(select(func.count()).select_from(Order)).scalar_one()
+    seen, cursor = [], None
+    for _ in range(total + 1):
+        page, cursor = service.list_orders_page(3, cursor, "id,order_date")
+        assert len(page) <= 3
+        seen.extend(row["id"] for row in page)
+        if cursor is None:
+            break
+    assert cursor is None
+    assert len(seen) == len(set(seen)) == total
+    assert set(orders) <= set(seen)
+
+
+def test_projection_and_query_count(db, orders, query_counter):
+    service = OrderService(db)
+
+    page, _ = service.list_orders_page(5, None, "id,status")
+    assert query_counter.count == 1
+    assert all(set(row) == {"id", "status"} for row in page)
+
+    query_counter.reset()
+    page, _ = service.list_orders_page(5, None, "id,items")
+    # One query for the page and one for all of its items
+    assert query_counter.count == 2
+    assert all(len(row["items"]) == 2 for row in page if row["id"] in orders)
+
+
+def test_invalid_field_and_cursor_are_rejected(db):
+    service = OrderService(db)
+    with pytest.raises(ValueError):
+        service.list_orders_page(5, None, "id,password")
+    with pytest.raises(ValueError):
+        service.list_orders_page(5, "not-a-cursor")
+
+
+def test_endpoint_returns_list_and_next_cursor_header(client, orders):
+    first = client.get("/orders/", params={"limit": 2})
+    assert first.status_code == 200
+    assert isinstance(first.json(), list) and len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/orders/", params={"limit": 2, "cursor": cursor, "fields": "id"})
+    assert second.status_code == 200
+    assert {row["id"] for row in second.json()}.isdisjoint(row["id"] for row in first.json())
+
+    assert client.get("/orders/", params={"fields": "nope"}).status_code == 400
+    assert client.get("/orders/", params={"limit": 0}).status_code == 422
+
+
+def test_vendor_and_user_pages_are_filtered(db, orders):
+    service = OrderService(db)
+
+    page, _ = service.list_vendor_orders_page("vendor@example.com", 50, fields="id,vendor_email,status")
+    assert page and all(row["vendor_email"] == "vendor@example.com" for row in page)
+
+    page, cursor = service.list_user_orders_page("list-3@example.com", 50, fields="id,user_email")
+    assert cursor is None and all(row["user_email"] == "list-3@example.com" for row in page)
+
+    page, _ = service.list_vendor_orders_page("vendor@example.com", 50, status="Delivered")
+    assert page == []
+
+    window_start = datetime(2025, 1, 1, 12, 0, 1)
+    page, _ = service.list_vendor_orders_page(
+        "vendor@example.com", 50, fields="id,order_date",
+        date_from=window_start, date_to=window_start + timedelta(seconds=1)
+    )
+    assert page and all(row["order_date"] == window_start for row in page)
+
+    with pytest.raises(ValueError):
+        service.list_vendor_orders_page("vendor@example.com", 50, status="Lost")
+
+
+def test_migrations_create_listing_indexes():
+    from sqlalchemy import inspect, text
+    from db.base import engine
+    from db.migrations import apply_migrations
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_orders_vendor_email_order_date"))
+        conn.execute(text("DROP INDEX ix_orders_order_date_id"))
+    apply_migrations(engine)
+    apply_migrations(engine)  # idempotent
+
+    names = {index["name"] for index in inspect(engine).get_indexes("orders")}
+    assert {"ix_orders_user_email_order_date", "ix_orders_vendor_email_order_date", "ix_orders_order_date_id"} <= names
+
+
+def test_unfiltered_page_reads_the_order_date_index_without_sorting():
+    from db.base import engine
+    from services import order_queries
+
+    stmt = order_queries.select_orders_page(("id", "status"), 50)
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+    assert "ix_orders_order_date_id" in plan
+    assert "TEMP B-TREE" not in plan
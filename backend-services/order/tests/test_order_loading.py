@@ -0,0 +1,87 @@
+"""Order pages load items with one IN query instead of a row-multiplying JOIN."""
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+
+from db.base import engine
+from entity.order import Order
+from services.order_service import OrderService
+
+ORDERS = 4
+
+
+class StatementRecorder:
+    """Records statements while active; rows() re-runs them to count the rows each returned."""
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def rows(self) -> list[int]:
+        statements = list(self.statements)
+        with engine.connect() as conn:
+            return [len(conn.exec_driver_sql(statement, parameters).fetchall())
+                    for statement, parameters in statements]
+
+
+@pytest.fixture
+def recorder():
+    recorder = StatementRecorder()
+    event.listen(engine, "before_cursor_execute", recorder)
+    try:
+        yield recorder
+    finally:
+        event.remove(engine, "before_cursor_execute", recorder)
+
+
+def seed(db, items_per_order: int) -> str:
+    vendor = f"loading-{uuid.uuid4().hex[:8]}@example.com"
+    service = OrderService(db)
+    for _ in range(ORDERS):
+        service.create_order(
+            order_data={
+                "user_email": "loading@example.com",
+                "vendor_email": vendor,
+                "delivery_address": "1 Test Street",
+                "items": [{"product_id": f"p-{i}", "quantity": 1, "unit_price": 1.0} for i in range(items_per_order)],
+            },
+            transaction_id=str(uuid.uuid4()),
+        )
+    db.expunge_all()
+    return vendor
+
+
+def joined_page(db, vendor: str, limit: int) -> list[Order]:
+    """The ORM joined-loading equivalent of one vendor page."""
+    return (
+        db.query(Order).options(joinedload(Order.items))
+        .filter(Order.vendor_email == vendor)
+        .order_by(Order.order_date.desc(), Order.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+@pytest.mark.parametrize("items_per_order", [1, 5, 10, 25, 50])
+def test_page_items_are_not_multiplied_by_a_join(db, recorder, items_per_order):
+    vendor = seed(db, items_per_order)
+    service = OrderService(db)
+
+    recorder.statements = []
+    page, _ = service.list_vendor_orders_page(vendor, 10, fields="id,items")
+    page_rows = recorder.rows()
+
+    recorder.statements = []
+    joined = joined_page(db, vendor, 10)
+    joined_rows = recorder.rows()
+
+    # One row per order, then one per item
+    assert page_rows == [ORDERS, ORDERS * items_per_order]
+    # One row per item, each repeating the order's columns
+    assert joined_rows == [ORDERS * items_per_order]
+    assert {row["id"]: [item["product_id"] for item in row["items"]] for row in page} == {
+        order.id: [item.product_id for item in order.items] for order in joined
+    }
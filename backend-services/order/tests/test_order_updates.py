@@ -0,0 +1,80 @@
+"""Round-trip counts for the single-statement OrderService updates."""
+import uuid
+
+import pytest
+
+from services.order_service import OrderService
+
+
+def make_order(service: OrderService):
+    return service.create_order(
+        order_data={
+            "user_email": "buyer@example.com",
+            "vendor_email": "vendor@example.com",
+            "delivery_address": "1 Test Street",
+            "items": [{"product_id": "p-1", "quantity": 2, "unit_price": 5.0}],
+        },
+        transaction_id=str(uuid.uuid4()),
+    )
+
+
+def write_statements(statements: list) -> list:
+    return [s for s in statements if s.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))]
+
+
+@pytest.mark.parametrize("method, args, column, expected, rollup_writes", [
+    # A status change also moves the order between two vendor rollup rows
+    ("update_order_status", ("Shipped",), "status", "Shipped", 2),
+    ("update_order_payment", ("pay-1",), "payment_id", "pay-1", 0),
+    ("update_order_address", ("2 New Street",), "delivery_address", "2 New Street", 0),
+    ("update_order_delivery_date", (), "delivery_date", None, 0),
+])
+def test_update_uses_one_write_and_one_read(db, query_counter, method, args, column, expected, rollup_writes,
+                                            record_property):
+    service = OrderService(db)
+    order_id = make_order(service).id
+
+    query_counter.reset()
+    order = getattr(service, method)(order_id, *args)
+
+    record_property("queries", query_counter.count)
+    print(f"{method}: {query_counter.count} queries -> {query_counter.statements}")
+    # One conditional UPDATE and one read-back of the order with its items
+    assert query_counter.count == 2 + rollup_writes
+    assert len(write_statements(query_counter.statements)) == 1 + rollup_writes
+    assert order.id == order_id
+    assert len(order.items) == 1
+    if expected is not None:
+        assert getattr(order, column) == expected
+    else:
+        assert getattr(order, column) is not None
+
+
+def test_update_without_read_back_is_one_query(db, query_counter):
+    service = OrderService(db)
+    order_id = make_order(service).id
+
+    query_counter.reset()
+    assert service.update_order_payment(order_id, "pay-2", return_order=False) is None
+    assert query_counter.count == 1
+
+
+def test_update_missing_order_raises_value_error(db, query_counter):
+    service = OrderService(db)
+
+    with pytest.raises(ValueError):
+        service.update_order_status(str(uuid.uuid4()), "Shipped")
+    # Not-found comes from the affected row count, not a prior SELECT;
+    # the rollup delta computed before the UPDATE matches no rows
+    assert write_statements(query_counter.statements) == query_counter.statements
+    assert query_counter.count == 2
+
+
+def test_update_rejects_unknown_status(db, query_counter):
+    service = OrderService(db)
+    order_id = make_order(service).id
+
+    query_counter.reset()
+    with pytest.raises(ValueError):
+        service.update_order_status(order_id, "Teleported")
+    assert query_counter.count == 0
@@ -0,0 +1,134 @@
+"""Read-replica routing for read-only service methods."""
+import asyncio
+import os
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.base import Base, async_engine, engine
+from db.routing import AsyncRoutingSession, Replica, ReplicaSet, RoutingSession
+from services.async_order_service import AsyncOrderService
+from services.order_service import OrderService
+
+
+def order_data(vendor: str) -> dict:
+    return {
+        "user_email": "replica-reader@example.com",
+        "vendor_email": vendor,
+        "delivery_address": "1 Test Street",
+        "items": [{"product_id": "p-1", "quantity": 1, "unit_price": 2.0}],
+    }
+
+
+def vendor_order_ids(service: OrderService, vendor: str) -> list[str]:
+    page, _ = service.list_vendor_orders_page(vendor, 10, fields="id")
+    return [row["id"] for row in page]
+
+
+def sqlite_replica(name: str) -> Replica:
+    path = os.path.join(tempfile.mkdtemp(prefix="order-replica-"), "replica.db")
+    replica_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=replica_engine)
+    return Replica(name=name, engine=replica_engine)
+
+
+@pytest.fixture
+def replica_set():
+    return ReplicaSet(read_after_write=0, check_interval=60)
+
+
+@pytest.fixture
+def make_session(replica_set):
+    factory = sessionmaker(class_=RoutingSession, autoflush=False, bind=engine, replicas=replica_set)
+    sessions = []
+
+    def make():
+        sessions.append(factory())
+        return sessions[-1]
+    yield make
+    for session in sessions:
+        session.close()
+
+
+def seed_replica(replica: Replica, vendor: str) -> str:
+    """Create an order that only exists on the replica."""
+    with sessionmaker(bind=replica.engine)() as session:
+        return OrderService(session).create_order(order_data(vendor), str(uuid.uuid4())).id
+
+
+def test_reads_go_to_the_replica(replica_set, make_session):
+    replica = sqlite_replica("replica-a")
+    replica_set.add(replica)
+    vendor = f"replica-{uuid.uuid4().hex[:8]}@example.com"
+    replica_only = seed_replica(replica, vendor)
+
+    service = OrderService(make_session())
+    assert vendor_order_ids(service, vendor) == [replica_only]
+
+
+def test_session_that_wrote_reads_from_the_primary(replica_set, make_session):
+    replica = sqlite_replica("replica-a")
+    replica_set.add(replica)
+    vendor = f"replica-{uuid.uuid4().hex[:8]}@example.com"
+    seed_replica(replica, vendor)
+
+    service = OrderService(make_session())
+    created = service.create_order(order_data(vendor), str(uuid.uuid4())).id
+    assert vendor_order_ids(service, vendor) == [created]
+
+
+def test_recent_write_keeps_other_sessions_on_the_primary(replica_set, make_session):
+    replica = sqlite_replica("replica-a")
+    replica_set.add(replica)
+    replica_set.read_after_write = 60
+    vendor = f"replica-{uuid.uuid4().hex[:8]}@example.com"
+    seed_replica(replica, vendor)
+
+    created = OrderService(make_session()).create_order(order_data(vendor), str(uuid.uuid4())).id
+    assert vendor_order_ids(OrderService(make_session()), vendor) == [created]
+
+
+def test_round_robin_skips_unhealthy_replicas(replica_set):
+    a, b, c = (sqlite_replica(name) for name in ("a", "b", "c"))
+    for replica in (a, b, c):
+        replica_set.add(replica)
+    replica_set.mark_down(b, "test")
+
+    assert [replica_set.choose().name for _ in range(4)] == ["a", "c", "c", "a"]
+
+    replica_set.check()
+    assert b.healthy
+
+
+def test_unreachable_replica_falls_back_to_the_primary(replica_set, make_session):
+    broken = Replica(name="broken", engine=create_engine("sqlite:////nonexistent-dir/replica.db"))
+    replica_set.add(broken)
+    vendor = f"replica-{uuid.uuid4().hex[:8]}@example.com"
+    created = OrderService(make_session()).create_order(order_data(vendor), str(uuid.uuid4())).id
+
+    assert vendor_order_ids(OrderService(make_session()), vendor) == [created]
+    assert not broken.healthy
+    assert replica_set.choose() is None
+
+
+def test_async_reads_go_to_the_replica(replica_set):
+    replica = sqlite_replica("replica-a")
+    replica.async_engine = create_async_engine(f"sqlite+aiosqlite:///{replica.engine.url.database}")
+    replica_set.add(replica)
+    vendor = f"replica-{uuid.uuid4().hex[:8]}@example.com"
+    replica_only = seed_replica(replica, vendor)
+
+    async def read():
+        factory = async_sessionmaker(
+            async_engine, sync_session_class=AsyncRoutingSession, expire_on_commit=False, replicas=replica_set
+        )
+        async with factory() as session:
+            page, _ = await AsyncOrderService(session).list_vendor_orders_page(vendor, 10, fields="id")
+        await replica.async_engine.dispose()
+        return page
+
+    assert asyncio.run(read()) == [{"id": replica_only}]
@@ -0,0 +1,144 @@
+"""Vendor daily rollups maintained by the order writes, and their rebuild."""
+import asyncio
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from api.dependencies import vendor_auth_dependency
+from db.base import AsyncSessionLocal, async_engine, engine
+from entity.vendor_daily_rollup import VendorDailyRollup
+from main import app
+from services.async_order_service import AsyncOrderService
+from services.order_rollups import check_dialect, rebuild_rollups, select_order_totals, upsert_totals
+from services.order_service import OrderService
+
+
+def order_data(vendor: str, unit_price: float = 10.0) -> dict:
+    return {
+        "user_email": "rollup@example.com",
+        "vendor_email": vendor,
+        "delivery_address": "1 Test Street",
+        "items": [{"product_id": "p-1", "quantity": 2, "unit_price": unit_price}],
+    }
+
+
+def rollup(db, vendor: str) -> dict:
+    db.expire_all()
+    rows = db.execute(select(VendorDailyRollup).where(VendorDailyRollup.vendor_email == vendor)).scalars()
+    return {(row.day, row.status): (row.order_count, row.revenue) for row in rows if row.order_count}
+
+
+@pytest.fixture
+def vendor():
+    return f"rollup-{uuid.uuid4().hex[:8]}@example.com"
+
+
+def test_writes_keep_the_rollup_in_step(db, vendor):
+    service = OrderService(db)
+    first = service.create_order(order_data(vendor), str(uuid.uuid4()))
+    second = service.create_order(order_data(vendor, unit_price=5.0), str(uuid.uuid4()))
+    day = first.order_date.date()
+    assert rollup(db, vendor) == {(day, "Pending"): (2, 30.0)}
+
+    service.update_order_status(first.id, "Shipped")
+    assert rollup(db, vendor) == {(day, "Pending"): (1, 10.0), (day, "Shipped"): (1, 20.0)}
+
+    service.rollback_order(second.transaction_id)
+    assert rollup(db, vendor) == {(day, "Canceled"): (1, 10.0), (day, "Shipped"): (1, 20.0)}
+
+    service.update_vendor_order_statuses(vendor, [first.id, second.id], "Delivered")
+    assert rollup(db, vendor) == {(day, "Delivered"): (2, 30.0)}
+
+    service.delete_order(first.id)
+    assert rollup(db, vendor) == {(day, "Delivered"): (1, 10.0)}
+
+
+def test_batched_creates_are_rolled_up_in_one_statement(db, query_counter, vendor):
+    query_counter.reset()
+    OrderService(db).create_orders([(order_data(vendor), str(uuid.uuid4())) for _ in range(3)])
+
+    assert sum("vendor_daily_rollups" in s for s in query_counter.statements) == 1
+    assert [value for value in rollup(db, vendor).values()] == [(3, 60.0)]
+
+
+def test_rebuild_matches_the_maintained_rollup(db, vendor):
+    service = OrderService(db)
+    orders = [service.create_order(order_data(vendor, unit_price=i), str(uuid.uuid4())) for i in range(1, 6)]
+    service.update_order_status(orders[0].id, "Shipped")
+    service.rollback_order(orders[1].transaction_id)
+    maintained = rollup(db, vendor)
+
+    db.execute(VendorDailyRollup.__table__.delete().where(VendorDailyRollup.vendor_email == vendor))
+    db.commit()
+    assert rollup(db, vendor) == {}
+
+    rebuild_rollups(engine, chunk_size=2, vendor_email=vendor)
+    assert rollup(db, vendor) == maintained
+
+
+def test_dashboard_reads_one_statement_regardless_of_order_count(db, vendor):
+    service = OrderService(db)
+    orders = [service.create_order(order_data(vendor), str(uuid.uuid4())) for _ in range(4)]
+    service.rollback_order(orders[0].transaction_id)
+    day = orders[0].order_date.date()
+    statements = []
+
+    async def read():
+        try:
+            async with AsyncSessionLocal() as session:
+                stats = AsyncOrderService(session)
+                return (await stats.get_vendor_daily_stats(vendor, day - timedelta(days=1), day),
+                        await stats.get_vendor_stats_summary(vendor, day, day))
+        finally:
+            await async_engine.dispose()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        daily, summary = asyncio.run(read())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) == 2
+    assert daily == [
+        {"day": day, "status": "Canceled", "order_count": 1, "revenue": 20.0},
+        {"day": day, "status": "Pending", "order_count": 3, "revenue": 60.0},
+    ]
+    # Canceled orders are counted but not part of the revenue
+    assert summary["order_count"] == 4
+    assert summary["revenue"] == 60.0
+
+
+def test_dashboard_endpoints(db, vendor):
+    created = OrderService(db).create_order(order_data(vendor), str(uuid.uuid4()))
+    day = created.order_date.date().isoformat()
+    app.dependency_overrides[vendor_auth_dependency] = lambda: None
+    try:
+        with TestClient(app) as client:
+            response = client.get(f"/orders/vendor/{vendor}/stats/daily", params={"date_from": day, "date_to": day})
+            assert response.status_code == 200
+            assert response.json() == [{"day": day, "status": "Pending", "order_count": 1, "revenue": 20.0}]
+
+            response = client.get(f"/orders/vendor/{vendor}/stats/summary", params={"date_from": day, "date_to": day})
+            assert response.status_code == 200
+            assert response.json()["by_status"] == {"Pending": {"order_count": 1, "revenue": 20.0}}
+
+            response = client.get(f"/orders/vendor/{vendor}/stats/daily",
+                                  params={"date_from": "2020-01-01", "date_to": "2025-01-01"})
+            assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_unsupported_dialect_is_a_value_error():
+    check_dialect("mysql")
+    check_dialect("sqlite")
+    with pytest.raises(ValueError, match="postgresql"):
+        check_dialect("postgresql")
+    with pytest.raises(ValueError, match="oracle"):
+        upsert_totals("oracle", select_order_totals())
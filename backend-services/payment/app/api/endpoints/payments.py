@@ -1,8 +1,10 @@
 """Payment endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
-from dtos.payment_schema import PaymentCreate, PaymentResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from dtos.payment_schema import BulkRollback, BulkRollbackResponse, BulkRollbackResult, PaymentCreate, PaymentResponse
 from services.payment_service import get_payment_service, PaymentService
+from api.conditional import etag_for, etag_matches, not_modified
 from api.dependencies import admin_auth_dependency, any_user_auth_dependency
 from logger import logger
 
@@ -20,7 +22,7 @@ def list_payments(payment_service: PaymentService = Depends(get_payment_service)
         logger.info("Fetching all payments")
         payments = payment_service.get_all_payments()
         logger.info(f"Retrieved {len(payments)} payments")
-        return payments
+        return ORJSONResponse(content=payments)
     except Exception as e:
         logger.error(f"Failed to fetch payments: {str(e)}")
         raise HTTPException(
@@ -29,14 +31,21 @@ def list_payments(payment_service: PaymentService = Depends(get_payment_service)
         )
 
 @router.get("/{payment_id}", response_model=PaymentResponse, dependencies=[Depends(any_user_auth_dependency)])
-def get_payment(payment_id: str, payment_service: PaymentService = Depends(get_payment_service)):
+def get_payment(payment_id: str, response: Response, if_none_match: Optional[str] = Header(None),
+                payment_service: PaymentService = Depends(get_payment_service)):
     """
     Retrieve a payment by its ID.
+    Answers 304 when If-None-Match still holds the payment's ETag.
     """
     try:
         logger.info(f"Fetching payment with ID: {payment_id}")
+        if if_none_match:
+            etag = etag_for(payment_service.get_payment_version(payment_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
         payment = payment_service.get_payment_by_id(payment_id)
         logger.info(f"Payment retrieved: {payment.id}")
+        response.headers["ETag"] = etag_for(payment.version)
         return payment
     except ValueError as e:
         logger.warning(f"Payment not found: {payment_id} | {str(e)}")
@@ -57,7 +66,7 @@ def get_payments_by_user(email: str, payment_service: PaymentService = Depends(g
         logger.info(f"Fetching payments for user: {email}")
         payments = payment_service.get_user_payments(email)
         logger.info(f"Retrieved {len(payments)} payments for user: {email}")
-        return payments
+        return ORJSONResponse(content=payments)
     except ValueError as e:
         logger.warning(f"No payments found for user {email}: {str(e)}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -91,6 +100,28 @@ def create_payment_endpoint(payment: PaymentCreate, payment_service: PaymentServ
             detail=f"An error occurred while creating the payment: {str(e)}"
         )
 
+@router.post("/rollback", response_model=BulkRollbackResponse, dependencies=[Depends(admin_auth_dependency)])
+def rollback_payments_endpoint(request: BulkRollback, payment_service: PaymentService = Depends(get_payment_service)):
+    """
+    Cancel the payments of many saga transactions at once, with an outcome per transaction ID.
+    """
+    try:
+        logger.info(f"Rolling back payments of {len(request.transaction_ids)} transactions")
+        outcomes = payment_service.rollback_payments(request.transaction_ids)
+        return BulkRollbackResponse(
+            cancelled=sum(outcome == "cancelled" for outcome in outcomes.values()),
+            results=[BulkRollbackResult(transaction_id=tid, outcome=outcome) for tid, outcome in outcomes.items()],
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid bulk rollback: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to roll back payments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while rolling back the payments: {str(e)}"
+        )
+
 @router.put("/{payment_id}/status/{new_status}", response_model=PaymentResponse, dependencies=[Depends(admin_auth_dependency)])
 def update_payment_status_endpoint(payment_id: str, new_status: str, payment_service: PaymentService = Depends(get_payment_service)):
     """
@@ -6,10 +6,17 @@ DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD",default="root")
 DATABASE_HOST = os.getenv("DATABASE_HOST",default="localhost")  # 'localhost' works if you're connecting from the host
 DATABASE_NAME = os.getenv("DATABASE_NAME",default="payments_db")
 
-SQLALCHEMY_DATABASE_URL = (
-    f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    default=f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}/{DATABASE_NAME}"
 )
 
+# Comma-separated read replicas for @reads_from_replica service methods; empty means primary only
+REPLICA_DATABASE_URLS = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", default="").split(",") if url.strip()]
+# Reads stay on the primary this long after any write committed by this process
+REPLICA_READ_AFTER_WRITE_SECONDS = float(os.getenv("REPLICA_READ_AFTER_WRITE_SECONDS", default=1.0))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", default=10))
+
 AUTHERIZATION_SERVER_URL = os.getenv("AUTHERIZATION_SERVER_URL",default="http://localhost")
 AUTHORIZATION_SERVER_PORT = os.getenv("AUTHORIZATION_SERVER_PORT",default=8086)
 AUTHORIZATION_SERVER_CUSTOMER_ENDPOINT = "/customer-policy"
@@ -25,3 +32,17 @@ RABBITMQ_PRODUCTS_QUEUE = "products_queue"
 RABBITMQ_ORDERS_QUEUE = "orders_queue"
 RABBITMQ_PAYMENT_QUEUE = "payment_queue"
 RABBITMQ_ORCHESTRATION_QUEUE = "orchestration_queue"
+
+# Transaction IDs per SELECT/UPDATE round of a mass rollback (each round commits on its own)
+PAYMENT_ROLLBACK_CHUNK_SIZE = int(os.getenv("PAYMENT_ROLLBACK_CHUNK_SIZE", default=500))
+
+EVENT_LOOP_MONITOR_INTERVAL = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", default=0.25))
+EVENT_LOOP_LAG_THRESHOLD = float(os.getenv("EVENT_LOOP_LAG_THRESHOLD", default=0.1))
+EVENT_LOOP_REPORT_INTERVAL = float(os.getenv("EVENT_LOOP_REPORT_INTERVAL", default=60))
+
+QUEUE_MONITOR_INTERVAL = float(os.getenv("QUEUE_MONITOR_INTERVAL", default=15))
+QUEUE_MONITOR_QUEUES = os.getenv("QUEUE_MONITOR_QUEUES", default=RABBITMQ_PAYMENT_QUEUE).split(",")
+
+# Span export appends to TRACE_EXPORT_PATH without rotation, so it is opt-in
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", default="false").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", default="traces.jsonl")
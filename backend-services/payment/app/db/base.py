@@ -3,10 +3,29 @@ from sqlalchemy import create_engine
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from core.config import SQLALCHEMY_DATABASE_URL
+from core.config import (
+    SQLALCHEMY_DATABASE_URL, REPLICA_DATABASE_URLS, REPLICA_READ_AFTER_WRITE_SECONDS, REPLICA_HEALTH_CHECK_INTERVAL
+)
+from monitoring.metrics import DB_POOL_CHECKOUTS, DB_POOL_WAIT
+from monitoring.tracing import instrument_engine
+from db.routing import Replica, ReplicaSet, RoutingSession
 from logger import logger  # Import your custom logger
 
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that counts checkouts and records how long each caller waited
+    for a connection (including time to open a new overflow connection).
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+            DB_POOL_CHECKOUTS.inc()
+
 def create_engine_with_retry(
     url: str,
     *,
@@ -34,15 +53,29 @@ def create_engine_with_retry(
 # Replace direct engine creation with retry-enabled logic
 engine = create_engine_with_retry(
     SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
 )
+instrument_engine(engine)
+
+# Replicas are not connected at startup: one that is down only leaves the rotation
+replicas = ReplicaSet(
+    read_after_write=REPLICA_READ_AFTER_WRITE_SECONDS,
+    check_interval=REPLICA_HEALTH_CHECK_INTERVAL,
+)
+for replica_url in REPLICA_DATABASE_URLS:
+    replica_engine = create_engine(replica_url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    instrument_engine(replica_engine)
+    replicas.add(Replica(name=replica_engine.url.render_as_string(hide_password=True), engine=replica_engine))
 
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    replicas=replicas,
 )
 
 Base = declarative_base()
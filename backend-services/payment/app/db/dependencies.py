@@ -1,4 +1,5 @@
 """ Database dependencies """
+from contextlib import contextmanager
 from db.base import SessionLocal
 
 def get_db():
@@ -6,4 +7,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def session_scope():
+    """
+    Short-lived unit of work for code outside a request (e.g. message handlers):
+    commits on success, rolls back on error and always closes the session.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,99 @@
+"""
+Idempotent schema migrations.
+
+create_all only creates missing tables, so changes to existing tables are applied
+here at startup. Every step must be safe to run on every boot.
+"""
+from sqlalchemy import Column, inspect, select, update
+from sqlalchemy.engine import Connection, Dialect, Engine
+from db.base import Base
+from entity.payment import Payment
+from logger import logger
+
+# Columns add_missing_columns adds as NULL-able; enforce_not_null tightens them once backfilled
+NOT_NULL_COLUMNS = [Payment.__table__.c.version]
+
+
+def add_missing_columns(conn: Connection):
+    """
+    Add columns declared on the models that existing tables do not have yet.
+    They are added as NULL-able without a server default; backfill steps fill them in.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                logger.info(f"Adding column {column.name} to {table.name}")
+                preparer = conn.dialect.identifier_preparer
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+                    f"{preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)} NULL"
+                )
+
+
+def backfill_payment_version(conn: Connection):
+    """Payments that predate ETags start at version 1."""
+    conn.execute(update(Payment).where(Payment.version.is_(None)).values(version=1))
+
+
+def not_null_ddl(dialect: Dialect, column: Column) -> str | None:
+    """The ALTER that makes an existing column NOT NULL, or None where the dialect cannot do it in place."""
+    preparer = dialect.identifier_preparer
+    table, name = preparer.format_table(column.table), preparer.format_column(column)
+    if dialect.name == "sqlite":
+        return None
+    if dialect.name == "mysql":
+        return f"ALTER TABLE {table} MODIFY COLUMN {name} {column.type.compile(dialect=dialect)} NOT NULL"
+    return f"ALTER TABLE {table} ALTER COLUMN {name} SET NOT NULL"
+
+
+def enforce_not_null(conn: Connection):
+    """
+    Make the backfilled columns NOT NULL, as create_all declares them on new
+    databases. A column that still has NULLs is left as it is and logged.
+    """
+    inspector = inspect(conn)
+    for column in NOT_NULL_COLUMNS:
+        nullable = {c["name"]: c["nullable"] for c in inspector.get_columns(column.table.name)}
+        if not nullable.get(column.name):
+            continue
+        ddl = not_null_ddl(conn.dialect, column)
+        if ddl is None:
+            logger.warning(f"{column.table.name}.{column.name} stays NULL-able: "
+                           f"{conn.dialect.name} cannot alter it in place")
+            continue
+        if conn.execute(select(column).where(column.is_(None)).limit(1)).first() is not None:
+            logger.error(f"Not making {column.table.name}.{column.name} NOT NULL: it still has NULL rows")
+            continue
+        logger.info(f"Making {column.table.name}.{column.name} NOT NULL")
+        conn.exec_driver_sql(ddl)
+
+
+def create_missing_indexes(conn: Connection):
+    """Create indexes declared on the models that the database does not have yet."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info(f"Creating index {index.name} on {table.name}")
+                index.create(bind=conn)
+
+
+MIGRATIONS = [
+    add_missing_columns,
+    backfill_payment_version,
+    enforce_not_null,
+    create_missing_indexes,
+]
+
+
+def apply_migrations(engine: Engine):
+    with engine.begin() as conn:
+        for migration in MIGRATIONS:
+            migration(conn)
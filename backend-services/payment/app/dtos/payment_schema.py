@@ -1,6 +1,6 @@
 """Payment schema module."""
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 class PaymentCreate(BaseModel):
     user_email : str
@@ -19,5 +19,17 @@ class PaymentResponse(BaseModel):
     payment_status : Optional[str]
     transaction_id : Optional[str]
     created_at : datetime
+    version : Optional[int] = None
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkRollback(BaseModel):
+    transaction_ids : List[str]
+
+class BulkRollbackResult(BaseModel):
+    transaction_id : str
+    outcome : str  # "cancelled", "unchanged" or "not_found"
+
+class BulkRollbackResponse(BaseModel):
+    cancelled : int
+    results : List[BulkRollbackResult]
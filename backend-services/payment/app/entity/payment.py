@@ -1,5 +1,5 @@
 """Payment model."""
-from sqlalchemy import Column, String, TIMESTAMP, func, Float, Enum
+from sqlalchemy import Column, String, TIMESTAMP, Integer, func, Float, Enum, literal_column
 from db.base import Base
 from . import PAYMENT_METHODS, PAYMENT_STATUSES, generate_uuid
 
@@ -13,8 +13,11 @@ class Payment(Base):
     amount = Column(Float, nullable=False)
     payment_method = Column(Enum(*PAYMENT_METHODS), nullable=False) 
     payment_status = Column(Enum(*PAYMENT_STATUSES), nullable=False, default="Pending")
-    transaction_id = Column(String(100))
+    # Saga compensations look payments up by transaction
+    transaction_id = Column(String(100), index=True)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+    # Row version behind the payment's ETag; every UPDATE (ORM or Core alike) bumps it in SQL
+    version = Column(Integer, nullable=False, default=1, onupdate=literal_column("version") + 1)
 
     def __init__(self, user_email: str, order_id: str, amount: float, payment_method: str, payment_status: str = "Pending", transaction_id: str = None):
         """
@@ -5,16 +5,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from db.dependencies import get_db
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
-from db.base import engine, Base
+from db.base import engine, replicas, Base
+from db.migrations import apply_migrations
 from entity import payment
-from api.endpoints import payments, logs
+from api.endpoints import payments, logs, metrics, admin
 from services.rabbitmq_consumer import get_consumer_service
+from monitoring.event_loop_monitor import get_event_loop_monitor
+from monitoring.middleware import MetricsMiddleware
+from monitoring.queue_monitor import get_queue_monitor
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: create and start the consumer thread
     Base.metadata.create_all(bind=engine)
+    apply_migrations(engine)
     print("Database connected")
+    loop_monitor = get_event_loop_monitor()
+    loop_monitor.start()
+    queue_monitor = get_queue_monitor()
+    queue_monitor.start()
+    replicas.start()
     consumer = get_consumer_service(queue=config.RABBITMQ_PAYMENT_QUEUE)
     thread = threading.Thread(target=consumer.start_consuming, daemon=True)
     thread.start()
@@ -26,6 +36,9 @@ async def lifespan(app: FastAPI):
         consumer.stop_consuming()
         thread.join(timeout=5)
         print("Consumer stopped.")
+        queue_monitor.stop()
+        replicas.stop()
+        await loop_monitor.stop()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -38,9 +51,12 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(payments.router)
 app.include_router(logs.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
 @app.get("/")
 async def root(db: Session = Depends(get_db)):
     return {"message": "Hello World"}
\ No newline at end of file
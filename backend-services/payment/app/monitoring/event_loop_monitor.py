@@ -0,0 +1,110 @@
+"""
+Event-loop lag monitor.
+
+A coroutine on the event loop sleeps for a fixed interval and records how late it
+wakes up (the scheduling lag). A watchdog thread watches the coroutine's heartbeat;
+when the loop stalls for longer than the threshold it samples the loop thread's
+stack, so the blocking call inside an async endpoint can be identified.
+"""
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+from core import config
+from logger import logger
+from monitoring.metrics import EVENT_LOOP_LAG, EVENT_LOOP_BLOCKED
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EventLoopMonitor:
+    def __init__(self, interval: float = config.EVENT_LOOP_MONITOR_INTERVAL,
+                 threshold: float = config.EVENT_LOOP_LAG_THRESHOLD,
+                 report_interval: float = config.EVENT_LOOP_REPORT_INTERVAL,
+                 top_n: int = 5):
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.top_n = top_n
+        self.offenders = collections.Counter()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+            self._heartbeat = time.monotonic()
+
+    def _sample_stack(self):
+        """Return (location, formatted stack) for the code currently running on the loop thread."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None, ""
+        stack = traceback.extract_stack(frame)
+        location = "unknown"
+        for entry in reversed(stack):
+            if entry.filename.startswith(APP_DIR) and not entry.filename.startswith(os.path.dirname(__file__)):
+                location = f"{os.path.relpath(entry.filename, APP_DIR)}:{entry.lineno} in {entry.name}"
+                break
+        return location, "".join(traceback.format_list(stack[-15:]))
+
+    def _watch(self):
+        stalled = False
+        last_report = time.monotonic()
+        while not self._stop.wait(self.interval / 2):
+            now = time.monotonic()
+            blocked_for = now - self._heartbeat - self.interval
+            if blocked_for >= self.threshold and not stalled:
+                stalled = True
+                location, stack = self._sample_stack()
+                if location:
+                    EVENT_LOOP_BLOCKED.labels(location=location).inc()
+                    self.offenders[location] += 1
+                    if self.offenders[location] == 1:
+                        logger.warning(f"Event loop blocked for >{self.threshold:.3f}s at {location}\n{stack}")
+            elif blocked_for < self.threshold:
+                stalled = False
+
+            if now - last_report >= self.report_interval:
+                last_report = now
+                self.log_top_offenders()
+
+    def log_top_offenders(self):
+        top = self.offenders.most_common(self.top_n)
+        if top:
+            summary = ", ".join(f"{location} ({count}x)" for location, count in top)
+            logger.warning(f"Top event loop blockers: {summary}")
+
+    def start(self):
+        """Start monitoring the running event loop. Must be called from the loop (e.g. lifespan)."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval={self.interval}s, threshold={self.threshold}s)")
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+        self.log_top_offenders()
+
+
+def get_event_loop_monitor() -> EventLoopMonitor:
+    return EventLoopMonitor()
@@ -1,7 +1,9 @@
 """Authentication service."""
+import time
 import httpx
 from core import config
 from fastapi import HTTPException
+from monitoring.metrics import AUTH_REQUEST_LATENCY
 from logger import logger  # Import the custom SQLite logger
 
 class AuthenticationService:
@@ -18,7 +20,13 @@ class AuthenticationService:
         logger.info(f"Authenticating via {url}")
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             try:
-                response = await client.post(url, headers=self.headers, json=payload)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    response = await client.post(url, headers=self.headers, json=payload)
+                    outcome = str(response.status_code)
+                finally:
+                    AUTH_REQUEST_LATENCY.labels(endpoint=endpoint, outcome=outcome).observe(time.perf_counter() - started)
                 response.raise_for_status()
                 logger.info(f"Authentication succeeded for {url}")
                 return response.json()
@@ -1,11 +1,19 @@
 """Payment bisuness logic."""
 from fastapi import Depends
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from core import config
 from db.dependencies import get_db
+from db.routing import reads_from_replica
+from entity import generate_uuid
 from entity.payment import Payment
+from dtos.payment_schema import PaymentResponse
 from logger import logger
 
+# Columns the list endpoints return, labelled like PaymentResponse
+PAYMENT_RESPONSE_COLUMNS = [getattr(Payment, name).label(name) for name in PaymentResponse.model_fields]
+
 class PaymentService:
     """
     Payment service class.
@@ -13,19 +21,30 @@ class PaymentService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all_payments(self) -> list[Payment]:
+    def _select_payment_rows(self, *criteria) -> list[dict]:
+        """
+        Read just the PaymentResponse columns as plain dicts. No entities are
+        built, and the list endpoints encode the dicts with orjson directly.
+        """
+        stmt = select(*PAYMENT_RESPONSE_COLUMNS)
+        if criteria:
+            stmt = stmt.where(*criteria)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
+    @reads_from_replica
+    def get_all_payments(self) -> list[dict]:
         """
         Retrieve all payments from the database.
 
         Returns:
-            List[Payment]: A list of all payments.
+            List[dict]: Every payment as a dict of its PaymentResponse columns.
 
         Raises:
             SQLAlchemyError: If there is a database error.
         """
         logger.info("Retrieving all payments")
         try:
-            payments = self.db.query(Payment).all()
+            payments = self._select_payment_rows()
             logger.info(f"Retrieved {len(payments)} payments")
             return payments
 
@@ -38,7 +57,8 @@ class PaymentService:
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
 
-    def get_user_payments(self, email: str) -> list[Payment]:
+    @reads_from_replica
+    def get_user_payments(self, email: str) -> list[dict]:
         """
         Retrieve all payments for the specified user.
 
@@ -46,7 +66,7 @@ class PaymentService:
             email (str): The email of the user whose payments are to be retrieved.
 
         Returns:
-            List[Payment]: A list of payments for the specified user.
+            List[dict]: The user's payments as dicts of their PaymentResponse columns.
 
         Raises:
             SQLAlchemyError: If there is a database error.
@@ -58,7 +78,7 @@ class PaymentService:
             raise ValueError("Invalid email address.")
 
         try:
-            payments = self.db.query(Payment).filter(Payment.user_email == email).all()
+            payments = self._select_payment_rows(Payment.user_email == email)
 
             if not payments:
                 logger.warning(f"No payments found for user with email: {email}")
@@ -75,6 +95,7 @@ class PaymentService:
             logger.error(f"Unexpected error while retrieving payments for user {email}: {e}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
+    @reads_from_replica
     def get_payment_by_id(self, payment_id: str) -> Payment:
         """
         Retrieve an payment by its ID.
@@ -113,6 +134,28 @@ class PaymentService:
             logger.error(f"Unexpected error while retrieving payment with ID {payment_id}: {e}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
+    @reads_from_replica
+    def get_payment_version(self, payment_id: str) -> int:
+        """
+        Retrieve only the version of a payment, for If-None-Match checks.
+
+        Raises:
+            ValueError: If the payment ID is invalid or no payment is found.
+            SQLAlchemyError: If there is a database error.
+        """
+        if not payment_id or not isinstance(payment_id, str):
+            raise ValueError("Invalid payment ID.")
+
+        try:
+            version = self.db.execute(select(Payment.version).where(Payment.id == payment_id)).scalar()
+            if version is None:
+                raise ValueError(f"No payment found with ID: {payment_id}")
+            return version
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving the version of payment {payment_id}: {e}")
+            raise SQLAlchemyError(f"Database error while retrieving the version of payment {payment_id}: {str(e)}")
+
     def create_payment(self, payment_data: dict) -> Payment:
         """
         Create a new payment with the provided payment data.
@@ -177,6 +220,64 @@ class PaymentService:
             logger.error(f"Unexpected error: {e}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
+    def capture_payment(self, payment_data: dict, transaction_id: str, payment_status: str = "Success") -> str:
+        """
+        Record a taken payment in a single INSERT and commit.
+
+        The row is written with its final status and transaction ID, and the ID
+        is generated client-side, so no follow-up UPDATE or refresh is needed.
+
+        Args:
+            payment_data (Dict): Dictionary containing payment details.
+            transaction_id (str): Saga transaction ID the payment belongs to.
+            payment_status (str): Status to store (default is "Success").
+
+        Returns:
+            str: The ID of the new payment.
+
+        Raises:
+            ValueError: If the input data is invalid.
+            KeyError: If required keys are missing.
+            SQLAlchemyError: If there is a database error.
+        """
+        logger.info(f"Capturing payment for transaction {transaction_id}")
+        required_fields = ["user_email", "order_id", "amount", "payment_method"]
+        if not all(field in payment_data for field in required_fields):
+            logger.warning(f"Missing required fields: {required_fields}")
+            raise KeyError(f"Payment data must contain the following fields: {required_fields}")
+
+        if not transaction_id or not isinstance(transaction_id, str):
+            logger.warning(f"Invalid transaction ID: {transaction_id}")
+            raise ValueError("Invalid transaction ID.")
+
+        payment_id = generate_uuid()
+        try:
+            self.db.execute(
+                insert(Payment).values(
+                    id=payment_id,
+                    user_email=payment_data["user_email"],
+                    order_id=payment_data["order_id"],
+                    amount=payment_data["amount"],
+                    payment_method=payment_data["payment_method"],
+                    payment_status=payment_status,
+                    transaction_id=transaction_id,
+                )
+            )
+            self.db.commit()
+
+            logger.info(f"Payment {payment_id} captured for transaction {transaction_id}")
+            return payment_id
+
+        except IntegrityError as e:
+            self.db.rollback()
+            logger.error(f"Database integrity error: {e}")
+            raise ValueError(f"Database integrity error: {str(e)}")
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error: {e}")
+            raise SQLAlchemyError(f"Database error: {str(e)}")
+
     def update_payment_status(self, payment_id: str, new_status: str) -> Payment:
         """
         Update the status of an payment.
@@ -388,16 +489,69 @@ class PaymentService:
             logger.error(f"Unexpected error while rolling back payment: {e}")
             raise Exception(f"An unexpected error occurred: {str(e)}")
 
-def get_payment_service() -> PaymentService:
+    def rollback_payments(self, transaction_ids: list[str]) -> dict[str, str]:
+        """
+        Cancel the payments of many saga transactions with set-based statements.
+
+        Transaction IDs are handled PAYMENT_ROLLBACK_CHUNK_SIZE at a time: one
+        SELECT on the transaction_id index classifies the chunk, one
+        UPDATE ... WHERE id IN (...) cancels the payments that are not cancelled
+        yet, and the chunk commits. Chunks are idempotent, so a mass
+        compensation that fails part-way can simply be retried.
+
+        Args:
+            transaction_ids (list[str]): The transactions to roll back; duplicates are ignored.
+
+        Returns:
+            dict[str, str]: Outcome per transaction ID: "cancelled", "unchanged" or "not_found".
+
+        Raises:
+            ValueError: If the list of transaction IDs is invalid.
+            SQLAlchemyError: If there is a database error; earlier chunks stay committed.
+        """
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        if not transaction_ids or not all(tid and isinstance(tid, str) for tid in transaction_ids):
+            logger.warning("Invalid transaction IDs for bulk rollback")
+            raise ValueError("Invalid transaction IDs.")
+
+        outcomes = dict.fromkeys(transaction_ids, "not_found")
+        chunk_size = config.PAYMENT_ROLLBACK_CHUNK_SIZE
+        for start in range(0, len(transaction_ids), chunk_size):
+            chunk = transaction_ids[start:start + chunk_size]
+            try:
+                rows = self.db.execute(
+                    select(Payment.id, Payment.transaction_id, Payment.payment_status)
+                    .where(Payment.transaction_id.in_(chunk))
+                ).all()
+                to_cancel = [row.id for row in rows if row.payment_status != "Cancelled"]
+                if to_cancel:
+                    self.db.execute(
+                        update(Payment).where(Payment.id.in_(to_cancel)).values(payment_status="Cancelled")
+                    )
+                self.db.commit()
+
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                logger.error(f"Database error while rolling back {len(chunk)} payments: {e}")
+                raise SQLAlchemyError(f"Database error while rolling back {len(chunk)} payments: {str(e)}")
+
+            for row in rows:
+                # A transaction with several payments counts as cancelled if any of them was
+                if outcomes[row.transaction_id] != "cancelled":
+                    outcomes[row.transaction_id] = "cancelled" if row.payment_status != "Cancelled" else "unchanged"
+
+        logger.info(f"Rolled back {sum(o == 'cancelled' for o in outcomes.values())} of {len(outcomes)} transactions")
+        return outcomes
+
+def get_payment_service(db: Session = Depends(get_db)) -> PaymentService:
     """
     Return an instance of the PaymentService class.
 
     Args:
-        db (Session): Database session.
+        db (Session): Request-scoped database session; FastAPI closes it once
+            the response has been sent.
 
     Returns:
         PaymentService: An instance of the PaymentService class.
     """
-    db_gen = get_db()         # this is a generator
-    db: Session = next(db_gen)
     return PaymentService(db)
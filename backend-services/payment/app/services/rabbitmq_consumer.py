@@ -9,17 +9,21 @@ Message structure:
 }
 
 """
+import time
 import pika
 import json
 from core import config
-from services.payment_service import PaymentService, get_payment_service
+from services.payment_service import PaymentService
+from db.dependencies import session_scope
 from services.rabbitmq_publisher import RabbitMQPublisher, get_publisher_service
 from fastapi import Depends
 from logger import logger
+from monitoring.metrics import CONSUMER_HANDLER_LATENCY, MESSAGES_CONSUMED
+from monitoring.queue_monitor import record_consumer_lag
+from monitoring.tracing import start_span, extract_context
 
 class RabbitMQConsumer:
-    def __init__(self, queue: str, payment_service: PaymentService, publisher: RabbitMQPublisher):
-        self.payment_service = payment_service
+    def __init__(self, queue: str, publisher: RabbitMQPublisher):
         self.publisher = publisher
         self.queue = queue
         credentials = pika.PlainCredentials(
@@ -39,6 +43,7 @@ class RabbitMQConsumer:
             "take_payment": self.handle_take_payment,
             "update_payment_order_id": self.handle_order_id_updated,
             "rollback_payment": self.handle_rollback_payment,
+            "rollback_payments": self.handle_rollback_payments,
         }
 
     def connect(self):
@@ -49,6 +54,21 @@ class RabbitMQConsumer:
         self.channel.queue_declare(queue=self.queue, durable=True)
         logger.info(f"Declared queue '{self.queue}'")
 
+    def _dispatch(self, event_type: str, message: dict):
+        """
+        Run the handler for event_type in its own session, recording its latency.
+        The session is committed or rolled back and closed before the message is
+        acked, so nothing loaded for one message outlives it.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with session_scope() as db:
+                self.event_handlers[event_type](message, PaymentService(db))
+            outcome = "success"
+        finally:
+            CONSUMER_HANDLER_LATENCY.labels(event=event_type, outcome=outcome).observe(time.perf_counter() - started)
+
     def callback(self, ch, method, properties, body):
         """Callback function to process incoming messages."""
         try:
@@ -56,10 +76,20 @@ class RabbitMQConsumer:
             logger.info(f"Received message: {message}")
             event_type = message.get("event")
 
+            MESSAGES_CONSUMED.labels(queue=self.queue, event=str(event_type)).inc()
+            record_consumer_lag(self.queue, properties)
+
             # Dispatch the message to the appropriate handler if it exists
             if event_type in self.event_handlers:
                 logger.info(f"Dispatching event '{event_type}' to handler")
-                self.event_handlers[event_type](message)
+                trace_id, parent_id = extract_context(properties)
+                with start_span(
+                    f"consume {event_type}",
+                    trace_id=trace_id or message.get("transaction_id"),
+                    parent_id=parent_id,
+                    queue=self.queue
+                ):
+                    self._dispatch(event_type, message)
             else:
                 logger.warning(f"Unhandled event type: {event_type}")
                 print(f"Unhandled event type: {event_type}")
@@ -72,28 +102,24 @@ class RabbitMQConsumer:
             print("Error processing message:", e)
             # Optionally, you might choose to nack the message or log it for further inspection
 
-    def handle_take_payment(self, message):
+    def handle_take_payment(self, message, payment_service: PaymentService):
         """Handle payment processing logic."""
         logger.info("Handling 'take_payment' event")
         try:
             data = message.get("data")
             transaction_id = message.get("transaction_id")
             logger.debug(f"take_payment data: {data}, transaction_id: {transaction_id}")
-            # Call the payment service to process the payment
-            payment_response = self.payment_service.create_payment(data)
-            logger.info(f"Created payment with ID: {payment_response.id}")
-            self.payment_service.update_payment_status(payment_response.id, "Success")
-            logger.info(f"Updated payment status to 'Success' for ID: {payment_response.id}")
-            self.payment_service.update_transaction_id(transaction_id=transaction_id, payment_id=payment_response.id)
-            logger.info(f"Updated transaction ID for payment {payment_response.id}")
+            # Store the payment with its final status and transaction ID in one transaction
+            payment_id = payment_service.capture_payment(data, transaction_id=transaction_id)
+            logger.info(f"Captured payment with ID: {payment_id}")
             # Publish a success message or take further action
-            self.publisher.publish_payment_message(payment_response.id, transaction_id)
-            logger.info(f"Published payment message for ID: {payment_response.id}")
+            self.publisher.publish_payment_message(payment_id, transaction_id)
+            logger.info(f"Published payment message for ID: {payment_id}")
         except Exception as e:
             logger.error(f"Error in handle_take_payment: {e}", exc_info=True)
             print("Error in handle_take_payment:", e)
 
-    def handle_order_id_updated(self, message):
+    def handle_order_id_updated(self, message, payment_service: PaymentService):
         """Handle order ID update logic."""
         logger.info("Handling 'update_payment_order_id' event")
         try:
@@ -102,13 +128,13 @@ class RabbitMQConsumer:
             payment_id = data.get("payment_id")
             logger.debug(f"update_payment_order_id data: order_id={order_id}, payment_id={payment_id}")
             # Call the payment service to update the order ID
-            self.payment_service.update_order_id(order_id=order_id, payment_id=payment_id)
+            payment_service.update_order_id(order_id=order_id, payment_id=payment_id)
             logger.info(f"Updated order ID to {order_id} for payment {payment_id}")
         except Exception as e:
             logger.error(f"Error in handle_order_id_updated: {e}", exc_info=True)
             print("Error in handle_order_id_updated:", e)
 
-    def handle_rollback_payment(self, message):
+    def handle_rollback_payment(self, message, payment_service: PaymentService):
         """Handle payment rollback logic."""
         logger.info("Handling 'rollback_payment' event")
         try:
@@ -117,12 +143,24 @@ class RabbitMQConsumer:
             transaction_id = message.get("transaction_id")
             logger.debug(f"rollback_payment data: payment_id={payment_id}, transaction_id={transaction_id}")
             # Call the payment service to rollback the payment
-            self.payment_service.rollback_payment(transaction_id=transaction_id, payment_id=payment_id)
+            payment_service.rollback_payment(transaction_id=transaction_id, payment_id=payment_id)
             logger.info(f"Rolled back payment {payment_id}")
         except Exception as e:
             logger.error(f"Error in handle_rollback_payment: {e}", exc_info=True)
             print("Error in handle_rollback_payment:", e)
 
+    def handle_rollback_payments(self, message, payment_service: PaymentService):
+        """Handle a mass rollback: data.transaction_ids lists every transaction to cancel."""
+        logger.info("Handling 'rollback_payments' event")
+        try:
+            transaction_ids = message.get("data", {}).get("transaction_ids", [])
+            outcomes = payment_service.rollback_payments(transaction_ids)
+            missing = [tid for tid, outcome in outcomes.items() if outcome == "not_found"]
+            if missing:
+                logger.warning(f"No payment found for {len(missing)} of {len(outcomes)} rolled back transactions")
+        except Exception as e:
+            logger.error(f"Error in handle_rollback_payments: {e}", exc_info=True)
+
     def start_consuming(self):
         """Start consuming messages from the specified queue."""
         if not self.connection or self.connection.is_closed:
@@ -157,5 +195,4 @@ def get_consumer_service(
         queue: str
     ):
     publisher = get_publisher_service()
-    payment_service = get_payment_service()
-    return RabbitMQConsumer(queue=queue, payment_service=payment_service, publisher=publisher)
+    return RabbitMQConsumer(queue=queue, publisher=publisher)
@@ -3,6 +3,9 @@ import pika
 import json
 from core import config
 from logger import logger
+from monitoring.metrics import MESSAGES_PUBLISHED
+from monitoring.queue_monitor import publish_properties
+from monitoring.tracing import start_span, inject_headers
 
 class RabbitMQPublisher:
     def __init__(self):
@@ -39,14 +42,15 @@ class RabbitMQPublisher:
 
             logger.info(f"Declaring queue '{queue}' and publishing message: {message}")
             self.channel.queue_declare(queue=queue, durable=True)
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=queue,
-                body=json.dumps(message),
-                properties=pika.BasicProperties(
-                    delivery_mode=2  # make message persistent
+            with start_span(f"publish {message.get('event')}", trace_id=message.get("transaction_id"), queue=queue):
+                self.channel.basic_publish(
+                    exchange='',
+                    routing_key=queue,
+                    body=json.dumps(message),
+                    # persistent, stamped with publish time and trace context
+                    properties=publish_properties(headers=inject_headers())
                 )
-            )
+            MESSAGES_PUBLISHED.labels(queue=queue, event=str(message.get("event"))).inc()
             logger.info(f"Message published to queue '{queue}'")
         except Exception as e:
             logger.error(f"Error publishing message to queue '{queue}': {e}", exc_info=True)
@@ -0,0 +1,107 @@
+"""
+Memory soak test for the payment consumer.
+
+Feeds take_payment messages straight into RabbitMQConsumer.callback (no broker
+needed) against the database in DATABASE_URL and compares tracemalloc snapshots
+taken after warm-up and at the end of the run. With a session per message the
+traced heap should not grow; the run fails if it grows by more than
+MAX_GROWTH_KB and prints the allocation sites that grew the most.
+
+    DATABASE_URL=sqlite:////tmp/payment_soak.db MESSAGES=100000 \
+        PYTHONPATH=app python tests/soak_consumer.py
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+# Keep span export out of the measurement
+os.environ.setdefault("TRACING_ENABLED", "false")
+
+MESSAGES = int(os.environ.get("MESSAGES", 100_000))
+WARMUP = int(os.environ.get("WARMUP", 5_000))
+MAX_GROWTH_KB = float(os.environ.get("MAX_GROWTH_KB", 1024))
+
+from db.base import Base, engine  # noqa: E402
+from entity import payment  # noqa: E402,F401
+from services.rabbitmq_consumer import RabbitMQConsumer  # noqa: E402
+
+
+class RecordingPublisher:
+    """Stands in for RabbitMQPublisher; only counts published payments."""
+    def __init__(self):
+        self.published = 0
+
+    def publish_payment_message(self, payment_id: str, transaction_id: str):
+        self.published += 1
+
+
+class AckChannel:
+    def __init__(self):
+        self.acked = 0
+
+    def basic_ack(self, delivery_tag):
+        self.acked += 1
+
+
+class Delivery:
+    delivery_tag = 1
+
+
+def take_payment_message() -> str:
+    return json.dumps({
+        "event": "take_payment",
+        "transaction_id": str(uuid.uuid4()),
+        "data": {
+            "user_email": "soak@example.com",
+            "order_id": None,
+            "amount": 19.99,
+            "payment_method": "Credit Card",
+            "payment_status": "Pending",
+        },
+    })
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    publisher = RecordingPublisher()
+    consumer = RabbitMQConsumer(queue="payment_queue", publisher=publisher)
+    channel, delivery = AckChannel(), Delivery()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    baseline = None
+    for i in range(1, MESSAGES + 1):
+        consumer.callback(channel, delivery, None, take_payment_message())
+        if i == WARMUP:
+            gc.collect()
+            baseline = tracemalloc.take_snapshot()
+        if i % 10_000 == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            print(f"messages={i} published={publisher.published} traced={current / 1024:.0f}KB "
+                  f"peak={peak / 1024:.0f}KB rate={i / (time.perf_counter() - started):.0f} msg/s")
+
+    if baseline is None:
+        print("MESSAGES must be larger than WARMUP")
+        return 1
+    gc.collect()
+    final = tracemalloc.take_snapshot()
+    stats = final.compare_to(baseline, "lineno")
+    growth = sum(stat.size_diff for stat in stats) / 1024
+    print(f"traced heap growth after {MESSAGES - WARMUP} messages: {growth:.0f}KB (limit {MAX_GROWTH_KB:.0f}KB)")
+    for stat in stats[:10]:
+        print(f"  {stat}")
+    if publisher.published != MESSAGES:
+        print(f"FAIL: only {publisher.published} of {MESSAGES} payments were taken")
+        return 1
+    if growth > MAX_GROWTH_KB:
+        print("FAIL: consumer memory keeps growing")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
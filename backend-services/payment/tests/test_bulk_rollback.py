@@ -0,0 +1,88 @@
+"""Set-based rollback of the payments of many saga transactions."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from api.dependencies import admin_auth_dependency
+from core import config
+from entity.payment import Payment
+from main import app
+from services.payment_service import PaymentService
+
+
+@pytest.fixture
+def transactions(db):
+    service = PaymentService(db)
+    email = f"rollback-{uuid.uuid4().hex[:8]}@example.com"
+    transaction_ids = [str(uuid.uuid4()) for _ in range(5)]
+    for transaction_id in transaction_ids:
+        service.capture_payment(
+            {"user_email": email, "order_id": None, "amount": 4.0, "payment_method": "Credit Card"},
+            transaction_id,
+        )
+    return email, transaction_ids
+
+
+def statuses(db, email: str) -> set[str]:
+    return set(db.execute(select(Payment.payment_status).where(Payment.user_email == email)).scalars())
+
+
+def test_chunks_of_set_based_statements(db, query_counter, monkeypatch, transactions):
+    email, transaction_ids = transactions
+    service = PaymentService(db)
+    service.rollback_payments(transaction_ids[:1])
+    monkeypatch.setattr(config, "PAYMENT_ROLLBACK_CHUNK_SIZE", 3)
+
+    query_counter.reset()
+    outcomes = service.rollback_payments(transaction_ids + [transaction_ids[1]])
+
+    assert outcomes == {
+        transaction_ids[0]: "unchanged",
+        **{tid: "cancelled" for tid in transaction_ids[1:]},
+    }
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    # Two chunks (3 + 2 transaction IDs), each one SELECT and one UPDATE
+    assert statements == ["SELECT", "UPDATE"] * 2
+    db.expire_all()
+    assert statuses(db, email) == {"Cancelled"}
+    versions = db.execute(select(Payment.transaction_id, Payment.version).where(Payment.user_email == email)).all()
+    assert dict(versions) == {tid: 2 for tid in transaction_ids}
+
+
+def test_unknown_transaction_ids_are_not_found(db, query_counter, transactions):
+    email, _ = transactions
+
+    query_counter.reset()
+    outcomes = PaymentService(db).rollback_payments(["missing-1", "missing-2"])
+
+    assert outcomes == {"missing-1": "not_found", "missing-2": "not_found"}
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    assert statements == ["SELECT"]
+    assert statuses(db, email) == {"Success"}
+
+
+@pytest.mark.parametrize("transaction_ids", [[], [""], [None]])
+def test_invalid_transaction_ids_raise_value_error(db, transaction_ids):
+    with pytest.raises(ValueError):
+        PaymentService(db).rollback_payments(transaction_ids)
+
+
+def test_rollback_endpoint(db, transactions):
+    email, transaction_ids = transactions
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        # Not entered as a context manager: the lifespan would start the RabbitMQ consumer
+        client = TestClient(app)
+        response = client.post("/payments/rollback", json={"transaction_ids": transaction_ids[:2] + ["missing"]})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["cancelled"] == 2
+        assert [(r["transaction_id"], r["outcome"]) for r in body["results"]] == [
+            (transaction_ids[0], "cancelled"), (transaction_ids[1], "cancelled"), ("missing", "not_found"),
+        ]
+
+        assert client.post("/payments/rollback", json={"transaction_ids": []}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,53 @@
+"""capture_payment records a taken payment with a single INSERT."""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from entity.payment import Payment
+from services.payment_service import PaymentService
+
+
+def payment_data(email: str) -> dict:
+    return {
+        "user_email": email,
+        "order_id": None,
+        "amount": 19.99,
+        "payment_method": "Credit Card",
+    }
+
+
+@pytest.fixture
+def email():
+    return f"capture-{uuid.uuid4().hex[:8]}@example.com"
+
+
+def test_capture_writes_one_row_and_returns_its_id(db, query_counter, email):
+    transaction_id = str(uuid.uuid4())
+
+    payment_id = PaymentService(db).capture_payment(payment_data(email), transaction_id)
+
+    statements = [s.lstrip().split()[0].upper() for s in query_counter.statements]
+    assert statements == ["INSERT"]
+    rows = db.execute(select(Payment).where(Payment.user_email == email)).scalars().all()
+    assert [row.id for row in rows] == [payment_id]
+    assert rows[0].transaction_id == transaction_id
+    assert rows[0].payment_status == "Success"
+    assert rows[0].version == 1
+
+
+def test_capture_stores_the_given_status(db, email):
+    payment_id = PaymentService(db).capture_payment(payment_data(email), str(uuid.uuid4()), "Failed")
+
+    assert db.get(Payment, payment_id).payment_status == "Failed"
+
+
+@pytest.mark.parametrize("data, transaction_id, error", [
+    ({"user_email": "a@example.com", "amount": 1.0, "payment_method": "Credit Card"}, "t-1", KeyError),
+    (payment_data("a@example.com"), "", ValueError),
+])
+def test_capture_rejects_invalid_input_without_writing(db, query_counter, data, transaction_id, error):
+    with pytest.raises(error):
+        PaymentService(db).capture_payment(data, transaction_id)
+
+    assert query_counter.count == 0
@@ -0,0 +1,38 @@
+"""Startup migrations for payment tables created before the version column."""
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from db.migrations import NOT_NULL_COLUMNS, apply_migrations, not_null_ddl
+from entity.payment import Payment
+
+
+def test_migration_adds_and_backfills_version(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE payments (id VARCHAR(36) PRIMARY KEY, user_email VARCHAR(100) NOT NULL, "
+            "order_id VARCHAR(36) UNIQUE, amount FLOAT NOT NULL, payment_method VARCHAR(16) NOT NULL, "
+            "payment_status VARCHAR(9) NOT NULL, transaction_id VARCHAR(100), "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO payments (id, user_email, amount, payment_method, payment_status) "
+            "VALUES ('legacy', 'a@example.com', 1.0, 'Credit Card', 'Success')"
+        ))
+    apply_migrations(legacy)
+    apply_migrations(legacy)  # idempotent
+
+    inspector = inspect(legacy)
+    assert "version" in {column["name"] for column in inspector.get_columns("payments")}
+    assert "ix_payments_transaction_id" in {index["name"] for index in inspector.get_indexes("payments")}
+    with legacy.connect() as conn:
+        assert conn.execute(select(Payment.version)).scalar_one() == 1
+    legacy.dispose()
+
+
+def test_not_null_ddl():
+    version = NOT_NULL_COLUMNS[0]
+
+    assert not_null_ddl(mysql.dialect(), version) == "ALTER TABLE payments MODIFY COLUMN version INTEGER NOT NULL"
+    assert not_null_ddl(postgresql.dialect(), version) == "ALTER TABLE payments ALTER COLUMN version SET NOT NULL"
+    assert not_null_ddl(sqlite.dialect(), version) is None
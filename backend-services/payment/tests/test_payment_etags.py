@@ -0,0 +1,78 @@
+"""Row versions and conditional GET /payments/{payment_id}."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies import admin_auth_dependency, any_user_auth_dependency
+from main import app
+from services.payment_service import PaymentService
+
+
+@pytest.fixture
+def payment_id(db):
+    return PaymentService(db).capture_payment(
+        {
+            "user_email": f"etag-{uuid.uuid4().hex[:8]}@example.com",
+            "order_id": None,
+            "amount": 5.0,
+            "payment_method": "Credit Card",
+        },
+        str(uuid.uuid4()),
+    )
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[any_user_auth_dependency] = lambda: None
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        # Not entered as a context manager: the lifespan would start the RabbitMQ consumer
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_get_payment_version(db, payment_id):
+    service = PaymentService(db)
+    assert service.get_payment_version(payment_id) == 1
+    with pytest.raises(ValueError):
+        service.get_payment_version("missing")
+
+
+def test_get_payment_sends_an_etag(client, payment_id):
+    response = client.get(f"/payments/{payment_id}")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["version"] == 1
+
+
+def test_matching_if_none_match_answers_304_without_a_body(client, payment_id):
+    etag = client.get(f"/payments/{payment_id}").headers["ETag"]
+
+    response = client.get(f"/payments/{payment_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_stale_if_none_match_answers_200(client, payment_id):
+    response = client.get(f"/payments/{payment_id}", headers={"If-None-Match": '"0", W/"7"'})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["id"] == payment_id
+
+
+def test_update_bumps_the_version_and_the_etag(client, db, payment_id):
+    etag = client.get(f"/payments/{payment_id}").headers["ETag"]
+
+    assert client.put(f"/payments/{payment_id}/status/Refund").status_code == 200
+    assert PaymentService(db).get_payment_version(payment_id) == 2
+
+    response = client.get(f"/payments/{payment_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["payment_status"] == "Refund"
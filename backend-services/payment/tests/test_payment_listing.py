@@ -0,0 +1,69 @@
+"""The list endpoints encode row dicts with orjson, matching the old PaymentResponse output."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from api.dependencies import admin_auth_dependency, any_user_auth_dependency
+from dtos.payment_schema import PaymentResponse
+from entity.payment import Payment
+from main import app
+from services.payment_service import PaymentService
+
+
+@pytest.fixture
+def email(db):
+    email = f"list-{uuid.uuid4().hex[:8]}@example.com"
+    service = PaymentService(db)
+    for order_id, amount, method, status in [
+        (None, 19.99, "Credit Card", "Success"),
+        (str(uuid.uuid4()), 0.1, "Debit Card", "Failed"),
+        (str(uuid.uuid4()), 1250.0, "Cash on Delivery", "Pending"),
+    ]:
+        service.capture_payment({"user_email": email, "order_id": order_id, "amount": amount,
+                                 "payment_method": method}, str(uuid.uuid4()), status)
+    return email
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[any_user_auth_dependency] = lambda: None
+    app.dependency_overrides[admin_auth_dependency] = lambda: None
+    try:
+        # Not entered as a context manager: the lifespan would start the RabbitMQ consumer
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def pydantic_payments(db, email: str) -> list[dict]:
+    """The payments as response_model=list[PaymentResponse] used to serialize them."""
+    payments = db.execute(select(Payment).where(Payment.user_email == email)).scalars()
+    return [PaymentResponse.model_validate(payment).model_dump(mode="json") for payment in payments]
+
+
+def by_id(payments: list[dict]) -> dict[str, dict]:
+    return {payment["id"]: payment for payment in payments}
+
+
+def test_user_listing_matches_payment_response(client, db, email):
+    response = client.get(f"/payments/user/{email}")
+
+    assert response.status_code == 200
+    assert by_id(response.json()) == by_id(pydantic_payments(db, email))
+
+
+def test_admin_listing_matches_payment_response(client, db, email):
+    response = client.get("/payments/")
+
+    assert response.status_code == 200
+    mine = [payment for payment in response.json() if payment["user_email"] == email]
+    assert by_id(mine) == by_id(pydantic_payments(db, email))
+
+
+def test_select_payment_rows_has_exactly_the_response_fields(db, email):
+    rows = PaymentService(db)._select_payment_rows(Payment.user_email == email)
+
+    assert len(rows) == 3
+    assert all(list(row) == list(PaymentResponse.model_fields) for row in rows)